@@ -0,0 +1,115 @@
+"""Recall@k against query latency for the ANN indexes of the local vector store.
+
+Fills a temporary vector store with clustered random unit vectors (real
+embeddings cluster by topic; uniform random vectors have no neighbours worth
+finding), builds an IVF index and, when hnswlib is installed, an HNSW index,
+and compares each at several search breadths with exact search: the share of
+the exact top k each one returns, and median milliseconds per query.
+
+Usage:
+    python bench_ann_index.py [--size 100000] [--dimensions 1536] [--k 10]
+        [--queries 100] [--probes 1 4 8 16 32 64] [--ef 16 32 64 128 256]
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+import numpy as np
+
+from core.ann_index import HNSWIndex, IVFIndex, hnswlib
+from core.embedding_manager import EMBEDDING_DIMENSIONS
+from core.vector_store import VectorStore
+
+FILL_CHUNK = 50_000
+
+
+def clustered(rng, count, dimensions, centers):
+    rows = centers[rng.integers(len(centers), size=count)]
+    rows = rows + rng.standard_normal((count, dimensions), dtype=np.float32)
+    return rows / np.linalg.norm(rows, axis=1, keepdims=True)
+
+
+def exact_search(vectors, query, k):
+    scores = vectors @ query
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top])]
+
+
+def measure(search, queries, truth, k):
+    """Mean recall@k and median milliseconds per query."""
+    times, recalls = [], []
+    for query, expected in zip(queries, truth):
+        started = time.perf_counter()
+        rows = search(query)
+        times.append(time.perf_counter() - started)
+        recalls.append(len(set(rows[:k].tolist()) & expected) / k)
+    return statistics.mean(recalls), statistics.median(times) * 1000
+
+
+def timed_build(index, store) -> float:
+    started = time.perf_counter()
+    for start in range(0, len(store), FILL_CHUNK):
+        index.add(range(start, min(start + FILL_CHUNK, len(store))), store.vectors)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--dimensions", type=int, default=EMBEDDING_DIMENSIONS)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--probes", type=int, nargs="+", default=[1, 4, 8, 16, 32, 64])
+    parser.add_argument("--ef", type=int, nargs="+", default=[16, 32, 64, 128, 256])
+    args = parser.parse_args()
+    rng = np.random.default_rng(0)
+    k = args.k
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = VectorStore(os.path.join(directory, "vectors.npy"))
+        centers = rng.standard_normal((max(1, args.size // 100), args.dimensions))
+        centers = centers.astype(np.float32)
+        for start in range(0, args.size, FILL_CHUNK):
+            count = min(FILL_CHUNK, args.size - start)
+            rows = clustered(rng, count, args.dimensions, centers)
+            store.append(rows, [{"n": start + i} for i in range(count)])
+        vectors = store.vectors
+        queries = clustered(rng, args.queries, args.dimensions, centers)
+        truth = [set(exact_search(vectors, q, k).tolist()) for q in queries]
+
+        print(f"{args.size:,} vectors, {args.dimensions} dimensions, recall@{k}")
+        print(f"  {'index':<16}{'build':>9}{'recall':>9}{'per query':>12}")
+        _, exact_ms = measure(
+            lambda q: exact_search(vectors, q, k), queries, truth, k
+        )
+        print(f"  {'exact':<16}{'-':>9}{1:9.3f}{exact_ms:10.2f}ms")
+
+        ivf = IVFIndex(os.path.join(directory, "index_ivf.npz"))
+        build = timed_build(ivf, store)
+        for n_probe in args.probes:
+            ivf.n_probe = n_probe
+            recall, ms = measure(
+                lambda q: ivf.search(q, k, vectors)[0], queries, truth, k
+            )
+            name = f"ivf n_probe={n_probe}"
+            print(f"  {name:<16}{build:8.1f}s{recall:9.3f}{ms:10.2f}ms")
+
+        if hnswlib is None:
+            print("  hnsw skipped: hnswlib not installed")
+            return
+        hnsw = HNSWIndex(os.path.join(directory, "index_hnsw.bin"))
+        build = timed_build(hnsw, store)
+        for ef in args.ef:
+            hnsw.ef = ef
+            recall, ms = measure(
+                lambda q: hnsw.search(q, k, vectors)[0], queries, truth, k
+            )
+            name = f"hnsw ef={ef}"
+            print(f"  {name:<16}{build:8.1f}s{recall:9.3f}{ms:10.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
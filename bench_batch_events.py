@@ -0,0 +1,103 @@
+"""Per-event cost of single vs batched calendar writes.
+
+Creates, moves and deletes N events one call at a time and then through
+create_events/move_events/delete_events, with Core and Narrative memory kept
+in a temporary directory. Events are placed in January 2099 and deleted
+again, so on macOS the real calendar is left as it was.
+
+Usage:
+    python bench_batch_events.py [--events 200]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from calendar_agent_eventkit import EventKitAgent
+from core.memory_manager import CoreMemory
+from core.narrative_memory import NarrativeMemory
+
+
+def make_agent(directory: str, name: str) -> EventKitAgent:
+    os.makedirs(f"{directory}/{name}")
+    agent = EventKitAgent()
+    agent.core_memory = CoreMemory(f"{directory}/{name}/memory.db")
+    agent.narrative_memory = NarrativeMemory(f"{directory}/{name}/narrative.json")
+    return agent
+
+
+def workload(count: int, prefix: str):
+    creates, moves, deletes = [], [], []
+    for i in range(count):
+        title = f"{prefix} {i}"
+        date = f"2099-01-{1 + i % 28:02d}"
+        creates.append(
+            {
+                "title": title,
+                "date": date,
+                "time": f"{8 + i % 10:02d}:00",
+                "duration": 30,
+                "description": "team meeting",
+            }
+        )
+        moves.append(
+            {
+                "title": title,
+                "old_date": date,
+                "new_date": date,
+                "new_time": f"{8 + i % 10:02d}:30",
+            }
+        )
+        deletes.append({"title": title, "date": date})
+    return creates, moves, deletes
+
+
+def one_by_one(operation):
+    return lambda items: [operation(details) for details in items]
+
+
+def timed(agent: EventKitAgent, function, items) -> float:
+    """Seconds to apply items, including the background memory updates."""
+    started = time.perf_counter()
+    function(items)
+    agent.post_commit.drain()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=200)
+    args = parser.parse_args()
+    count = args.events
+
+    with tempfile.TemporaryDirectory() as directory:
+        single = make_agent(directory, "single")
+        creates, moves, deletes = workload(count, "Bench single")
+        single_times = [
+            timed(single, one_by_one(single.create_event), creates),
+            timed(single, one_by_one(single.move_event), moves),
+            timed(single, one_by_one(single.delete_event), deletes),
+        ]
+
+        batch = make_agent(directory, "batch")
+        creates, moves, deletes = workload(count, "Bench batch")
+        batch_times = [
+            timed(batch, batch.create_events, creates),
+            timed(batch, batch.move_events, moves),
+            timed(batch, batch.delete_events, deletes),
+        ]
+
+    print(f"Per-event cost over {count} events")
+    print(f"  {'operation':<10}{'single':>12}{'batch':>12}{'speedup':>10}")
+    for name, one, many in zip(
+        ("create", "move", "delete"), single_times, batch_times
+    ):
+        print(
+            f"  {name:<10}{one / count * 1000:10.2f}ms{many / count * 1000:10.2f}ms"
+            f"{one / many:9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
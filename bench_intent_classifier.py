@@ -0,0 +1,89 @@
+"""Offline accuracy/latency benchmark for the local intent classifier.
+
+Trains on a split of the training corpus and reports held-out accuracy,
+how many commands would be routed without the LLM at the routing threshold,
+the accuracy of those routed commands, and per-command prediction latency.
+
+Usage:
+    python bench_intent_classifier.py [--cache core/response_cache.db] [--runs 5]
+"""
+
+import argparse
+import random
+import statistics
+import time
+from collections import Counter
+
+from openai_client import INTENT_ROUTE_THRESHOLD, INTENT_ROUTED_ACTIONS
+from utils.intent_classifier import build_training_corpus, train_intent_classifier
+
+
+def evaluate(corpus, seed, holdout=0.2):
+    shuffled = corpus[:]
+    random.Random(seed).shuffle(shuffled)
+    split = int(len(shuffled) * (1 - holdout))
+    train, test = shuffled[:split], shuffled[split:]
+
+    started = time.perf_counter()
+    classifier = train_intent_classifier(train)
+    train_seconds = time.perf_counter() - started
+
+    latencies = []
+    correct = routed = routed_correct = 0
+    errors = Counter()
+    for text, expected in test:
+        started = time.perf_counter()
+        action, probability = classifier.predict(text)
+        latencies.append(time.perf_counter() - started)
+        correct += action == expected
+        if action != expected:
+            errors[(expected, action)] += 1
+        if action in INTENT_ROUTED_ACTIONS and probability >= INTENT_ROUTE_THRESHOLD:
+            routed += 1
+            routed_correct += action == expected
+    return {
+        "train_size": len(train),
+        "test_size": len(test),
+        "train_seconds": train_seconds,
+        "accuracy": correct / len(test),
+        "route_rate": routed / len(test),
+        "routed_accuracy": routed_correct / routed if routed else 1.0,
+        "latencies": latencies,
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cache", default="core/response_cache.db")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    corpus = build_training_corpus(args.cache)
+    print(f"Corpus: {len(corpus)} examples, {len(set(a for _, a in corpus))} actions")
+    print(f"Routing threshold: {INTENT_ROUTE_THRESHOLD}")
+
+    results = [evaluate(corpus, seed) for seed in range(args.runs)]
+    latencies = sorted(l for r in results for l in r["latencies"])
+    errors = sum((r["errors"] for r in results), Counter())
+
+    def mean(key):
+        return statistics.mean(r[key] for r in results)
+
+    print(f"\n{args.runs} random 80/20 splits")
+    print(f"  train time:        {mean('train_seconds'):.2f}s")
+    print(f"  accuracy:          {mean('accuracy'):.1%}")
+    print(f"  routed (no LLM):   {mean('route_rate'):.1%} of held-out commands")
+    print(f"  routed accuracy:   {mean('routed_accuracy'):.1%}")
+    print(
+        f"  predict latency:   p50 {latencies[len(latencies) // 2] * 1e6:.0f}us, "
+        f"p99 {latencies[int(len(latencies) * 0.99)] * 1e6:.0f}us"
+    )
+    if errors:
+        print("\nMost common confusions (expected -> predicted):")
+        for (expected, predicted), count in errors.most_common(5):
+            print(f"  {expected} -> {predicted}: {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Startup benchmark for the terminal assistant.
+
+Measures, in fresh interpreters:
+  * time to the first prompt of `python main.py`
+  * total `import main` time and its slowest imports from `python -X importtime`
+
+Usage:
+    python bench_startup.py [--runs 5] [--top 10]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+PROMPT = b"> "
+
+
+def time_to_prompt() -> float:
+    """Seconds from launching main.py until the input prompt is printed."""
+    env = dict(os.environ, PYTHONUNBUFFERED="1")
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "main.py"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        env=env,
+    )
+    output = b""
+    while not output.endswith(PROMPT):
+        byte = proc.stdout.read(1)
+        if not byte:
+            break
+        output += byte
+    elapsed = time.perf_counter() - started
+    proc.communicate(b"exit\n", timeout=30)
+    return elapsed
+
+
+def import_profile():
+    """Return (total seconds, [(cumulative seconds, module)]) for `import main`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        capture_output=True,
+        text=True,
+    )
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        modules.append((int(cumulative) / 1e6, name.strip()))
+    total = next((c for c, name in modules if name == "main"), 0.0)
+    return total, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    prompt_times = [time_to_prompt() for _ in range(args.runs)]
+    import_totals = []
+    modules = []
+    for _ in range(args.runs):
+        total, modules = import_profile()
+        import_totals.append(total)
+
+    print(f"Startup over {args.runs} runs")
+    print(
+        f"  time to prompt:  median {statistics.median(prompt_times) * 1000:.0f}ms, "
+        f"max {max(prompt_times) * 1000:.0f}ms"
+    )
+    print(f"  import main:     median {statistics.median(import_totals) * 1000:.0f}ms")
+    print("\nSlowest imports (cumulative, last run):")
+    for cumulative, name in sorted(modules, reverse=True)[1 : args.top + 1]:
+        print(f"  {cumulative * 1000:7.1f}ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
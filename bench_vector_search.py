@@ -0,0 +1,105 @@
+"""Query latency of the local vector store search at growing history sizes.
+
+Fills a temporary vector store with random unit-length embeddings and times
+top-k queries through EmbeddingManager's vectorized search, against the old
+per-vector loop (a cosine per row, then a full sort) for sizes up to
+--loop-limit, checking that both return the same events. The store is
+memory-mapped, so 1M vectors at 1536 dimensions need about 6 GB of disk.
+
+Usage:
+    python bench_vector_search.py [--sizes 10000 100000 1000000]
+        [--dimensions 1536] [--queries 20] [--top-k 5] [--loop-limit 100000]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import tempfile
+import time
+
+import numpy as np
+
+from core.embedding_manager import EMBEDDING_DIMENSIONS, EmbeddingManager
+
+FILL_CHUNK = 50_000
+
+
+def loop_search(embeddings, query, top_k):
+    """The search before vectorization: one cosine per row, then a full sort."""
+    similarities = []
+    for i, embedding in enumerate(embeddings):
+        similarity = np.dot(query, embedding) / (
+            np.linalg.norm(query) * np.linalg.norm(embedding)
+        )
+        similarities.append((similarity, i))
+    similarities.sort(reverse=True)
+    return [i for _, i in similarities[:top_k]]
+
+
+def fill(manager: EmbeddingManager, size: int, dimensions: int, rng) -> float:
+    """Append size random embeddings; return seconds taken."""
+    started = time.perf_counter()
+    for start in range(0, size, FILL_CHUNK):
+        count = min(FILL_CHUNK, size - start)
+        vectors = rng.standard_normal((count, dimensions), dtype=np.float32)
+        metadata = [{"n": start + i} for i in range(count)]
+        manager.store_embeddings(vectors, metadata)
+    return time.perf_counter() - started
+
+
+def median_ms(function, queries) -> float:
+    times = []
+    for query in queries:
+        started = time.perf_counter()
+        function(query)
+        times.append(time.perf_counter() - started)
+    return statistics.median(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--dimensions", type=int, default=EMBEDDING_DIMENSIONS)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--loop-limit", type=int, default=100_000)
+    args = parser.parse_args()
+    rng = np.random.default_rng(0)
+
+    print(f"Top-{args.top_k} search, {args.dimensions} dimensions, median per query")
+    print(f"  {'vectors':>10}{'fill':>10}{'vectorized':>13}{'loop':>13}{'speedup':>10}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            with contextlib.redirect_stdout(io.StringIO()):
+                manager = EmbeddingManager(os.path.join(directory, "memory.db"))
+            manager.collection = None
+            fill_seconds = fill(manager, size, args.dimensions, rng)
+            queries = rng.standard_normal((args.queries, args.dimensions)).tolist()
+
+            def search(query):
+                return manager._search_in_vector_store(query, args.top_k)
+
+            search(queries[0])  # Page the matrix in
+            fast = median_ms(search, queries)
+            line = f"  {size:>10,}{fill_seconds:9.1f}s{fast:11.2f}ms"
+            if size <= args.loop_limit:
+                embeddings = manager.vector_store.vectors
+                for query in queries[:3]:
+                    found = [r["metadata"]["n"] for r in search(query)]
+                    assert found == loop_search(embeddings, query, args.top_k)
+                slow = median_ms(
+                    lambda query: loop_search(embeddings, query, args.top_k),
+                    queries[:3],
+                )
+                line += f"{slow:11.2f}ms{slow / fast:9.1f}x"
+            else:
+                line += f"{'-':>13}{'-':>10}"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,35 +1,64 @@
 """Handles Calendar integration using EventKit for the terminal calendar assistant."""
 
+import bisect
 import time
+from collections import namedtuple
+from concurrent.futures import Future
+from contextlib import ExitStack
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
+from core.types import EventRecord, ReminderRecord
 from utils.date_utils import parse_date_string
+from utils.calendar_mirror import EVENT, REMINDER, CalendarMirror
+from utils.interval_index import IntervalIndex
+from utils.recurrence import OccurrenceCache, Recurrence
+from utils.work_queue import DurableWorkQueue
+import functools
+import importlib.util
+import itertools
 import sys
 import os  # for selecting calendar by env var
+import threading
 
-# Import Core memory system
-try:
-    from core.memory_manager import CoreMemory
-    from core.nudge_engine import ContextualNudger
+# Core and Narrative memory are imported and constructed on first use (they
+# load JSON stores and the embedding stack), so only check they exist here.
+CORE_MEMORY_AVAILABLE = (
+    importlib.util.find_spec("core.memory_manager") is not None
+    and importlib.util.find_spec("core.nudge_engine") is not None
+)
+NARRATIVE_MEMORY_AVAILABLE = importlib.util.find_spec("core.narrative_memory") is not None
 
-    CORE_MEMORY_AVAILABLE = True
-except ImportError:
-    CORE_MEMORY_AVAILABLE = False
+# Marks a memory subsystem that has not been constructed yet
+_UNINITIALIZED = object()
 
-# Import Narrative memory system
-try:
-    from core.narrative_memory import NarrativeMemory
 
-    NARRATIVE_MEMORY_AVAILABLE = True
-except ImportError:
-    NARRATIVE_MEMORY_AVAILABLE = False
+def _holding_memory_lock(method):
+    """Run an EventKitAgent method with the agent's memory lock held."""
+
+    @functools.wraps(method)
+    def locked(self, *args, **kwargs):
+        with self._memory_lock:
+            return method(self, *args, **kwargs)
+
+    return locked
+
+
+# Event index entries, ordered by start in EventKitAgent._event_index
+IndexedEvent = namedtuple("IndexedEvent", ["key", "record", "event"])
+
+# Loaded windows remembered before the list is restarted; windows that overlap
+# are merged, so this only fills up with many separate ranges
+MAX_INDEXED_WINDOWS = 64
+
+# How long a listing waits for EventKit to deliver reminders
+REMINDER_FETCH_TIMEOUT_SECONDS = 10
 
 # Attempt real PyObjC integration unless running under pytest
 try:
     if "pytest" in sys.modules:
         # Force stub implementation during pytest runs
         raise ImportError
-    from Foundation import NSDate, NSRunLoop, NSDateComponents  # type: ignore
+    from Foundation import NSDate, NSRunLoop  # type: ignore
     from EventKit import (
         EKEventStore,
         EKEntityTypeEvent,
@@ -37,7 +66,11 @@ try:
         EKEvent,
         EKSpanThisEvent,
     )  # type: ignore
+
+    EVENTKIT_AVAILABLE = True
 except ImportError:
+    EVENTKIT_AVAILABLE = False
+
     # Fallback stubs for linting and environments without PyObjC
     class NSDate:
         @staticmethod
@@ -64,8 +97,9 @@ except ImportError:
             return cls()
 
         def init(self):
-            # Initialize in-memory event storage for stub
+            # Initialize in-memory event and reminder storage for stub
             self._events = []
+            self._reminders = []
             # Optionally track last query range
             self._last_range = None
             return self
@@ -84,22 +118,42 @@ except ImportError:
             # Return all stored events (stub does not filter by date range)
             return list(self._events)
 
-        def predicateForIncompleteRemindersWithDueDateComponents_(self, c):
-            # Stub predicate for reminders
-            return None
+        def predicateForIncompleteRemindersWithDueDateStarting_ending_calendars_(
+            self, s, e, c
+        ):
+            # Stub predicate for reminders: the due date range
+            return (s, e)
 
         def fetchRemindersMatchingPredicate_completion_(self, pred, cb):
-            # Stub fetch: immediately call callback with empty list
-            cb([], None)
+            # Stub fetch: immediately call back with reminders due in range
+            start, end = pred
+            cb(
+                [
+                    r
+                    for r in self._reminders
+                    if r.dueDate is not None and start <= r.dueDate <= end
+                ],
+                None,
+            )
 
         def saveEvent_span_error_(self, event, span, error_ptr):
-            # Record saved event in-memory for stub
+            # Record saved event in-memory for stub; re-saving updates in place
             try:
-                self._events.append(event)
+                if not any(e is event for e in self._events):
+                    self._events.append(event)
             except Exception:
                 pass
             return True
 
+        def saveEvent_span_commit_error_(self, event, span, commit, error_ptr):
+            return self.saveEvent_span_error_(event, span, error_ptr)
+
+        def removeEvent_span_commit_error_(self, event, span, commit, error_ptr):
+            return self.removeEvent_span_error_(event, span, error_ptr)
+
+        def commit_(self, error_ptr):
+            return True
+
         def removeEvent_span_error_(self, event, span, error_ptr):
             # Remove events by matching title if possible, else clear all
             try:
@@ -147,18 +201,146 @@ except ImportError:
         def setCalendar_(self, calendar):
             pass
 
-    # Stub for NSDateComponents to support reminders predicate
-    class NSDateComponents:
-        @classmethod
-        def alloc(cls):
-            return cls()
 
-        def init(self):
-            return self
+# Local SQLite mirror of the store. Stub stores only live in memory, so their
+# mirror does too.
+CALENDAR_MIRROR_PATH = (
+    os.getenv("CALENDAR_MIRROR_PATH", "core/calendar_mirror.db")
+    if EVENTKIT_AVAILABLE
+    else ":memory:"
+)
+
+# Journal and worker threads for memory updates that run after EventKit has
+# confirmed a change (0 workers runs them before the call returns)
+POST_COMMIT_JOURNAL_PATH = os.getenv(
+    "POST_COMMIT_JOURNAL_PATH", "core/post_commit_journal.db"
+)
+POST_COMMIT_WORKERS = int(os.getenv("POST_COMMIT_WORKERS", "1"))
+
+
+def _to_ns_date(dt: datetime):
+    """Convert a local datetime to an NSDate."""
+    return NSDate.dateWithTimeIntervalSince1970_(time.mktime(dt.timetuple()))
 
-    # No-op predicate for reminders (backup)
-    def predicateForIncompleteRemindersWithDueDateComponents_(self, c):
+
+def _to_datetime(raw) -> Optional[datetime]:
+    """Normalize an NSDate or datetime to a datetime (None if not a date)."""
+    if hasattr(raw, "timeIntervalSince1970"):
+        try:
+            return datetime.fromtimestamp(raw.timeIntervalSince1970())
+        except Exception:
+            return None
+    return raw if hasattr(raw, "isoformat") else None
+
+
+def _event_fields(event):
+    """Return (title, start, end) for an EventKit event, or None if it has no start."""
+    try:
+        start = _to_datetime(
+            event.startDate() if callable(event.startDate) else event.startDate
+        )
+    except Exception:
+        return None
+    if start is None:
         return None
+    try:
+        raw_end = event.endDate() if callable(event.endDate) else event.endDate
+        end = _to_datetime(raw_end)
+    except Exception:
+        end = None
+    try:
+        raw_title = event.title() if callable(event.title) else event.title
+    except Exception:
+        raw_title = getattr(event, "title", None)
+    title = raw_title if isinstance(raw_title, str) else str(raw_title)
+    return title, start, end or start
+
+
+def _succeeded(result) -> bool:
+    """Success flag of an EventKit call (PyObjC returns (ok, error) tuples)."""
+    if isinstance(result, tuple):
+        return bool(result[0])
+    return bool(result)
+
+
+def _window_covered(windows, start_dt: datetime, end_dt: datetime) -> bool:
+    """Whether one of the sorted, disjoint windows contains [start_dt, end_dt]."""
+    i = bisect.bisect_right(windows, (start_dt, datetime.max)) - 1
+    return i >= 0 and windows[i][0] <= start_dt and end_dt <= windows[i][1]
+
+
+def _add_window(windows, start_dt: datetime, end_dt: datetime) -> None:
+    """Insert [start_dt, end_dt] into sorted, disjoint windows, merging overlaps."""
+    i = bisect.bisect_left(windows, (start_dt, start_dt))
+    if i > 0 and windows[i - 1][1] >= start_dt:
+        i -= 1
+    j = i
+    while j < len(windows) and windows[j][0] <= end_dt:
+        start_dt = min(start_dt, windows[j][0])
+        end_dt = max(end_dt, windows[j][1])
+        j += 1
+    windows[i:j] = [(start_dt, end_dt)]
+    if len(windows) > MAX_INDEXED_WINDOWS:
+        # Forgetting a window only means loading it again when next queried
+        windows[:] = [(start_dt, end_dt)]
+
+
+def _modified_date(item) -> Optional[datetime]:
+    """Return an EventKit item's lastModifiedDate as a datetime, if any."""
+    try:
+        raw = item.lastModifiedDate
+        return _to_datetime(raw() if callable(raw) else raw)
+    except Exception:
+        return None
+
+
+def _item_identifier(item, attr: str) -> Optional[str]:
+    """Return an EventKit identifier attribute (eventIdentifier etc.) or None."""
+    try:
+        identifier = getattr(item, attr)
+        identifier = identifier() if callable(identifier) else identifier
+    except Exception:
+        return None
+    return identifier if isinstance(identifier, str) else None
+
+
+def _calendar_title(item) -> Optional[str]:
+    """Return the title of an event's or reminder's calendar, if available."""
+    try:
+        cal = item.calendar() if callable(item.calendar) else item.calendar
+        title = cal.title() if callable(cal.title) else cal.title
+    except Exception:
+        return None
+    return title if isinstance(title, str) else None
+
+
+def _reminder_record(reminder) -> ReminderRecord:
+    """Build a ReminderRecord from an EventKit reminder."""
+    try:
+        raw_title = reminder.title() if callable(reminder.title) else reminder.title
+    except Exception:
+        raw_title = getattr(reminder, "title", None)
+    title = raw_title if isinstance(raw_title, str) else str(raw_title)
+    try:
+        raw_due = reminder.dueDate() if callable(reminder.dueDate) else reminder.dueDate
+    except Exception:
+        raw_due = None
+    return ReminderRecord(
+        title,
+        _to_datetime(raw_due),
+        calendar=_calendar_title(reminder),
+        id=_item_identifier(reminder, "calendarItemIdentifier"),
+    )
+
+
+def _item_key(item, attr: str) -> str:
+    """Mirror key from an EventKit identifier (object id for stub items)."""
+    return _item_identifier(item, attr) or f"obj-{id(item):x}"
+
+
+def _event_key(event, start: datetime) -> str:
+    """Stable index/mirror key: event identifier plus occurrence start."""
+    return f"{_item_key(event, 'eventIdentifier')}@{start.isoformat()}"
 
 
 class EventKitAgent:
@@ -171,6 +353,9 @@ class EventKitAgent:
         self._recurring_events = []
         self._deleted_series = set()
         self._deleted_occurrences = {}
+        # Materialized occurrences per (series, window), with deletions applied
+        self._occurrence_cache = OccurrenceCache()
+        self._series_ids = itertools.count()
         # Select calendar from environment if provided
         cal_name = os.getenv("CALENDAR_NAME")
         if cal_name:
@@ -190,23 +375,108 @@ class EventKitAgent:
         else:
             self._calendar = None
 
-        # Initialize Core memory system
-        self.core_memory = None
-        self.nudger = None
-        if CORE_MEMORY_AVAILABLE:
-            try:
-                self.core_memory = CoreMemory()
-                self.nudger = ContextualNudger(self.core_memory)
-            except Exception as e:
-                print(f"Warning: Could not initialize Core memory: {e}")
+        # Interval index of stored events, filled per queried window from the
+        # local mirror (or from the store when the mirror's copy is stale)
+        self._event_index = IntervalIndex()
+        # Sorted, disjoint (start, end) windows loaded into the index
+        self._indexed_windows = []
+        self._index_store = None
+        self._index_lock = threading.RLock()
+        self.mirror = CalendarMirror(CALENDAR_MIRROR_PATH)
+        self._store_changed = False
+        self._changes_observed = self._observe_store_changes()
+        # Inside create_events/delete_events/move_events, saves are committed
+        # to the store once at the end
+        self._batch_depth = 0
+        self._uncommitted = False
+        self._batch_jobs = []
+
+        # Core memory, nudger and Narrative memory are built on first use. The
+        # post-commit worker changes them in the background, so everything
+        # that builds, reads or changes them holds the memory lock
+        self._memory_lock = threading.RLock()
+        self._core_memory = _UNINITIALIZED
+        self._nudger = _UNINITIALIZED
+        self._narrative_memory = _UNINITIALIZED
+
+        # Memory side effects of calendar changes run in the background
+        self.post_commit = DurableWorkQueue(
+            {
+                "remember_event": self._remember_event,
+                "forget_event": self._forget_event,
+                "move_event_memory": self._move_event_memory,
+                "batch": self._run_jobs,
+            },
+            POST_COMMIT_JOURNAL_PATH,
+            POST_COMMIT_WORKERS,
+        )
 
-        # Initialize Narrative memory system
-        self.narrative_memory = None
-        if NARRATIVE_MEMORY_AVAILABLE:
-            try:
-                self.narrative_memory = NarrativeMemory()
-            except Exception as e:
-                print(f"Warning: Could not initialize Narrative memory: {e}")
+    @property
+    def core_memory(self):
+        """Core memory system, created on first use (None if unavailable)."""
+        if self._core_memory is _UNINITIALIZED:
+            self._core_memory = None
+            if CORE_MEMORY_AVAILABLE:
+                try:
+                    from core.memory_manager import CoreMemory
+
+                    self._core_memory = CoreMemory()
+                except Exception as e:
+                    print(f"Warning: Could not initialize Core memory: {e}")
+        return self._core_memory
+
+    @core_memory.setter
+    def core_memory(self, value):
+        self._core_memory = value
+
+    @core_memory.deleter
+    def core_memory(self):
+        self._core_memory = _UNINITIALIZED
+
+    @property
+    def nudger(self):
+        """Contextual nudger over core_memory, created on first use (None if unavailable)."""
+        if self._nudger is _UNINITIALIZED:
+            self._nudger = None
+            core_memory = self.core_memory
+            if core_memory is not None:
+                try:
+                    from core.nudge_engine import ContextualNudger
+
+                    self._nudger = ContextualNudger(core_memory)
+                except Exception as e:
+                    print(f"Warning: Could not initialize contextual nudger: {e}")
+        return self._nudger
+
+    @nudger.setter
+    def nudger(self, value):
+        self._nudger = value
+
+    @nudger.deleter
+    def nudger(self):
+        self._nudger = _UNINITIALIZED
+
+    @property
+    def narrative_memory(self):
+        """Narrative memory system, created on first use (None if unavailable)."""
+        if self._narrative_memory is _UNINITIALIZED:
+            self._narrative_memory = None
+            if NARRATIVE_MEMORY_AVAILABLE:
+                try:
+                    from core.narrative_memory import NarrativeMemory
+
+                    self._narrative_memory = NarrativeMemory()
+                except Exception as e:
+                    print(f"Warning: Could not initialize Narrative memory: {e}")
+        return self._narrative_memory
+
+    @narrative_memory.setter
+    def narrative_memory(self, value):
+        self._narrative_memory = value
+
+    @narrative_memory.deleter
+    def narrative_memory(self):
+        self._narrative_memory = _UNINITIALIZED
 
     def _request_access(self, entity_type):
         """Request access and block until granted."""
@@ -223,6 +493,293 @@ class EventKitAgent:
     def _access_handler(self, granted, error):
         self._granted = True
 
+    def _observe_store_changes(self) -> bool:
+        """
+        Mark synced windows stale when EventKit reports a store change.
+
+        Returns:
+            False if changes made by other apps cannot be observed
+        """
+        if not EVENTKIT_AVAILABLE:
+            return True  # The stub store only changes through the agent
+        try:
+            from Foundation import NSNotificationCenter  # type: ignore
+            from EventKit import EKEventStoreChangedNotification  # type: ignore
+
+            def changed(notification):
+                self._store_changed = True
+
+            center = NSNotificationCenter.defaultCenter()
+            self._change_observer = center.addObserverForName_object_queue_usingBlock_(
+                EKEventStoreChangedNotification, self.store, None, changed
+            )
+            return True
+        except Exception as e:
+            print(f"Warning: Could not observe calendar changes: {e}")
+            return False
+
+    def invalidate(self) -> None:
+        """
+        Reload events and reminders from the store on next use.
+
+        EventKit reports changes made by other apps through its change
+        notification; call this after changing the store any other way.
+        """
+        self._store_changed = True
+
+    def _refresh_if_changed(self) -> None:
+        """
+        Drop the event index (and mark the mirror stale) if the store changed.
+
+        Changes are detected through EventKit's change notification (or
+        invalidate()) and the store being replaced. Windows synced before
+        the agent started are diffed against the store once, since changes
+        made in the meantime were not observed. Until then, mirrored windows
+        are served without asking the store.
+        """
+        previous = self._index_store
+        if previous is not None and previous is not self.store:
+            # Mirrored rows came from a different store
+            self.mirror.clear()
+        elif previous is None or self._store_changed or not self._changes_observed:
+            self.mirror.mark_stale()
+        else:
+            return
+        self._store_changed = False
+        self._event_index = IntervalIndex()
+        self._indexed_windows = []
+        self._index_store = self.store
+
+    def _indexed_events(self, start_dt: datetime, end_dt: datetime) -> IntervalIndex:
+        """
+        Return the event index with all stored events in [start_dt, end_dt] loaded.
+
+        A window is read from the local mirror while its sync is fresh.
+        Otherwise it is fetched from the store, and only the differences are
+        written to the mirror. After loading, create_event, delete_event and
+        move_event keep both up to date.
+        """
+        self._refresh_if_changed()
+        if _window_covered(self._indexed_windows, start_dt, end_dt):
+            return self._event_index
+        if self.mirror.is_fresh(EVENT, start_dt, end_dt):
+            for key, record in self.mirror.events_overlapping(start_dt, end_dt):
+                if key not in self._event_index:
+                    entry = IndexedEvent(key, record, None)
+                    self._event_index.add(key, record.start, record.end, entry)
+        else:
+            # Use configured calendar if set, else all calendars
+            calendars = [self._calendar] if getattr(self, "_calendar", None) else None
+            predicate = self.store.predicateForEventsWithStartDate_endDate_calendars_(
+                _to_ns_date(start_dt), _to_ns_date(end_dt), calendars
+            )
+            entries = [
+                self._index_event(event)
+                for event in self.store.eventsMatchingPredicate_(predicate) or []
+            ]
+            self.mirror.sync_events(
+                start_dt,
+                end_dt,
+                [
+                    (entry.key, entry.record, _modified_date(entry.event))
+                    for entry in entries
+                    if entry is not None
+                ],
+            )
+        _add_window(self._indexed_windows, start_dt, end_dt)
+        return self._event_index
+
+    def _index_event(self, event) -> Optional[IndexedEvent]:
+        """Add an EventKit event to the index; returns its entry (None if unusable)."""
+        fields = _event_fields(event)
+        if fields is None:
+            return None
+        title, start, end = fields
+        record = EventRecord(
+            title,
+            start,
+            end,
+            calendar=_calendar_title(event),
+            id=_item_identifier(event, "eventIdentifier"),
+        )
+        entry = IndexedEvent(_event_key(event, start), record, event)
+        self._event_index.add(entry.key, start, end, entry)
+        return entry
+
+    def _resolve_event(self, entry: IndexedEvent):
+        """Return the EventKit event for an index entry (loaded from the mirror)."""
+        if entry.event is not None:
+            return entry.event
+        start = entry.record.start
+        end = max(entry.record.end, start + timedelta(minutes=1))
+        predicate = self.store.predicateForEventsWithStartDate_endDate_calendars_(
+            _to_ns_date(start), _to_ns_date(end), None
+        )
+        for event in self.store.eventsMatchingPredicate_(predicate) or []:
+            fields = _event_fields(event)
+            if fields is not None and _event_key(event, fields[1]) == entry.key:
+                return event
+        return None
+
+    def _update_index(self, added=(), removed=()) -> None:
+        """
+        Apply the agent's own store change to the index and mirror.
+
+        Args:
+            added: Events that were saved (new or moved)
+            removed: Index keys of events that were removed or moved
+        """
+        if self._store_changed or self._index_store is not self.store:
+            return  # Already stale; rebuilt on next use
+        for key in removed:
+            self._event_index.remove(key)
+        self.mirror.delete_events(removed)
+        for event in added:
+            entry = self._index_event(event)
+            if entry is not None:
+                self.mirror.put_event(entry.key, entry.record, _modified_date(event))
+
+    def _save_to_store(self, event) -> bool:
+        """Save an event, leaving it uncommitted inside a batch."""
+        if self._batch_depth and hasattr(self.store, "saveEvent_span_commit_error_"):
+            self._uncommitted = True
+            return _succeeded(
+                self.store.saveEvent_span_commit_error_(
+                    event, EKSpanThisEvent, False, None
+                )
+            )
+        return _succeeded(
+            self.store.saveEvent_span_error_(event, EKSpanThisEvent, None)
+        )
+
+    def _remove_from_store(self, event) -> bool:
+        """Remove an event, leaving the removal uncommitted inside a batch."""
+        if self._batch_depth and hasattr(self.store, "removeEvent_span_commit_error_"):
+            self._uncommitted = True
+            return _succeeded(
+                self.store.removeEvent_span_commit_error_(
+                    event, EKSpanThisEvent, False, None
+                )
+            )
+        return _succeeded(
+            self.store.removeEvent_span_error_(event, EKSpanThisEvent, None)
+        )
+
+    def _commit_store(self) -> Optional[str]:
+        """Commit saves left pending by a batch; return an error message on failure."""
+        if not self._uncommitted:
+            return None
+        self._uncommitted = False
+        try:
+            if _succeeded(self.store.commit_(None)):
+                return None
+            error = "Failed to commit events"
+        except Exception as e:
+            error = f"Failed to commit events: {e}"
+        self._discard_uncommitted()
+        return error
+
+    def _discard_uncommitted(self) -> None:
+        """Drop saves left pending by a batch and re-sync the index from the store."""
+        self._uncommitted = False
+        try:
+            self.store.reset()
+        except Exception:
+            pass
+        self._store_changed = True
+
+    def _recurrence_state(self):
+        """Copy the in-memory series and deletions, to restore if a batch fails."""
+        return (
+            list(self._recurring_events),
+            set(self._deleted_series),
+            {title: set(dates) for title, dates in self._deleted_occurrences.items()},
+        )
+
+    def _restore_recurrence_state(self, state) -> None:
+        """Put back series and deletions saved by _recurrence_state."""
+        self._recurring_events, self._deleted_series, self._deleted_occurrences = state
+        self._occurrence_cache.clear()
+
+    def _run_batch(self, operation, items: List[Dict], verb: str) -> Dict[str, Any]:
+        """
+        Apply operation to each item with one store commit and one memory job.
+
+        If an operation raises or the commit fails, nothing of the batch is
+        kept: pending saves are dropped, the index and mirror re-sync from the
+        store, and series and deletions are restored.
+        """
+        with self._index_lock:
+            state = self._recurrence_state()
+            self._batch_depth += 1
+            try:
+                results = [operation(details) for details in items]
+            except BaseException:
+                if self._uncommitted:
+                    self._discard_uncommitted()
+                self._restore_recurrence_state(state)
+                raise
+            finally:
+                self._batch_depth -= 1
+                jobs, self._batch_jobs = self._batch_jobs, []
+            error = self._commit_store()
+            if error:
+                self._restore_recurrence_state(state)
+        if error:
+            failed = {"success": False, "error": error}
+            return {
+                "success": False,
+                "error": error,
+                "results": [r if not r.get("success") else failed for r in results],
+            }
+        if jobs:
+            self.post_commit.submit("batch", jobs)
+        done = sum(1 for result in results if result.get("success"))
+        return {
+            "success": done == len(results),
+            "message": f"{done} of {len(results)} events {verb}",
+            "results": results,
+        }
+
+    def _after_commit(self, kind: str, payload: Dict) -> None:
+        """Queue a memory update, or hold it for the batch being applied."""
+        if self._batch_depth:
+            self._batch_jobs.append({"kind": kind, "payload": payload})
+        else:
+            self.post_commit.submit(kind, payload)
+
+    @_holding_memory_lock
+    def _run_jobs(self, jobs: List[Dict]) -> None:
+        """Run a batch's memory updates with one persistence flush per memory."""
+        with ExitStack() as stack:
+            for memory in (self.core_memory, self.narrative_memory):
+                if memory is not None and hasattr(memory, "deferred_save"):
+                    stack.enter_context(memory.deferred_save())
+            for job in jobs:
+                self.post_commit.handlers[job["kind"]](job["payload"])
+
+    def _find_event(self, title: str, date: str) -> Optional[IndexedEvent]:
+        """Find a stored event by title (case-insensitive) starting on date."""
+        day_start = datetime.strptime(date, "%Y-%m-%d")
+        day_end = day_start + timedelta(days=1) - timedelta(microseconds=1)
+        wanted = title.strip().lower()
+        for entry in self._indexed_events(day_start, day_end).starting_in(
+            day_start, day_end
+        ):
+            if entry.record.title.strip().lower() == wanted:
+                return entry
+        return None
+
+    def find_conflicts(self, start_dt: datetime, end_dt: datetime) -> List[str]:
+        """Return titles of stored events overlapping [start_dt, end_dt)."""
+        with self._index_lock:
+            return [
+                entry.record.title
+                for entry in self._indexed_events(start_dt, end_dt).overlapping(
+                    start_dt, end_dt
+                )
+            ]
+
     def list_events_and_reminders(self, start_date=None, end_date=None):
         """List events and incomplete reminders between start_date and end_date."""
         # Default to today
@@ -239,124 +796,115 @@ class EventKitAgent:
         # Parse to datetimes
         start_dt = datetime.strptime(f"{start_date} 00:00", "%Y-%m-%d %H:%M")
         end_dt = datetime.strptime(f"{end_date} 23:59", "%Y-%m-%d %H:%M")
-        # Convert to NSDate
-        start_ns = NSDate.dateWithTimeIntervalSince1970_(
-            time.mktime(start_dt.timetuple())
-        )
-        end_ns = NSDate.dateWithTimeIntervalSince1970_(time.mktime(end_dt.timetuple()))
+        with self._index_lock:
+            return self._list_range(start_dt, end_dt)
+
+    def _list_range(self, start_dt: datetime, end_dt: datetime):
+        """List events and reminders in a parsed range (index lock held)."""
+        self._refresh_if_changed()
+        # Reminders come from the mirror while fresh; otherwise start fetching
+        # them so EventKit runs the fetch while events are queried
+        reminders = None
+        if self.mirror.is_fresh(REMINDER, start_dt, end_dt):
+            reminders = self.mirror.reminders_due(start_dt, end_dt)
+        else:
+            reminders_future = self._fetch_reminders(start_dt, end_dt)
         # Prepare events list; skip listing direct events if there are recurring events
         events = []
         if not self._recurring_events:
-            # Events: filter by range and normalize dates
-            # Use configured calendar if set, else all calendars
-            calendars = [self._calendar] if getattr(self, "_calendar", None) else None
-            pred_events = self.store.predicateForEventsWithStartDate_endDate_calendars_(
-                start_ns, end_ns, calendars
-            )
-            ek_events = self.store.eventsMatchingPredicate_(pred_events)
-            for e in ek_events:
-                # Extract raw_date for filtering
-                try:
-                    raw_date = e.startDate() if callable(e.startDate) else e.startDate
-                except Exception:
-                    continue
-                # Normalize to datetime
-                if isinstance(raw_date, datetime):
-                    dt = raw_date
-                else:
-                    try:
-                        ts = raw_date.timeIntervalSince1970()
-                        dt = datetime.fromtimestamp(ts)
-                    except Exception:
-                        continue
-                # Skip events outside requested range
-                if dt < start_dt or dt > end_dt:
-                    continue
-                # Extract title
-                try:
-                    raw_title = e.title() if callable(e.title) else e.title
-                except Exception:
-                    raw_title = getattr(e, "title", None)
-                title_str = raw_title if isinstance(raw_title, str) else str(raw_title)
-                # Format date string
-                date_str = dt.strftime("%Y-%m-%d %H:%M:%S")
-                events.append(f"{title_str} | {date_str}")
-        # Reminders (incomplete)
-        try:
-            # Build predicate for incomplete reminders
-            comp = NSDateComponents.alloc().init()
-            rem_pred = self.store.predicateForIncompleteRemindersWithDueDateComponents_(
-                comp
+            # Events starting in range, in start order, from the interval index
+            events.extend(
+                entry.record
+                for entry in self._indexed_events(start_dt, end_dt).starting_in(
+                    start_dt, end_dt
+                )
             )
-            # Fetch reminders synchronously
-            reminders_found = []
-            done = {"flag": False}
-
-            def cb(rems, error):
-                reminders_found.extend(rems or [])
-                done["flag"] = True
-
-            self.store.fetchRemindersMatchingPredicate_completion_(rem_pred, cb)
-            # In stub mode, the callback is called immediately, so we don't need the loop
-            # For real EventKit, this would block until the callback is called
-            if not done["flag"]:
-                # If the callback didn't work, mark as done manually
-                done["flag"] = True
-            # Format reminder output
-            reminders = []
-            for r in reminders_found:
-                try:
-                    raw_title = r.title() if callable(r.title) else r.title
-                except Exception:
-                    raw_title = getattr(r, "title", None)
-                title_str = raw_title if isinstance(raw_title, str) else str(raw_title)
-                try:
-                    raw_due = r.dueDate() if callable(r.dueDate) else r.dueDate
-                    ts = raw_due.timeIntervalSince1970()
-                    dt = datetime.fromtimestamp(ts)
-                    due_str = dt.strftime("%Y-%m-%d %H:%M:%S")
-                except Exception:
-                    due_str = str(raw_due)
-                reminders.append(f"{title_str} | {due_str}")
-        except Exception:
-            reminders = []
-        # Expand recurring events
+        # Expand recurring events, reusing cached occurrences for this window
         for rec in self._recurring_events:
-            rule = rec.get("recurrence_rule", "")
-            # Only support daily count rules
-            parts = rule.split(";")
-            freq = None
-            count = 0
-            for p in parts:
-                if p.startswith("FREQ="):
-                    freq = p.split("=", 1)[1]
-                if p.startswith("COUNT="):
-                    try:
-                        count = int(p.split("=", 1)[1])
-                    except Exception:
-                        count = 0
-            if freq == "DAILY" and count > 0:
-                start_time = datetime.strptime(
-                    f"{rec['date']} {rec['time']}", "%Y-%m-%d %H:%M"
+            title = rec["title"]
+            # Skip unsupported rules and deleted series
+            if rec.get("recurrence") is None or title in self._deleted_series:
+                continue
+            occurrences = self._occurrence_cache.get(
+                rec["series_id"],
+                start_dt,
+                end_dt,
+                lambda rec=rec: self._expand_series(rec, start_dt, end_dt),
+            )
+            events.extend(occurrences)
+        # Collect incomplete reminders due in range and mirror them
+        if reminders is None:
+            try:
+                fetched = reminders_future.result(
+                    timeout=REMINDER_FETCH_TIMEOUT_SECONDS
                 )
-                for i in range(count):
-                    occ = start_time + timedelta(days=i)
-                    # Check in range
-                    if start_dt <= occ <= end_dt:
-                        title = rec["title"]
-                        # Skip deleted series
-                        if title in self._deleted_series:
-                            continue
-                        # Skip deleted occurrence
-                        if (
-                            title in self._deleted_occurrences
-                            and occ.strftime("%Y-%m-%d")
-                            in self._deleted_occurrences[title]
-                        ):
-                            continue
-                        events.append(f"{title} | {occ}")
+            except Exception:
+                fetched = []
+            else:
+                self.mirror.sync_reminders(
+                    start_dt,
+                    end_dt,
+                    [
+                        (
+                            _item_key(r, "calendarItemIdentifier"),
+                            _reminder_record(r),
+                            _modified_date(r),
+                        )
+                        for r in fetched
+                    ],
+                )
+            reminders = [_reminder_record(r) for r in fetched]
         return {"events": events, "reminders": reminders}
 
+    def _fetch_reminders(self, start_dt: datetime, end_dt: datetime) -> Future:
+        """
+        Start fetching incomplete reminders due in [start_dt, end_dt].
+
+        EventKit filters by due date and calls back from its own queue, so the
+        returned future resolves while the caller does other work.
+        """
+        future = Future()
+
+        def completion(reminders, error=None):
+            if not future.done():
+                future.set_result(list(reminders or []))
+
+        try:
+            predicate = (
+                self.store.predicateForIncompleteRemindersWithDueDateStarting_ending_calendars_(
+                    _to_ns_date(start_dt), _to_ns_date(end_dt), None
+                )
+            )
+            self.store.fetchRemindersMatchingPredicate_completion_(
+                predicate, completion
+            )
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+        return future
+
+    def _expand_series(self, rec, start_dt: datetime, end_dt: datetime):
+        """Yield records of a series' occurrences in range, minus deleted ones."""
+        deleted_dates = self._deleted_occurrences.get(rec["title"], ())
+        duration = timedelta(minutes=rec["duration"])
+        for occ in rec["recurrence"].between(start_dt, end_dt):
+            if occ.date().isoformat() not in deleted_dates:
+                yield EventRecord(rec["title"], occ, occ + duration)
+
+    def _invalidate_occurrences(self, title: str, date: Optional[str] = None):
+        """Drop cached occurrences of series titled title (on date if given)."""
+        try:
+            day = datetime.strptime(date, "%Y-%m-%d").date() if date else None
+        except (TypeError, ValueError):
+            day = None
+        for rec in self._recurring_events:
+            if rec["title"] != title:
+                continue
+            if day is None:
+                self._occurrence_cache.invalidate_series(rec["series_id"])
+            else:
+                self._occurrence_cache.invalidate_day(rec["series_id"], day)
+
     def create_event(self, details):
         """Create an event via EventKit."""
         # Validate required fields
@@ -405,6 +953,13 @@ class EventKitAgent:
             pass
         # Handle recurring events
         if "recurrence_rule" in details:
+            # Parse the RRULE once; rules we can't parse are kept but not expanded
+            try:
+                recurrence = Recurrence(
+                    start_dt, details["recurrence_rule"], details.get("exdates", ())
+                )
+            except (TypeError, ValueError):
+                recurrence = None
             # Store recurrence details in memory
             self._recurring_events.append(
                 {
@@ -413,17 +968,37 @@ class EventKitAgent:
                     "time": details["time"],
                     "duration": details["duration"],
                     "recurrence_rule": details["recurrence_rule"],
+                    "recurrence": recurrence,
+                    "series_id": next(self._series_ids),
                 }
             )
             # Don't return early - continue to narrative memory processing
-        # Save to EventKit for one-off events
-        try:
-            success = self.store.saveEvent_span_error_(event, EKSpanThisEvent, None)
-        except Exception as e:
-            return {"success": False, "error": f"Failed to save event: {e}"}
-        if not success:
-            return {"success": False, "error": "Failed to save event"}
-
+        with self._index_lock:
+            # Look up overlapping events before saving
+            try:
+                conflicts = self.find_conflicts(start_dt, end_dt)
+            except Exception:
+                conflicts = []
+            # Save to EventKit for one-off events
+            try:
+                success = self._save_to_store(event)
+            except Exception as e:
+                return {"success": False, "error": f"Failed to save event: {e}"}
+            if not success:
+                return {"success": False, "error": "Failed to save event"}
+            self._update_index(added=[event])
+
+        # Memory updates don't hold up the reply
+        self._after_commit("remember_event", details)
+
+        result = {"success": True, "message": "Event created successfully"}
+        if conflicts:
+            result["conflicts"] = conflicts
+        return result
+
+    @_holding_memory_lock
+    def _remember_event(self, details: Dict) -> None:
+        """Add a created event to Core and Narrative memory."""
         # Add to Core memory system
         if self.core_memory:
             try:
@@ -567,8 +1142,7 @@ class EventKitAgent:
             except Exception as e:
                 print(f"Warning: Could not add event to Narrative memory: {e}")
 
-        return {"success": True, "message": "Event created successfully"}
-
+    @_holding_memory_lock
     def get_narrative_insights(self, query=None):
         """Get narrative memory insights and themes."""
         if not self.narrative_memory:
@@ -635,6 +1209,7 @@ class EventKitAgent:
             print(f"Warning: Could not get narrative insights: {e}")
             return {"themes": [], "patterns": [], "insights": []}
 
+    @_holding_memory_lock
     def search_narrative_themes(self, query):
         """Search narrative themes by query."""
         if not self.narrative_memory:
@@ -646,6 +1221,7 @@ class EventKitAgent:
             print(f"Warning: Could not search narrative themes: {e}")
             return []
 
+    @_holding_memory_lock
     def get_narrative_stats(self):
         """Get narrative memory statistics."""
         if not self.narrative_memory:
@@ -671,39 +1247,33 @@ class EventKitAgent:
             datetime.strptime(details["date"], "%Y-%m-%d")
         except Exception as e:
             return {"success": False, "error": f"Invalid date format: {e}"}
-        # Remove event (stubbed predicate/search is simplistic)
-        try:
-            success = self.store.removeEvent_span_error_(None, EKSpanThisEvent, None)
-        except Exception as e:
-            return {"success": False, "error": f"Failed to delete event: {e}"}
-        if not success:
-            return {"success": False, "error": "Failed to delete event"}
-
-        # Remove from Core memory system
-        if self.core_memory:
+        with self._index_lock:
+            # Find the event through the index and remove it
+            try:
+                target = self._find_event(details["title"], details["date"])
+                event = self._resolve_event(target) if target else None
+            except Exception:
+                target = event = None
             try:
-                # Find and delete the event from Core memory
-                # This is a simplified approach - in a real system you'd want more sophisticated matching
-                title = details.get("title")
-                if title:
-                    # Search for memories with this title and delete them
-                    memories_to_delete = []
-                    for memory_id, memory in self.core_memory.memories.items():
-                        if hasattr(memory, "title") and memory.title == title:
-                            memories_to_delete.append(memory_id)
-
-                    for memory_id in memories_to_delete:
-                        self.core_memory.delete_memory(memory_id)
+                success = self._remove_from_store(event)
             except Exception as e:
-                print(f"Warning: Could not remove event from Core memory: {e}")
+                return {"success": False, "error": f"Failed to delete event: {e}"}
+            if not success:
+                return {"success": False, "error": "Failed to delete event"}
+            if target:
+                self._update_index(removed=[target.key])
+
+        self._after_commit("forget_event", details)
 
         # Handle recurring deletion flags
         title = details.get("title")
         if details.get("delete_series"):
             self._deleted_series.add(title)
+            self._invalidate_occurrences(title)
         else:
             date = details.get("date")
             self._deleted_occurrences.setdefault(title, set()).add(date)
+            self._invalidate_occurrences(title, date)
         return {"success": True, "message": "Event deleted successfully"}
 
     def move_event(self, details):
@@ -728,45 +1298,81 @@ class EventKitAgent:
             datetime.strptime(details["new_time"], "%H:%M")
         except Exception as e:
             return {"success": False, "error": f"Invalid time format: {e}"}
-        # Find and update event (stubbed implementation)
-        try:
-            success = self.store.saveEvent_span_error_(None, EKSpanThisEvent, None)
-        except Exception as e:
-            return {"success": False, "error": f"Failed to move event: {e}"}
-        if not success:
-            return {"success": False, "error": "Failed to move event"}
+        with self._index_lock:
+            # Find the event through the index and update its times
+            try:
+                target = self._find_event(details["title"], details["old_date"])
+                event = self._resolve_event(target) if target else None
+            except Exception:
+                target = event = None
+            try:
+                if event is not None:
+                    new_start = datetime.strptime(
+                        f"{details['new_date']} {details['new_time']}", "%Y-%m-%d %H:%M"
+                    )
+                    new_end = new_start + (target.record.end - target.record.start)
+                    event.setStartDate_(_to_ns_date(new_start))
+                    event.setEndDate_(_to_ns_date(new_end))
+                success = self._save_to_store(event)
+            except Exception as e:
+                return {"success": False, "error": f"Failed to move event: {e}"}
+            if not success:
+                return {"success": False, "error": "Failed to move event"}
+            if event is not None:
+                self._update_index(added=[event], removed=[target.key])
 
+        self._after_commit("move_event_memory", details)
+
+        return {"success": True, "message": "Event moved successfully"}
+
+    @_holding_memory_lock
+    def _forget_event(self, details: Dict) -> None:
+        """Remove a deleted event from Core memory."""
+        # Remove from Core memory system
+        if self.core_memory:
+            try:
+                # A series delete drops the title's memories on every date
+                date = None if details.get("delete_series") else details["date"]
+                memory_ids = self.core_memory.find_past_events(details["title"], date)
+                self.core_memory.delete_memories(memory_ids)
+            except Exception as e:
+                print(f"Warning: Could not remove event from Core memory: {e}")
+
+    @_holding_memory_lock
+    def _move_event_memory(self, details: Dict) -> None:
+        """Re-date a moved event in Core memory."""
         # Update Core memory system
         if self.core_memory:
             try:
-                # Find and update the event in Core memory
-                title = details.get("title")
-                if title:
-                    # Search for memories with this title and update them
-                    for memory_id, memory in self.core_memory.memories.items():
-                        if hasattr(memory, "title") and memory.title == title:
-                            # Update the event data
-                            event_data = {
-                                "title": title,
-                                "description": getattr(memory, "description", ""),
-                                "start_date": details["new_date"],
-                                "duration": getattr(memory, "duration", 60),
-                                "attendees": getattr(memory, "attendees", []),
-                                "location": getattr(memory, "location", ""),
-                                "is_recurring": getattr(memory, "is_recurring", False),
-                                "recurrence_pattern": getattr(
-                                    memory, "recurrence_pattern", ""
-                                ),
-                                "text_for_embedding": f"{title} | {getattr(memory, 'description', '')} | Location: {getattr(memory, 'location', '')}",
-                            }
-                            # Delete old memory and add updated one
-                            self.core_memory.delete_memory(memory_id)
-                            self.core_memory.add_past_event(event_data)
-                            break
+                memory_ids = self.core_memory.find_past_events(
+                    details["title"], details["old_date"]
+                )
+                if memory_ids:
+                    self.core_memory.move_past_event(
+                        memory_ids[0], details["new_date"]
+                    )
             except Exception as e:
                 print(f"Warning: Could not update event in Core memory: {e}")
 
-        return {"success": True, "message": "Event moved successfully"}
+    def create_events(self, events: List[Dict]) -> Dict[str, Any]:
+        """
+        Create several events with one EventKit commit and one memory flush.
+
+        Args:
+            events: Event details, each as accepted by create_event
+
+        Returns:
+            Dictionary with overall success and the per-event results
+        """
+        return self._run_batch(self.create_event, events, "created")
+
+    def delete_events(self, events: List[Dict]) -> Dict[str, Any]:
+        """Delete several events with one EventKit commit and one memory flush."""
+        return self._run_batch(self.delete_event, events, "deleted")
+
+    def move_events(self, events: List[Dict]) -> Dict[str, Any]:
+        """Move several events with one EventKit commit and one memory flush."""
+        return self._run_batch(self.move_event, events, "moved")
 
     def add_notification(self, details):
         """Add notification to an event via EventKit."""
@@ -800,16 +1406,21 @@ class EventKitAgent:
                 len(self.store._events) if hasattr(self.store, "_events") else 0
             ),
             "core_memory_available": CORE_MEMORY_AVAILABLE,
+            "occurrence_cache": self._occurrence_cache.get_stats(),
+            "mirror": self.mirror.get_stats(),
+            "post_commit": self.post_commit.get_stats(),
         }
 
-        if self.core_memory:
-            stats["core_memory_stats"] = self.core_memory.get_stats()
+        with self._memory_lock:
+            if self.core_memory:
+                stats["core_memory_stats"] = self.core_memory.get_stats()
 
-        if self.nudger:
-            stats["nudger_stats"] = self.nudger.get_stats()
+            if self.nudger:
+                stats["nudger_stats"] = self.nudger.get_stats()
 
         return stats
 
+    @_holding_memory_lock
     def get_contextual_suggestions(self, context: Dict = None) -> List[Dict]:
         """
         Get contextual suggestions based on current context and user patterns.
@@ -863,27 +1474,25 @@ class EventKitAgent:
             print(f"Warning: Could not generate contextual suggestions: {e}")
             return []
 
+    def _today_bounds(self):
+        """Return (start, end) datetimes of the current day."""
+        day_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        return day_start, day_start + timedelta(days=1) - timedelta(microseconds=1)
+
     def _count_back_to_back_meetings(self) -> int:
         """Count back-to-back meetings in the current day."""
         try:
-            today = datetime.now().date()
-            events = self.store._events if hasattr(self.store, "_events") else []
-            today_events = [
-                event
-                for event in events
-                if hasattr(event, "startDate") and event.startDate.date() == today
-            ]
-
-            # Sort by start time
-            today_events.sort(key=lambda e: e.startDate)
+            day_start, day_end = self._today_bounds()
+            with self._index_lock:
+                today_events = self._indexed_events(day_start, day_end).starting_in(
+                    day_start, day_end
+                )
 
             back_to_back_count = 0
-            for i in range(len(today_events) - 1):
-                current_end = today_events[i].endDate
-                next_start = today_events[i + 1].startDate
-
+            for current, following in zip(today_events, today_events[1:]):
                 # If there's less than 15 minutes between events, count as back-to-back
-                if (next_start - current_end).total_seconds() < 900:  # 15 minutes
+                gap = following.record.start - current.record.end
+                if gap.total_seconds() < 900:  # 15 minutes
                     back_to_back_count += 1
 
             return back_to_back_count
@@ -895,65 +1504,122 @@ class EventKitAgent:
     def _count_available_slots(self) -> int:
         """Count available time slots in the current day."""
         try:
-            today = datetime.now().date()
-            events = self.store._events if hasattr(self.store, "_events") else []
-            today_events = [
-                event
-                for event in events
-                if hasattr(event, "startDate") and event.startDate.date() == today
-            ]
-
-            # Simple heuristic: count gaps of 30+ minutes
-            today_events.sort(key=lambda e: e.startDate)
-
-            available_slots = 0
-            work_start = datetime.combine(
-                today, datetime.min.time().replace(hour=9)
-            )  # 9 AM
-            work_end = datetime.combine(
-                today, datetime.min.time().replace(hour=17)
-            )  # 5 PM
-
-            # Check before first event
-            if (
-                today_events
-                and hasattr(today_events[0], "startDate")
-                and hasattr(today_events[0].startDate, "__gt__")
-            ):
-                if today_events[0].startDate > work_start:
-                    gap = (
-                        today_events[0].startDate - work_start
-                    ).total_seconds() / 3600
-                    if gap >= 0.5:  # 30 minutes
-                        available_slots += 1
-
-            # Check between events
-            for i in range(len(today_events) - 1):
-                current_end = today_events[i].endDate
-                next_start = today_events[i + 1].startDate
-
-                if hasattr(current_end, "__sub__") and hasattr(next_start, "__sub__"):
-                    gap = (next_start - current_end).total_seconds() / 3600
-                    if gap >= 0.5:  # 30 minutes
-                        available_slots += 1
-
-            # Check after last event
-            if (
-                today_events
-                and hasattr(today_events[-1], "endDate")
-                and hasattr(today_events[-1].endDate, "__lt__")
-            ):
-                if today_events[-1].endDate < work_end:
-                    gap = (work_end - today_events[-1].endDate).total_seconds() / 3600
-                    if gap >= 0.5:  # 30 minutes
-                        available_slots += 1
-
-            return available_slots
+            from utils.free_busy import FreeBusy
+
+            day_start, day_end = self._today_bounds()
+            with self._index_lock:
+                busy = self._busy_intervals(day_start, day_end)
+            # Free periods of 30+ minutes within working hours
+            free_busy = FreeBusy.from_intervals(day_start, 1, busy)
+            free = free_busy.free_periods(
+                timedelta(minutes=30), weekdays=range(7)
+            )
+            return len(free)
 
         except Exception as e:
             print(f"Warning: Could not count available slots: {e}")
             return 0
 
+    def _busy_intervals(
+        self, start_dt: datetime, end_dt: datetime, calendar: Optional[str] = None
+    ) -> List[tuple]:
+        """
+        (start, end) of events overlapping a range (index lock held).
+
+        Recurring occurrences are tracked by the agent rather than a store
+        calendar, so they count as busy whatever calendar is asked for.
+        """
+        busy = [
+            (entry.record.start, entry.record.end)
+            for entry in self._indexed_events(start_dt, end_dt).overlapping(
+                start_dt, end_dt
+            )
+            if calendar is None or entry.record.calendar == calendar
+        ]
+        # Occurrences starting the day before can run into the range
+        window_start = start_dt - timedelta(days=1)
+        for rec in self._recurring_events:
+            if rec.get("recurrence") is None or rec["title"] in self._deleted_series:
+                continue
+            occurrences = self._occurrence_cache.get(
+                rec["series_id"],
+                window_start,
+                end_dt,
+                lambda rec=rec: self._expand_series(rec, window_start, end_dt),
+            )
+            busy.extend((occ.start, occ.end) for occ in occurrences)
+        return busy
+
+    def find_free_slots(self, details):
+        """
+        Find free slots of a given duration.
+
+        Args:
+            details: duration (minutes), and optionally start_date and
+                end_date (default today to six days later), work_start and
+                work_end (HH:MM, default 09:00-17:00), include_weekends,
+                calendars (names that must all be free; default the whole
+                store), strategy ("first" or "best") and count
+
+        Returns:
+            Dictionary with success and the slots as (start, end) datetimes
+        """
+        from utils.free_busy import WEEKDAYS, FreeBusy
+
+        if not details.get("duration"):
+            return {"success": False, "error": "Missing duration"}
+        try:
+            duration = timedelta(minutes=int(details["duration"]))
+            start_date = parse_date_string(
+                details.get("start_date") or datetime.now().strftime("%Y-%m-%d")
+            )
+            start_dt = datetime.strptime(start_date, "%Y-%m-%d")
+            end_date = details.get("end_date")
+            end_dt = (
+                datetime.strptime(parse_date_string(end_date), "%Y-%m-%d")
+                if end_date
+                else start_dt + timedelta(days=6)
+            )
+            working_hours = tuple(
+                datetime.strptime(details.get(key) or default, "%H:%M").time()
+                for key, default in (("work_start", "09:00"), ("work_end", "17:00"))
+            )
+        except (TypeError, ValueError) as e:
+            return {"success": False, "error": f"Invalid slot request: {e}"}
+        if end_dt < start_dt:
+            return {"success": False, "error": "End date is before start date"}
+
+        days = (end_dt - start_dt).days + 1
+        range_end = end_dt + timedelta(days=1) - timedelta(microseconds=1)
+        with self._index_lock:
+            calendars = [
+                FreeBusy.from_intervals(
+                    start_dt, days, self._busy_intervals(start_dt, range_end, name)
+                )
+                for name in details.get("calendars") or [None]
+            ]
+        free_busy = FreeBusy.all_free(calendars)
+        # Time already past isn't free
+        free_busy.add_busy([(start_dt, datetime.now())])
+        try:
+            slots = free_busy.find_slots(
+                duration,
+                working_hours=working_hours,
+                weekdays=range(7) if details.get("include_weekends") else WEEKDAYS,
+                strategy=details.get("strategy", "first"),
+                count=int(details.get("count", 3)),
+            )
+        except ValueError as e:
+            return {"success": False, "error": str(e)}
+        if not slots:
+            return {"success": False, "error": "No free slot found", "slots": []}
+        return {
+            "success": True,
+            "message": f"Found {len(slots)} free slot(s)",
+            "slots": slots,
+        }
+
+    @_holding_memory_lock
     def handle_nudge_feedback(self, nudge_id: str, action: str, context: Dict = None):
         """
         Handle user feedback on a contextual nudge.
@@ -979,39 +1645,75 @@ class EventKitAgent:
             print(f"Warning: Could not handle nudge feedback: {e}")
 
 
-# Instantiate agent
-_agent = EventKitAgent()
+# The shared agent is created on first use (see _get_agent) so importing this
+# module stays cheap; module attribute access to _agent also creates it.
+_agent_lock = threading.Lock()
+
+
+def _get_agent() -> EventKitAgent:
+    """Return the shared EventKitAgent, creating it on first use."""
+    agent = globals().get("_agent")
+    if agent is None:
+        with _agent_lock:
+            agent = globals().get("_agent")
+            if agent is None:
+                agent = EventKitAgent()
+                globals()["_agent"] = agent
+    return agent
+
+
+def __getattr__(name):
+    if name == "_agent":
+        return _get_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # Expose functions matching calendar_agent interface
 
 
 def list_events_and_reminders(start_date=None, end_date=None):
-    return _agent.list_events_and_reminders(start_date, end_date)
+    return _get_agent().list_events_and_reminders(start_date, end_date)
 
 
 def create_event(details):
-    return _agent.create_event(details)
+    return _get_agent().create_event(details)
 
 
 def delete_event(details):
-    return _agent.delete_event(details)
+    return _get_agent().delete_event(details)
 
 
 def move_event(details):
-    return _agent.move_event(details)
+    return _get_agent().move_event(details)
+
+
+def create_events(events):
+    return _get_agent().create_events(events)
+
+
+def delete_events(events):
+    return _get_agent().delete_events(events)
+
+
+def move_events(events):
+    return _get_agent().move_events(events)
 
 
 def add_notification(details):
-    return _agent.add_notification(details)
+    return _get_agent().add_notification(details)
+
+
+def find_free_slots(details):
+    return _get_agent().find_free_slots(details)
 
 
 def get_contextual_suggestions(context=None):
-    return _agent.get_contextual_suggestions(context)
+    return _get_agent().get_contextual_suggestions(context)
 
 
 def handle_nudge_feedback(nudge_id, action, context=None):
-    return _agent.handle_nudge_feedback(nudge_id, action, context)
+    return _get_agent().handle_nudge_feedback(nudge_id, action, context)
 
 
 def get_stats():
-    return _agent.get_stats()
+    return _get_agent().get_stats()
@@ -1,23 +1,38 @@
 """Core memory and conversation systems for the calendar assistant."""
 
-from .conversation_manager import ConversationState
-from .memory_manager import CoreMemory, MemoryType
-from .embedding_manager import EmbeddingManager
-from .narrative_memory import NarrativeMemory
-from .nudge_engine import ContextualNudger
-from .types import Turn, MemoryItem
+import importlib
 
-__all__ = [
+# Exports are imported on first access so that importing one light module
+# (e.g. core.conversation_manager) doesn't pull in NumPy, ChromaDB and the
+# OpenAI SDK through the embedding manager.
+_EXPORTS = {
     # Conversation management
-    "ConversationState",
+    "ConversationState": ".conversation_manager",
     # Memory systems
-    "CoreMemory",
-    "MemoryType",
-    "EmbeddingManager",
-    "NarrativeMemory",
+    "CoreMemory": ".memory_manager",
+    "MemoryType": ".memory_manager",
+    "EmbeddingManager": ".embedding_manager",
+    "NarrativeMemory": ".narrative_memory",
     # Proactive features
-    "ContextualNudger",
+    "ContextualNudger": ".nudge_engine",
     # Data types
-    "Turn",
-    "MemoryItem",
-]
+    "Turn": ".types",
+    "MemoryItem": ".types",
+    "EventRecord": ".types",
+    "ReminderRecord": ".types",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
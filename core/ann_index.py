@@ -0,0 +1,408 @@
+"""Approximate nearest neighbour indexes over the local vector store.
+
+An index holds the row numbers of a VectorStore, whose rows are unit length,
+and ranks rows by inner product, which for unit vectors is their cosine
+similarity. Rows are inserted as they are appended to the store and deleted
+rows are tombstoned so searches skip them. Changes are saved to disk in
+batches (every ANN_SAVE_EVERY inserted or deleted rows, and on flush) rather
+than per row: the store records every row and tombstone itself, so whatever
+an index loses in a crash is replayed from the store when it is next opened.
+
+IVFIndex is plain NumPy: rows are grouped under their nearest k-means
+centroid and a query only scores the rows under its n_probe nearest
+centroids. HNSWIndex wraps hnswlib's graph index and is only available when
+hnswlib is installed.
+"""
+
+import os
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+ANN_INDEX_KINDS = ("exact", "ivf", "hnsw")
+ANN_SAVE_EVERY = 1024
+
+# IVF: lists are trained once enough rows exist to cluster, and retrained
+# when the store has grown fourfold since
+IVF_PROBES = 16
+IVF_MIN_TRAIN_SIZE = 1024
+IVF_RETRAIN_GROWTH = 4
+KMEANS_ITERATIONS = 8
+KMEANS_SAMPLE_PER_LIST = 32
+
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF = 64
+
+# Rows scored per matrix product when assigning rows to lists
+_ASSIGN_CHUNK = 65536
+
+
+def _unit(rows: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(rows, axis=1, keepdims=True)
+    return rows / np.maximum(norms, np.finfo(np.float32).tiny)
+
+
+def _top_k(
+    rows: np.ndarray, scores: np.ndarray, k: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """The k best rows and their scores, best first."""
+    k = min(k, len(scores))
+    if k <= 0:
+        return rows[:0], scores[:0]
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top], kind="stable")]
+    return rows[top], scores[top]
+
+
+class _SavedIndex:
+    """
+    Counts unsaved changes and saves once enough have built up.
+
+    Subclasses define save(), which writes the index and resets _unsaved.
+    """
+
+    save_every = ANN_SAVE_EVERY
+    _unsaved = 0
+
+    def flush(self) -> None:
+        """Save changes not yet on disk."""
+        if self._unsaved:
+            self.save()
+
+    def _changed(self, rows: int) -> None:
+        self._unsaved += rows
+        if self._unsaved >= self.save_every:
+            self.save()
+
+
+class IVFIndex(_SavedIndex):
+    """Inverted file index: rows grouped under their nearest k-means centroid."""
+
+    kind = "ivf"
+
+    def __init__(
+        self,
+        path: str,
+        n_probe: int = IVF_PROBES,
+        min_train_size: int = IVF_MIN_TRAIN_SIZE,
+        seed: int = 0,
+    ):
+        """
+        Initialize the index, loading it from path if it was saved.
+
+        Args:
+            path: Path to the saved index (.npz)
+            n_probe: Lists scanned per query; more gives better recall
+                for slower queries
+            min_train_size: Rows needed before lists are trained; until
+                then every row is scanned
+            seed: Seed for k-means sampling
+        """
+        self.path = path
+        self.n_probe = n_probe
+        self.min_train_size = min_train_size
+        self._rng = np.random.default_rng(seed)
+        self.centroids: Optional[np.ndarray] = None
+        self.trained_on = 0
+        self.size = 0
+        # List of each row (-1 until trained) and its tombstone
+        self._lists = np.empty(0, dtype=np.int32)
+        self._deleted = np.empty(0, dtype=bool)
+        # Rows sorted by list and where each list starts, built when searched
+        self._order: Optional[np.ndarray] = None
+        self._starts: Optional[np.ndarray] = None
+        if os.path.exists(path):
+            self._load()
+
+    def add(self, rows: Sequence[int], vectors: np.ndarray) -> None:
+        """
+        Insert rows of the store.
+
+        Args:
+            rows: Row numbers to insert
+            vectors: The store's full (rows, dimensions) matrix
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        if not len(rows):
+            return
+        self._grow(int(rows.max()) + 1)
+        self._order = None
+        live = self.size - int(self._deleted[: self.size].sum())
+        if self.centroids is None and live >= self.min_train_size:
+            train = True
+        else:
+            train = (
+                self.centroids is not None
+                and self.size >= IVF_RETRAIN_GROWTH * self.trained_on
+            )
+        if train:
+            self._train(vectors)
+            # Training is too slow to repeat after a crash
+            self.save()
+            return
+        if self.centroids is not None:
+            self._lists[rows] = self._nearest(vectors[rows])
+        self._changed(len(rows))
+
+    def remove(self, rows: Sequence[int]) -> None:
+        """Tombstone rows so searches skip them."""
+        rows = np.asarray(rows, dtype=np.int64)
+        rows = rows[rows < self.size]
+        if len(rows) and not self._deleted[rows].all():
+            self._deleted[rows] = True
+            self._changed(len(rows))
+
+    def search(
+        self, query: np.ndarray, k: int, vectors: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find rows similar to a unit-length query.
+
+        Args:
+            query: Query vector
+            k: Number of rows to return
+            vectors: The store's full (rows, dimensions) matrix
+
+        Returns:
+            Row numbers and their similarities, most similar first
+        """
+        live = ~self._deleted[: self.size]
+        if self.centroids is None:
+            candidates = np.flatnonzero(live)
+        else:
+            if self._order is None:
+                self._order = np.argsort(self._lists[: self.size], kind="stable")
+                self._starts = np.searchsorted(
+                    self._lists[: self.size][self._order],
+                    np.arange(len(self.centroids) + 1),
+                )
+            n_probe = min(self.n_probe, len(self.centroids))
+            probe = np.argpartition(-(self.centroids @ query), n_probe - 1)[:n_probe]
+            candidates = np.sort(
+                np.concatenate(
+                    [self._order[self._starts[i] : self._starts[i + 1]] for i in probe]
+                )
+            )
+            candidates = candidates[live[candidates]]
+        return _top_k(candidates, vectors[candidates] @ query, k)
+
+    def clear(self) -> None:
+        """Drop every row and the saved index."""
+        self.centroids = None
+        self.trained_on = self.size = 0
+        self._lists = np.empty(0, dtype=np.int32)
+        self._deleted = np.empty(0, dtype=bool)
+        self._order = None
+        self._unsaved = 0
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def save(self) -> None:
+        """Write the index to path, replacing the saved one atomically."""
+        self._unsaved = 0
+        partial = self.path + ".tmp"
+        with open(partial, "wb") as f:
+            np.savez(
+                f,
+                centroids=(
+                    self.centroids
+                    if self.centroids is not None
+                    else np.empty((0, 0), dtype=np.float32)
+                ),
+                lists=self._lists[: self.size],
+                deleted=self._deleted[: self.size],
+                trained_on=np.int64(self.trained_on),
+            )
+        os.replace(partial, self.path)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "rows": self.size,
+            "deleted": int(self._deleted[: self.size].sum()),
+            "lists": 0 if self.centroids is None else len(self.centroids),
+            "n_probe": self.n_probe,
+            "trained_on": self.trained_on,
+            "path": self.path,
+        }
+
+    def _load(self) -> None:
+        with np.load(self.path) as saved:
+            centroids = saved["centroids"]
+            self.centroids = centroids if centroids.size else None
+            self._lists = saved["lists"].astype(np.int32)
+            self._deleted = saved["deleted"].astype(bool)
+            self.trained_on = int(saved["trained_on"])
+        self.size = len(self._lists)
+
+    def _grow(self, size: int) -> None:
+        """Track rows up to size, doubling the per-row arrays when full."""
+        if size > len(self._lists):
+            capacity = max(size, 2 * len(self._lists))
+            extra = capacity - len(self._lists)
+            self._lists = np.concatenate(
+                [self._lists, np.full(extra, -1, dtype=np.int32)]
+            )
+            self._deleted = np.concatenate([self._deleted, np.zeros(extra, dtype=bool)])
+        self.size = max(self.size, size)
+
+    def _nearest(self, rows: np.ndarray, centroids=None) -> np.ndarray:
+        """Index of the most similar centroid for each row."""
+        centroids = self.centroids if centroids is None else centroids
+        return np.concatenate(
+            [
+                np.argmax(rows[start : start + _ASSIGN_CHUNK] @ centroids.T, axis=1)
+                for start in range(0, len(rows), _ASSIGN_CHUNK)
+            ]
+        ).astype(np.int32)
+
+    def _train(self, vectors: np.ndarray) -> None:
+        """Cluster a sample of live rows with spherical k-means, then assign all."""
+        live = np.flatnonzero(~self._deleted[: self.size])
+        n_lists = max(1, int(np.sqrt(len(live))))
+        sample_size = min(len(live), n_lists * KMEANS_SAMPLE_PER_LIST)
+        sample = np.sort(self._rng.choice(live, sample_size, replace=False))
+        data = np.asarray(vectors[sample], dtype=np.float32)
+        centroids = data[self._rng.choice(len(data), n_lists, replace=False)]
+
+        for _ in range(KMEANS_ITERATIONS):
+            assigned = self._nearest(data, centroids)
+            order = np.argsort(assigned, kind="stable")
+            counts = np.bincount(assigned, minlength=n_lists)
+            filled = np.flatnonzero(counts)
+            starts = np.concatenate(([0], np.cumsum(counts[filled])[:-1]))
+            sums = np.zeros_like(centroids)
+            sums[filled] = np.add.reduceat(data[order], starts, axis=0)
+            # Lists that lost every row restart from a random sampled row
+            empty = np.flatnonzero(counts == 0)
+            sums[empty] = data[self._rng.choice(len(data), len(empty))]
+            centroids = _unit(sums)
+
+        self.centroids = centroids
+        self._lists[: self.size] = self._nearest(vectors[: self.size])
+        self.trained_on = self.size
+
+
+class HNSWIndex(_SavedIndex):
+    """hnswlib graph index over inner product; requires hnswlib."""
+
+    kind = "hnsw"
+
+    def __init__(
+        self,
+        path: str,
+        dimensions: Optional[int] = None,
+        ef: int = HNSW_EF,
+        m: int = HNSW_M,
+        ef_construction: int = HNSW_EF_CONSTRUCTION,
+    ):
+        """
+        Initialize the index, loading it from path if it was saved.
+
+        Args:
+            path: Path to the saved index
+            dimensions: Vector length, needed to load a saved index; an
+                index without it is created on the first insert
+            ef: Search breadth; more gives better recall for slower queries
+            m: Graph links per node
+            ef_construction: Search breadth while inserting
+        """
+        if hnswlib is None:
+            raise ImportError("hnswlib is not installed")
+        self.path = path
+        self.ef = ef
+        self.m = m
+        self.ef_construction = ef_construction
+        self.index = None
+        if dimensions and os.path.exists(path):
+            self.index = hnswlib.Index(space="ip", dim=dimensions)
+            self.index.load_index(path)
+
+    @property
+    def size(self) -> int:
+        return 0 if self.index is None else self.index.get_current_count()
+
+    def add(self, rows: Sequence[int], vectors: np.ndarray) -> None:
+        """Insert rows of the store, given its full matrix."""
+        rows = np.asarray(rows, dtype=np.int64)
+        if not len(rows):
+            return
+        if self.index is None:
+            self.index = hnswlib.Index(space="ip", dim=vectors.shape[1])
+            self.index.init_index(
+                max_elements=max(1024, len(rows)),
+                ef_construction=self.ef_construction,
+                M=self.m,
+            )
+        needed = self.size + len(rows)
+        if needed > self.index.get_max_elements():
+            self.index.resize_index(max(needed, 2 * self.index.get_max_elements()))
+        self.index.add_items(np.asarray(vectors[rows]), rows)
+        self._changed(len(rows))
+
+    def remove(self, rows: Sequence[int]) -> None:
+        """Tombstone rows so searches skip them."""
+        changed = 0
+        for row in rows:
+            try:
+                self.index.mark_deleted(int(row))
+                changed += 1
+            except (AttributeError, RuntimeError):
+                # Not in the index, or already deleted
+                pass
+        if changed:
+            self._changed(changed)
+
+    def search(
+        self, query: np.ndarray, k: int, vectors: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Find up to k rows similar to a unit-length query, most similar first."""
+        if self.index is None or k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        self.index.set_ef(max(self.ef, k))
+        labels, distances = self.index.knn_query(query, k=k)
+        # hnswlib's inner product distance is 1 - similarity
+        return labels[0].astype(np.int64), 1 - distances[0]
+
+    def clear(self) -> None:
+        """Drop every row and the saved index."""
+        self.index = None
+        self._unsaved = 0
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def save(self) -> None:
+        self._unsaved = 0
+        if self.index is not None:
+            self.index.save_index(self.path)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"kind": self.kind, "rows": self.size, "ef": self.ef, "path": self.path}
+
+
+def create_ann_index(kind: str, path_prefix: str, dimensions: Optional[int] = None):
+    """
+    Create the ANN index of a kind, or None for exact search.
+
+    Args:
+        kind: One of ANN_INDEX_KINDS; "hnsw" falls back to "ivf" when hnswlib
+            is not installed
+        path_prefix: Saved index path without its extension
+        dimensions: Vector length of the store, if it has vectors
+    """
+    if kind == "exact":
+        return None
+    if kind == "hnsw":
+        if hnswlib is not None:
+            return HNSWIndex(path_prefix + "_hnsw.bin", dimensions)
+        print("Warning: hnswlib not available. Using IVF index.")
+        kind = "ivf"
+    if kind == "ivf":
+        return IVFIndex(path_prefix + "_ivf.npz")
+    raise ValueError(f"Unknown ANN index: {kind}")
@@ -1,22 +1,77 @@
 """Conversation memory and session state management."""
 
+import math
 from collections import deque
 from datetime import datetime
 from typing import List, Optional, Dict, Any
 from .types import Turn
 
+# Default token budget for conversation context sent to the LLM
+DEFAULT_CONTEXT_TOKEN_BUDGET = 400
+
+# Detail fields kept when an older turn is compacted; enough for the LLM to
+# resolve "it" / "that meeting" back to a concrete event
+SUMMARY_DETAIL_KEYS = (
+    "title",
+    "date",
+    "time",
+    "old_date",
+    "new_date",
+    "new_time",
+    "start_date",
+    "end_date",
+)
+MAX_DETAIL_VALUE_CHARS = 40
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the token count of text without calling a tokenizer.
+
+    Uses the ~4 characters per token rule of thumb for English text, which is
+    close enough for budgeting prompt context.
+    """
+    if not text:
+        return 0
+    return math.ceil(len(text) / 4)
+
+
+def _format_details(details: Dict[str, Any], keys: Optional[tuple] = None) -> str:
+    """Render details as compact 'key=value' pairs, skipping empty values."""
+    parts = []
+    for key, value in details.items():
+        if keys is not None and key not in keys:
+            continue
+        if value in (None, "", [], {}):
+            continue
+        text = str(value)
+        if len(text) > MAX_DETAIL_VALUE_CHARS:
+            text = text[: MAX_DETAIL_VALUE_CHARS - 3] + "..."
+        parts.append(f"{key}={text}")
+    return "; ".join(parts)
+
 
 class ConversationState:
     """Manages ephemeral conversation context for the current session."""
 
-    def __init__(self, max_context_size: int = 10):
+    def __init__(
+        self,
+        max_context_size: int = 10,
+        token_budget: int = DEFAULT_CONTEXT_TOKEN_BUDGET,
+        full_turns: int = 2,
+    ):
         """
         Initialize conversation state.
 
         Args:
             max_context_size: Maximum number of turns to keep in context
+            token_budget: Estimated token budget for build_llm_context
+            full_turns: Number of most recent turns rendered in full by
+                build_llm_context; older turns are compacted to one line
         """
         self.max_context_size = max_context_size
+        self.token_budget = token_budget
+        self.full_turns = full_turns
         self.turns = deque(maxlen=max_context_size)
         self.turn_count = 0
 
@@ -141,6 +196,62 @@ class ConversationState:
 
         return "\n".join(context_lines)
 
+    def build_llm_context(self, token_budget: Optional[int] = None) -> str:
+        """
+        Build conversation context for the LLM within a token budget.
+
+        The most recent turns are rendered in full (with compact details instead
+        of the raw details dict); older turns are compacted to one-line
+        summaries that keep the fields needed for reference resolution. Turns
+        are added newest first until the estimated budget is used up.
+
+        Args:
+            token_budget: Estimated token budget (defaults to self.token_budget)
+
+        Returns:
+            Formatted context string, oldest turn first
+        """
+        turns = list(self.turns)
+        if not turns:
+            return ""
+        budget = self.token_budget if token_budget is None else token_budget
+
+        selected = []
+        used = 0
+        for age, turn in enumerate(reversed(turns)):
+            candidates = [self._summarize_turn(turn)]
+            if age < self.full_turns:
+                candidates.insert(0, self._format_full_turn(turn))
+            block = None
+            for candidate in candidates:
+                cost = estimate_tokens(candidate) + 1  # newline separator
+                if used + cost <= budget:
+                    block = candidate
+                    used += cost
+                    break
+            if block is None:
+                break
+            selected.append(block)
+
+        if not selected:
+            # Even the latest turn's summary is over budget; keep what fits
+            selected.append(self._summarize_turn(turns[-1])[: max(budget, 0) * 4])
+
+        return "\n".join(reversed(selected))
+
+    def _format_full_turn(self, turn: Turn) -> str:
+        """Render a turn in the User/Assistant/Details format."""
+        lines = [f"User: {turn.user_input}", f"Assistant: {turn.assistant_action}"]
+        details = _format_details(turn.assistant_details or {})
+        if details:
+            lines.append(f"Details: {details}")
+        return "\n".join(lines)
+
+    def _summarize_turn(self, turn: Turn) -> str:
+        """Compact a turn to a single structured line."""
+        details = _format_details(turn.assistant_details or {}, SUMMARY_DETAIL_KEYS)
+        return f'Earlier: User: "{turn.user_input}" -> Assistant: {turn.assistant_action}({details})'
+
     def get_turn_count(self) -> int:
         """Get the total number of turns in this session."""
         return self.turn_count
@@ -0,0 +1,173 @@
+"""Persistent content-addressed cache of embedding vectors.
+
+Vectors are keyed by the embedding model and the SHA-256 of the embedded
+text, so the same text is only sent to the API once per model however many
+times an event is added, moved or searched for. They are stored as float32
+blobs (4 bytes per dimension) and the least recently used entries are evicted
+once the cache holds max_entries vectors.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "100000"))
+
+# Keys per query, below SQLite's limit on bound parameters
+_LOOKUP_CHUNK = 500
+
+
+def text_hash(text: str) -> str:
+    """Return the SHA-256 hex digest identifying an embedded text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """SQLite-backed float32 vectors keyed by (model, text hash), LRU evicted."""
+
+    def __init__(
+        self,
+        db_path: str = "core/embedding_cache.db",
+        max_entries: int = EMBEDDING_CACHE_MAX_ENTRIES,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            db_path: Path to the SQLite database (":memory:" for a cache
+                that lives only as long as this object)
+            max_entries: Number of vectors kept before the least recently
+                used are evicted
+        """
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(db_path)
+        if directory and db_path != ":memory:":
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    model TEXT NOT NULL,
+                    text_hash TEXT NOT NULL,
+                    vector BLOB NOT NULL,  -- float32
+                    last_used REAL NOT NULL,
+                    PRIMARY KEY (model, text_hash)
+                )
+            """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_embeddings_last_used "
+                "ON embeddings(last_used)"
+            )
+
+    def get_many(
+        self, model: str, texts: Sequence[str]
+    ) -> List[Optional[List[float]]]:
+        """
+        Look up the cached embeddings of texts.
+
+        Returns:
+            One vector per text, None where the text is not cached
+        """
+        hashes = [text_hash(text) for text in texts]
+        found: Dict[str, bytes] = {}
+        try:
+            with self._lock, self._conn:
+                unique = list(dict.fromkeys(hashes))
+                for start in range(0, len(unique), _LOOKUP_CHUNK):
+                    chunk = unique[start : start + _LOOKUP_CHUNK]
+                    marks = ",".join("?" * len(chunk))
+                    found.update(
+                        self._conn.execute(
+                            "SELECT text_hash, vector FROM embeddings "
+                            f"WHERE model = ? AND text_hash IN ({marks})",
+                            [model, *chunk],
+                        ).fetchall()
+                    )
+                    self._conn.execute(
+                        "UPDATE embeddings SET last_used = ? "
+                        f"WHERE model = ? AND text_hash IN ({marks})",
+                        [time.time(), model, *chunk],
+                    )
+        except sqlite3.Error as e:
+            print(f"Warning: Could not read embedding cache: {e}")
+
+        vectors = [
+            np.frombuffer(found[h], dtype=np.float32).tolist() if h in found else None
+            for h in hashes
+        ]
+        hits = sum(vector is not None for vector in vectors)
+        self.hits += hits
+        self.misses += len(vectors) - hits
+        return vectors
+
+    def put_many(
+        self, model: str, texts: Sequence[str], embeddings: Sequence[Sequence[float]]
+    ) -> None:
+        """Store embeddings and evict least recently used entries if needed."""
+        now = time.time()
+        rows = [
+            (model, text_hash(text), np.asarray(v, dtype=np.float32).tobytes(), now)
+            for text, v in zip(texts, embeddings)
+        ]
+        try:
+            with self._lock, self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings "
+                    "(model, text_hash, vector, last_used) VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+                self._evict()
+        except sqlite3.Error as e:
+            print(f"Warning: Could not write embedding cache: {e}")
+
+    def _evict(self) -> None:
+        """Drop least recently used entries over max_entries."""
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                """
+                DELETE FROM embeddings WHERE rowid IN (
+                    SELECT rowid FROM embeddings
+                    ORDER BY last_used ASC, rowid ASC LIMIT ?
+                )
+            """,
+                (overflow,),
+            )
+
+    def clear(self) -> None:
+        """Remove all cached vectors and reset counters."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM embeddings")
+        self.hits = 0
+        self.misses = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        try:
+            with self._lock:
+                (entries,) = self._conn.execute(
+                    "SELECT COUNT(*) FROM embeddings"
+                ).fetchone()
+        except sqlite3.Error:
+            entries = 0
+        total = self.hits + self.misses
+        return {
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "database_path": self.db_path,
+        }
@@ -1,11 +1,22 @@
 """Embedding manager for Core memory system."""
 
+import atexit
 import json
 import os
+import random
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional, Any
 from datetime import datetime, timedelta
 import numpy as np
 
+from core.ann_index import create_ann_index
+from core.embedding_cache import EmbeddingCache
+from core.vector_store import VectorStore
+from utils.rate_limiter import RateLimiter
+
 try:
     import openai
 except ImportError:
@@ -17,16 +28,76 @@ try:
 except ImportError:
     chromadb = None
 
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_DIMENSIONS = 1536
+
+# Backfills send inputs in chunks, several chunks at a time, within the API's
+# request and token rate limits
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "256"))
+EMBEDDING_CONCURRENCY = int(os.getenv("EMBEDDING_CONCURRENCY", "4"))
+EMBEDDING_REQUESTS_PER_MINUTE = int(os.getenv("EMBEDDING_REQUESTS_PER_MINUTE", "3000"))
+EMBEDDING_TOKENS_PER_MINUTE = int(os.getenv("EMBEDDING_TOKENS_PER_MINUTE", "1000000"))
+EMBEDDING_MAX_RETRIES = 5
+EMBEDDING_RETRY_BASE_SECONDS = 0.5
+EMBEDDING_RETRY_MAX_SECONDS = 20.0
+
+# Index the local vector store searches through: "exact" scores every vector,
+# "ivf" and "hnsw" are approximate (see core/ann_index.py)
+EMBEDDING_ANN_INDEX = os.getenv("EMBEDDING_ANN_INDEX", "exact")
+
+# Errors worth retrying: rate limits, server errors and dropped connections
+_RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+_RETRYABLE_ERRORS = {"APIConnectionError", "APITimeoutError"}
+
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    if type(error).__name__ in _RETRYABLE_ERRORS:
+        return True
+    return getattr(error, "status_code", None) in _RETRYABLE_STATUS
+
+
+def _retry_delay(error: Exception, attempt: int) -> float:
+    """Seconds to wait before retry number attempt (from 0)."""
+    try:
+        retry_after = float(error.response.headers.get("retry-after"))
+    except Exception:
+        retry_after = None
+    if retry_after is not None:
+        return min(retry_after, EMBEDDING_RETRY_MAX_SECONDS)
+    delay = EMBEDDING_RETRY_BASE_SECONDS * 2**attempt
+    return min(delay, EMBEDDING_RETRY_MAX_SECONDS) * random.uniform(0.5, 1.0)
+
+
+def _unit_rows(vectors) -> np.ndarray:
+    """Return vectors as float32 rows scaled to unit length (zero rows stay zero)."""
+    rows = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(rows, axis=1, keepdims=True)
+    return np.divide(rows, norms, out=np.zeros_like(rows), where=norms > 0)
+
+
+def _flush_at_exit(manager_ref):
+    # A manager dropped before exit needs nothing: the next one to open the
+    # store replays changes its index did not save
+    manager = manager_ref()
+    if manager is not None:
+        manager.flush()
+
 
 class EmbeddingManager:
     """Manages embeddings for calendar events and other data."""
 
-    def __init__(self, vector_db_path: str = "core/memory.db"):
+    def __init__(
+        self, vector_db_path: str = "core/memory.db", ann_index: Optional[str] = None
+    ):
         """
         Initialize the embedding manager.
 
         Args:
             vector_db_path: Path to the vector database
+            ann_index: Index for searching the local vector store: "exact",
+                "ivf" or "hnsw"; defaults to EMBEDDING_ANN_INDEX
         """
         self.vector_db_path = vector_db_path
         self.client = None
@@ -35,6 +106,25 @@ class EmbeddingManager:
         # Initialize vector database
         self._init_vector_db()
 
+        # Embeddings already fetched for a text, kept beside the vector database
+        self.cache = EmbeddingCache(
+            os.path.join(os.path.dirname(vector_db_path), "embedding_cache.db")
+        )
+
+        # Used when ChromaDB is not available, opened on first use
+        self.ann_index_kind = ann_index or EMBEDDING_ANN_INDEX
+        self._vector_store: Optional[VectorStore] = None
+        self._ann_index = None
+        self._open_lock = threading.RLock()
+        if not self.collection:
+            self._open_vector_store()
+
+        # Shared by the threads sending embedding requests
+        self.request_limiter = RateLimiter(EMBEDDING_REQUESTS_PER_MINUTE)
+        self.token_limiter = RateLimiter(EMBEDDING_TOKENS_PER_MINUTE)
+        self.requests_sent = 0
+        self.retries = 0
+
         # OpenAI client for embeddings
         self.openai_client = None
         if openai:
@@ -42,10 +132,40 @@ class EmbeddingManager:
             if api_key:
                 self.openai_client = openai.OpenAI(api_key=api_key)
 
+    @property
+    def vector_store(self) -> VectorStore:
+        """Local vector store, opened on first use."""
+        return self._open_vector_store()
+
+    @property
+    def ann_index(self):
+        """Index over the local vector store, None for exact search."""
+        self._open_vector_store()
+        return self._ann_index
+
+    def _open_vector_store(self) -> VectorStore:
+        """Open the local vector store and its ANN index if not open yet."""
+        with self._open_lock:
+            if self._vector_store is not None:
+                return self._vector_store
+            store = VectorStore(self.vector_db_path.replace(".db", "_vectors.npy"))
+            self._ann_index = create_ann_index(
+                self.ann_index_kind,
+                self.vector_db_path.replace(".db", "_vectors"),
+                store.dimensions,
+            )
+            self._vector_store = store
+            self._import_json_embeddings()
+            self._sync_ann_index()
+            if self._ann_index is not None:
+                # Index changes are saved in batches; save the rest on exit
+                atexit.register(_flush_at_exit, weakref.ref(self))
+            return store
+
     def _init_vector_db(self):
         """Initialize the vector database."""
         if not chromadb:
-            print("Warning: ChromaDB not available. Using simple JSON storage.")
+            print("Warning: ChromaDB not available. Using local vector store.")
             return
 
         try:
@@ -168,38 +288,115 @@ class EmbeddingManager:
         """
         Create embeddings for event data.
 
+        Texts already in the embedding cache are not sent again, and each
+        distinct text is sent once. The rest are sent in chunks of
+        EMBEDDING_BATCH_SIZE per request, up to EMBEDDING_CONCURRENCY requests
+        at a time under the rate limiters. Rate-limited and failed requests
+        are retried with backoff. A chunk the API rejects is retried one event
+        at a time, and an event that still fails gets a random embedding,
+        which is not cached.
+
         Args:
             event_data: List of event dictionaries
 
         Returns:
-            List of embedding vectors
+            List of embedding vectors, in the order of event_data
         """
+        texts = []
+        for event in event_data:
+            text = event.get("text_for_embedding") or ""
+            # Use title as fallback
+            texts.append(text if text.strip() else event.get("title", "calendar event"))
+        embeddings = self.cache.get_many(EMBEDDING_MODEL, texts)
+
+        # First event needing each uncached text
+        missing: Dict[str, int] = {}
+        for i, (text, embedding) in enumerate(zip(texts, embeddings)):
+            if embedding is None:
+                missing.setdefault(text, i)
+        if not missing:
+            return embeddings
         if not self.openai_client:
             print("Warning: OpenAI client not available. Using random embeddings.")
-            return [np.random.rand(1536).tolist() for _ in event_data]
+            return [
+                embedding or np.random.rand(EMBEDDING_DIMENSIONS).tolist()
+                for embedding in embeddings
+            ]
 
-        embeddings = []
+        to_send = list(missing)
+        events = [event_data[i] for i in missing.values()]
+        fetched: List[Optional[List[float]]] = [None] * len(to_send)
 
-        for event in event_data:
-            try:
-                text = event["text_for_embedding"]
-                if not text.strip():
-                    # Use title as fallback
-                    text = event.get("title", "calendar event")
+        def embed_chunk(start: int):
+            end = start + EMBEDDING_BATCH_SIZE
+            fetched[start:end] = self._embed_chunk(
+                to_send[start:end], events[start:end]
+            )
 
+        chunk_starts = range(0, len(to_send), EMBEDDING_BATCH_SIZE)
+        if len(chunk_starts) <= 1:
+            for start in chunk_starts:
+                embed_chunk(start)
+        else:
+            with ThreadPoolExecutor(max_workers=EMBEDDING_CONCURRENCY) as pool:
+                list(pool.map(embed_chunk, chunk_starts))
+
+        embedded = [(t, e) for t, e in zip(to_send, fetched) if e is not None]
+        if embedded:
+            self.cache.put_many(EMBEDDING_MODEL, *zip(*embedded))
+        by_text = dict(zip(to_send, fetched))
+        return [
+            embedding
+            or by_text[text]
+            or np.random.rand(EMBEDDING_DIMENSIONS).tolist()
+            for text, embedding in zip(texts, embeddings)
+        ]
+
+    def _embed_chunk(
+        self, texts: List[str], events: List[Dict]
+    ) -> List[Optional[List[float]]]:
+        """Embed one chunk, falling back to one request per event (None if it fails)."""
+        try:
+            return self._request_embeddings(texts)
+        except Exception as e:
+            error = e
+        if len(texts) > 1 and not _is_retryable(error):
+            # The API rejected the chunk; find the events it can't embed
+            return [
+                self._embed_chunk([text], [event])[0]
+                for text, event in zip(texts, events)
+            ]
+        for event in events:
+            print(
+                f"Warning: Could not create embedding for event {event.get('title', 'unknown')}: {error}"
+            )
+        return [None] * len(texts)
+
+    def _request_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Send one embeddings request, retrying rate limits and transient errors."""
+        # Rough token count: about four characters per token
+        tokens = sum(len(text) for text in texts) // 4 + len(texts)
+        for attempt in range(EMBEDDING_MAX_RETRIES + 1):
+            self.request_limiter.acquire()
+            self.token_limiter.acquire(tokens)
+            self.requests_sent += 1
+            try:
                 response = self.openai_client.embeddings.create(
-                    model="text-embedding-3-small", input=text
+                    model=EMBEDDING_MODEL, input=texts
                 )
-
-                embeddings.append(response.data[0].embedding)
             except Exception as e:
-                print(
-                    f"Warning: Could not create embedding for event {event.get('title', 'unknown')}: {e}"
-                )
-                # Fallback to random embedding
-                embeddings.append(np.random.rand(1536).tolist())
-
-        return embeddings
+                if attempt == EMBEDDING_MAX_RETRIES or not _is_retryable(e):
+                    raise
+                self.retries += 1
+                time.sleep(_retry_delay(e, attempt))
+                continue
+            data = list(response.data)
+            if len(data) != len(texts):
+                raise ValueError(f"Expected {len(texts)} embeddings, got {len(data)}")
+            # Results carry the index of their input; keep input order
+            if all(isinstance(getattr(item, "index", None), int) for item in data):
+                data.sort(key=lambda item: item.index)
+            return [item.embedding for item in data]
 
     def store_embeddings(
         self, embeddings: List[List[float]], metadata: List[Dict]
@@ -215,8 +412,7 @@ class EmbeddingManager:
             True if successful, False otherwise
         """
         if not self.collection:
-            print("Warning: No vector database available. Storing in JSON file.")
-            return self._store_in_json(embeddings, metadata)
+            return self._store_in_vector_store(embeddings, metadata)
 
         try:
             # Prepare data for ChromaDB
@@ -236,26 +432,71 @@ class EmbeddingManager:
             print(f"Error storing embeddings: {e}")
             return False
 
-    def _store_in_json(
+    def _store_in_vector_store(
         self, embeddings: List[List[float]], metadata: List[Dict]
     ) -> bool:
-        """Store embeddings in JSON file as fallback."""
+        """Append embeddings to the local vector store as fallback."""
+        if len(embeddings) == 0:
+            return True
         try:
-            data = {
-                "embeddings": embeddings,
-                "metadata": metadata,
-                "created": datetime.now().isoformat(),
-            }
-
-            json_path = self.vector_db_path.replace(".db", ".json")
-            with open(json_path, "w") as f:
-                json.dump(data, f, indent=2)
-
+            # Stored at unit length so searches need no norms
+            rows = self.vector_store.append(_unit_rows(embeddings), metadata)
+            if self.ann_index is not None:
+                self.ann_index.add(rows, self.vector_store.vectors)
             return True
         except Exception as e:
-            print(f"Error storing in JSON: {e}")
+            print(f"Error storing in vector store: {e}")
             return False
 
+    def _import_json_embeddings(self):
+        """Move embeddings saved by the old JSON fallback into an empty store."""
+        json_path = self.vector_db_path.replace(".db", ".json")
+        if len(self.vector_store) or not os.path.exists(json_path):
+            return
+        try:
+            with open(json_path, "r") as f:
+                data = json.load(f)
+            embeddings = data.get("embeddings", [])
+            metadata = data.get("metadata", [])[: len(embeddings)]
+            self._store_in_vector_store(embeddings[: len(metadata)], metadata)
+        except Exception as e:
+            print(f"Warning: Could not import embeddings from {json_path}: {e}")
+
+    def _sync_ann_index(self):
+        """Bring the ANN index up to date with rows added or deleted since it saved."""
+        if self.ann_index is None:
+            return
+        try:
+            store = self.vector_store
+            if self.ann_index.size > len(store):
+                # The store lost rows the index has (see VectorStore)
+                self.ann_index.clear()
+            missing = range(self.ann_index.size, len(store))
+            if missing:
+                self.ann_index.add(missing, store.vectors)
+            self.ann_index.remove(store.deleted_rows)
+            self.ann_index.flush()
+        except Exception as e:
+            print(f"Warning: Could not update ANN index: {e}")
+
+    def flush(self):
+        """Save ANN index changes that are not on disk yet."""
+        if self._ann_index is not None:
+            try:
+                self._ann_index.flush()
+            except Exception as e:
+                print(f"Warning: Could not save ANN index: {e}")
+
+    def clear_vector_store(self):
+        """Remove every embedding from the local vector store and its index."""
+        if self._vector_store is None and not os.path.exists(
+            self.vector_db_path.replace(".db", "_vectors.db")
+        ):
+            return
+        self.vector_store.clear()
+        if self.ann_index is not None:
+            self.ann_index.clear()
+
     def search_similar(self, query: str, top_k: int = 5) -> List[Dict]:
         """
         Search for similar events using semantic similarity.
@@ -267,16 +508,16 @@ class EmbeddingManager:
         Returns:
             List of similar events with metadata
         """
-        if not self.openai_client:
+        (query_embedding,) = self.cache.get_many(EMBEDDING_MODEL, [query])
+        if query_embedding is None and not self.openai_client:
             print("Warning: OpenAI client not available. Returning empty results.")
             return []
 
         try:
-            # Create embedding for query
-            response = self.openai_client.embeddings.create(
-                model="text-embedding-3-small", input=query
-            )
-            query_embedding = response.data[0].embedding
+            if query_embedding is None:
+                # Create embedding for query
+                (query_embedding,) = self._request_embeddings([query])
+                self.cache.put_many(EMBEDDING_MODEL, [query], [query_embedding])
 
             if self.collection:
                 # Search in ChromaDB
@@ -301,48 +542,48 @@ class EmbeddingManager:
 
                 return similar_events
             else:
-                # Fallback to JSON search
-                return self._search_in_json(query_embedding, top_k)
+                # Fallback to the local vector store
+                return self._search_in_vector_store(query_embedding, top_k)
 
         except Exception as e:
             print(f"Error searching similar events: {e}")
             return []
 
-    def _search_in_json(self, query_embedding: List[float], top_k: int) -> List[Dict]:
-        """Search in JSON file as fallback."""
+    def _search_in_vector_store(
+        self, query_embedding: List[float], top_k: int
+    ) -> List[Dict]:
+        """
+        Search in the local vector store as fallback.
+
+        Stored rows are unit length, so one matrix-vector product with the
+        normalized query gives every cosine similarity, and only the top_k
+        best are sorted. With an ANN index only the rows it selects are
+        scored. Deleted rows are skipped.
+        """
         try:
-            json_path = self.vector_db_path.replace(".db", ".json")
-            if not os.path.exists(json_path):
+            embeddings = self.vector_store.vectors
+            k = min(top_k, self.vector_store.live_count)
+            if k <= 0:
                 return []
+            query = _unit_rows(query_embedding)[0]
 
-            with open(json_path, "r") as f:
-                data = json.load(f)
-
-            embeddings = data.get("embeddings", [])
-            metadata = data.get("metadata", [])
-
-            # Calculate similarities
-            similarities = []
-            for i, embedding in enumerate(embeddings):
-                similarity = np.dot(query_embedding, embedding) / (
-                    np.linalg.norm(query_embedding) * np.linalg.norm(embedding)
-                )
-                similarities.append((similarity, i))
-
-            # Sort by similarity and return top_k
-            similarities.sort(reverse=True)
-            results = []
-
-            for similarity, idx in similarities[:top_k]:
-                if idx < len(metadata):
-                    results.append(
-                        {"metadata": metadata[idx], "similarity": float(similarity)}
-                    )
+            if self.ann_index is not None:
+                top, scores = self.ann_index.search(query, k, embeddings)
+            else:
+                similarities = embeddings @ query
+                similarities[self.vector_store.deleted_rows] = -np.inf
+                top = np.argpartition(-similarities, k - 1)[:k]
+                top = top[np.argsort(-similarities[top], kind="stable")]
+                scores = similarities[top]
+            metadata = self.vector_store.metadata(top.tolist())
 
-            return results
+            return [
+                {"metadata": meta, "similarity": float(score)}
+                for score, meta in zip(scores, metadata)
+            ]
 
         except Exception as e:
-            print(f"Error searching in JSON: {e}")
+            print(f"Error searching in vector store: {e}")
             return []
 
     def update_event_embedding(self, event_id: str, event_data: Dict) -> bool:
@@ -373,7 +614,7 @@ class EmbeddingManager:
             True if successful, False otherwise
         """
         if not self.collection:
-            return True  # Nothing to delete in JSON fallback
+            return self._delete_from_vector_store(event_id)
 
         try:
             # Find and delete the event
@@ -385,6 +626,18 @@ class EmbeddingManager:
             print(f"Error deleting event embedding: {e}")
             return False
 
+    def _delete_from_vector_store(self, event_id: str) -> bool:
+        """Tombstone the local vector store rows of an event."""
+        try:
+            rows = self.vector_store.find("event_id", event_id)
+            self.vector_store.delete(rows)
+            if self.ann_index is not None:
+                self.ann_index.remove(rows)
+            return True
+        except Exception as e:
+            print(f"Error deleting event embedding: {e}")
+            return False
+
     def add_event_embedding(self, event_data: Dict) -> bool:
         """
         Add embedding for a new event.
@@ -410,6 +663,12 @@ class EmbeddingManager:
         Returns:
             Dictionary with statistics
         """
+        stats = self._storage_stats()
+        stats["embedding_cache"] = self.cache.get_stats()
+        return stats
+
+    def _storage_stats(self) -> Dict[str, Any]:
+        """Get the event count and location of the stored embeddings."""
         if self.collection:
             try:
                 count = self.collection.count()
@@ -422,19 +681,18 @@ class EmbeddingManager:
                 print(f"Error getting stats: {e}")
                 return {"error": str(e)}
         else:
-            # Check JSON file
-            json_path = self.vector_db_path.replace(".db", ".json")
-            if os.path.exists(json_path):
-                try:
-                    with open(json_path, "r") as f:
-                        data = json.load(f)
-                    return {
-                        "total_events": len(data.get("embeddings", [])),
-                        "storage_type": "json",
-                        "database_path": json_path,
-                    }
-                except Exception as e:
-                    return {"error": str(e)}
+            # Check the local vector store
+            if self.vector_store.live_count:
+                return {
+                    "total_events": self.vector_store.live_count,
+                    "storage_type": "vector_store",
+                    "database_path": self.vector_store.vectors_path,
+                    "ann_index": (
+                        self.ann_index.get_stats()
+                        if self.ann_index is not None
+                        else {"kind": "exact"}
+                    ),
+                }
             else:
                 return {
                     "total_events": 0,
@@ -2,7 +2,8 @@
 
 import json
 import os
-from typing import List, Dict, Optional, Any
+from contextlib import contextmanager
+from typing import Iterable, List, Dict, Optional, Any, Set
 from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
 from enum import Enum
@@ -19,6 +20,11 @@ class MemoryType(Enum):
     PREFERENCE = "preference"
 
 
+def _normalize_title(title: str) -> str:
+    """Case- and whitespace-insensitive form of an event title."""
+    return " ".join(str(title).split()).casefold()
+
+
 @dataclass
 class Memory:
     """Base memory structure."""
@@ -93,6 +99,14 @@ class CoreMemory:
         self.embedding_manager = EmbeddingManager(memory_db_path)
         self.memories: Dict[str, Memory] = {}
 
+        # Nesting depth of deferred_save() blocks, and what they have put off
+        self._defer_depth = 0
+        self._dirty = False
+        self._pending_embeddings: List[Dict] = []
+
+        # Past-event memory ids by normalized title, then by date
+        self._event_index: Dict[str, Dict[str, Set[str]]] = {}
+
         # Load existing memories
         self._load_memories()
 
@@ -119,12 +133,63 @@ class CoreMemory:
                         continue
 
                     self.memories[memory.id] = memory
+                    self._index_memory(memory)
 
             except Exception as e:
                 print(f"Warning: Could not load memories: {e}")
 
+    def _index_memory(self, memory: Memory):
+        """Add a past event to the title/date index."""
+        if isinstance(memory, PastEvent):
+            by_date = self._event_index.setdefault(_normalize_title(memory.title), {})
+            by_date.setdefault(memory.date, set()).add(memory.id)
+
+    def _unindex_memory(self, memory: Memory):
+        """Remove a past event from the title/date index."""
+        if not isinstance(memory, PastEvent):
+            return
+        title = _normalize_title(memory.title)
+        by_date = self._event_index.get(title, {})
+        ids = by_date.get(memory.date, set())
+        ids.discard(memory.id)
+        if not ids:
+            by_date.pop(memory.date, None)
+        if not by_date:
+            self._event_index.pop(title, None)
+
+    @contextmanager
+    def deferred_save(self):
+        """
+        Defer persistence until the outermost block exits.
+
+        Memories added or deleted inside the block are written to storage, and
+        their embeddings created and stored, once on exit instead of per change.
+        """
+        self._defer_depth += 1
+        try:
+            yield self
+        finally:
+            self._defer_depth -= 1
+            if self._defer_depth == 0:
+                self.flush()
+
+    def flush(self):
+        """Store pending embeddings and write memories if anything changed."""
+        pending, self._pending_embeddings = self._pending_embeddings, []
+        if pending:
+            embeddings = self.embedding_manager.create_embeddings(pending)
+            if embeddings:
+                self.embedding_manager.store_embeddings(embeddings, pending)
+            self.embedding_manager.flush()
+        if self._dirty:
+            self._save_memories()
+
     def _save_memories(self):
         """Save memories to storage."""
+        if self._defer_depth:
+            self._dirty = True
+            return
+        self._dirty = False
         json_path = self.memory_db_path.replace(".db", "_memories.json")
         try:
             # Convert memories to serializable format
@@ -357,6 +422,11 @@ class CoreMemory:
             ID of the created memory
         """
         memory_id = f"past_event_{datetime.now().timestamp()}"
+        # Events added in a tight loop can share a timestamp
+        suffix = 1
+        while memory_id in self.memories:
+            memory_id = f"past_event_{datetime.now().timestamp()}_{suffix}"
+            suffix += 1
 
         # Create past event memory
         past_event = PastEvent(
@@ -376,11 +446,12 @@ class CoreMemory:
             tags=event_data.get("tags", []),
         )
 
-        # Add to embedding manager
-        self.embedding_manager.add_event_embedding(event_data)
+        # Keyed by memory ID so a move can replace the embedding
+        self._embed({**event_data, "event_id": memory_id})
 
         # Store in memory
         self.memories[memory_id] = past_event
+        self._index_memory(past_event)
         self._save_memories()
 
         return memory_id
@@ -519,11 +590,115 @@ class CoreMemory:
             True if successful, False otherwise
         """
         if memory_id in self.memories:
-            del self.memories[memory_id]
+            self._forget_memory(self.memories.pop(memory_id))
             self._save_memories()
             return True
         return False
 
+    def find_past_events(self, title: str, date: Optional[str] = None) -> List[str]:
+        """
+        Find past events by title, and optionally by date, via the index.
+
+        Args:
+            title: Event title (case and extra whitespace are ignored)
+            date: Event date (YYYY-MM-DD), or None for any date
+
+        Returns:
+            IDs of the matching past-event memories
+        """
+        by_date = self._event_index.get(_normalize_title(title), {})
+        if date is not None:
+            return list(by_date.get(date, ()))
+        return [memory_id for ids in by_date.values() for memory_id in ids]
+
+    def delete_memories(self, memory_ids: Iterable[str]) -> int:
+        """
+        Delete several memories with a single write.
+
+        Args:
+            memory_ids: Memory IDs
+
+        Returns:
+            Number of memories deleted
+        """
+        deleted = 0
+        for memory_id in memory_ids:
+            memory = self.memories.pop(memory_id, None)
+            if memory is not None:
+                self._forget_memory(memory)
+                deleted += 1
+        if deleted:
+            self._save_memories()
+        return deleted
+
+    def move_past_event(self, memory_id: str, new_date: str) -> bool:
+        """
+        Change the date of a past event.
+
+        Args:
+            memory_id: Memory ID
+            new_date: New event date (YYYY-MM-DD)
+
+        Returns:
+            True if successful, False otherwise
+        """
+        memory = self.memories.get(memory_id)
+        if not isinstance(memory, PastEvent):
+            return False
+        self._unindex_memory(memory)
+        memory.date = new_date
+        self._index_memory(memory)
+        self._reembed_past_event(memory)
+        self._save_memories()
+        return True
+
+    def _forget_memory(self, memory: Memory) -> None:
+        """Drop a deleted memory from the index and its embedding from search."""
+        self._unindex_memory(memory)
+        if not isinstance(memory, PastEvent):
+            return
+        pending = [
+            data for data in self._pending_embeddings if data["event_id"] != memory.id
+        ]
+        if len(pending) < len(self._pending_embeddings):
+            self._pending_embeddings = pending
+        else:
+            self.embedding_manager.delete_event_embedding(memory.id)
+
+    def _embed(self, event_data: Dict) -> None:
+        """Add an event's embedding (in one request per batch when deferred)."""
+        if self._defer_depth:
+            self._pending_embeddings.append(event_data)
+        else:
+            self.embedding_manager.add_event_embedding(event_data)
+
+    def _reembed_past_event(self, memory: PastEvent) -> None:
+        """Replace a past event's embedding so its metadata has the new date."""
+        pending = [
+            data for data in self._pending_embeddings if data["event_id"] == memory.id
+        ]
+        for data in pending:
+            data["start_date"] = memory.date
+        if pending:
+            return
+        # The embedded text is unchanged, so the embedding cache serves it
+        self.embedding_manager.delete_event_embedding(memory.id)
+        self._embed(
+            {
+                "event_id": memory.id,
+                "title": memory.title,
+                "description": memory.description,
+                "start_date": memory.date,
+                "duration": memory.duration,
+                "attendees": memory.attendees,
+                "location": memory.location,
+                "is_recurring": memory.is_recurring,
+                "recurrence_pattern": memory.recurrence_pattern,
+                "tags": memory.tags,
+                "text_for_embedding": memory.content,
+            }
+        )
+
     def get_stats(self) -> Dict[str, Any]:
         """
         Get statistics about the memory system.
@@ -549,9 +724,11 @@ class CoreMemory:
     def clear_all_memories(self):
         """Clear all memories (use with caution)."""
         self.memories.clear()
+        self._event_index.clear()
         self._save_memories()
 
         # Also clear embedding data
+        self.embedding_manager.clear_vector_store()
         json_path = self.memory_db_path.replace(".db", ".json")
         if os.path.exists(json_path):
             os.remove(json_path)
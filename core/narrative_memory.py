@@ -3,6 +3,7 @@
 import json
 import os
 import uuid
+from contextlib import contextmanager
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, asdict
@@ -77,6 +78,10 @@ class NarrativeMemory:
         self.themes: Dict[str, ThemeEntry] = {}
         self.patterns: Dict[str, DynamicPattern] = {}
 
+        # Nesting depth of deferred_save() blocks, and whether they saved
+        self._defer_depth = 0
+        self._dirty = False
+
         # Load existing narrative data
         self._load_narrative_data()
 
@@ -99,8 +104,23 @@ class NarrativeMemory:
             self.themes = {}
             self.patterns = {}
 
+    @contextmanager
+    def deferred_save(self):
+        """Write narrative data once when the outermost block exits."""
+        self._defer_depth += 1
+        try:
+            yield self
+        finally:
+            self._defer_depth -= 1
+            if self._defer_depth == 0 and self._dirty:
+                self._save_narrative_data()
+
     def _save_narrative_data(self):
         """Save narrative data to storage."""
+        if self._defer_depth:
+            self._dirty = True
+            return
+        self._dirty = False
         try:
             os.makedirs(os.path.dirname(self.storage_path), exist_ok=True)
             data = {
@@ -52,3 +52,72 @@ class ConversationContext:
         """Set default values after initialization."""
         if self.user_preferences is None:
             self.user_preferences = {}
+
+
+class EventRecord:
+    """A calendar event (or recurring occurrence) returned by listings.
+
+    Holds raw values only; utils.cli_output formats them when printed.
+    """
+
+    __slots__ = ("title", "start", "end", "calendar", "id")
+
+    def __init__(
+        self,
+        title: str,
+        start: datetime,
+        end: Optional[datetime] = None,
+        calendar: Optional[str] = None,
+        id: Optional[str] = None,
+    ):
+        self.title = title
+        self.start = start
+        self.end = end if end is not None else start
+        self.calendar = calendar
+        self.id = id
+
+    def _fields(self):
+        return (self.title, self.start, self.end, self.calendar, self.id)
+
+    def __eq__(self, other):
+        if not isinstance(other, EventRecord):
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    def __hash__(self):
+        return hash(self._fields())
+
+    def __repr__(self):
+        return f"EventRecord({self.title!r}, {self.start!r}, {self.end!r})"
+
+
+class ReminderRecord:
+    """An incomplete reminder returned by listings (due may be None)."""
+
+    __slots__ = ("title", "due", "calendar", "id")
+
+    def __init__(
+        self,
+        title: str,
+        due: Optional[datetime] = None,
+        calendar: Optional[str] = None,
+        id: Optional[str] = None,
+    ):
+        self.title = title
+        self.due = due
+        self.calendar = calendar
+        self.id = id
+
+    def _fields(self):
+        return (self.title, self.due, self.calendar, self.id)
+
+    def __eq__(self, other):
+        if not isinstance(other, ReminderRecord):
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    def __hash__(self):
+        return hash(self._fields())
+
+    def __repr__(self):
+        return f"ReminderRecord({self.title!r}, {self.due!r})"
@@ -0,0 +1,255 @@
+"""Append-only float32 vector store backed by a memory-mapped .npy file.
+
+Vectors are rows of a preallocated float32 matrix saved in .npy format and
+opened as a memory map, so loading the store reads only the header and
+searches page rows in on demand. Appends write into the spare rows, and the
+matrix is only copied when it runs out of them, into one twice the size.
+
+A SQLite sidecar holds one metadata row per vector and is the record of how
+many rows are in use: vectors are flushed before their metadata is committed,
+so rows written by an append that did not finish are reused by the next one.
+Metadata rows whose vectors the file does not hold, because it is missing or
+truncated, are dropped with a warning when the store is opened.
+Deleting a vector only marks its row as deleted (a tombstone); the row keeps
+its number and its place in the matrix.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+DEFAULT_CAPACITY = 1024
+
+
+class VectorStore:
+    """Memory-mapped float32 matrix of vectors with a metadata row per vector."""
+
+    def __init__(
+        self,
+        vectors_path: str,
+        metadata_path: Optional[str] = None,
+        initial_capacity: int = DEFAULT_CAPACITY,
+    ):
+        """
+        Open the store, creating it on the first append.
+
+        Args:
+            vectors_path: Path to the .npy matrix
+            metadata_path: Path to the SQLite metadata table, defaults to
+                vectors_path with a .db extension
+            initial_capacity: Rows preallocated when the matrix is created
+        """
+        self.vectors_path = vectors_path
+        self.metadata_path = metadata_path or os.path.splitext(vectors_path)[0] + ".db"
+        self.initial_capacity = max(1, initial_capacity)
+        self._lock = threading.Lock()
+        self._matrix: Optional[np.memmap] = None
+
+        directory = os.path.dirname(vectors_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(self.metadata_path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS vectors (
+                    row INTEGER PRIMARY KEY,
+                    metadata TEXT NOT NULL,  -- JSON
+                    deleted INTEGER NOT NULL DEFAULT 0
+                )
+            """
+            )
+            columns = [c[1] for c in self._conn.execute("PRAGMA table_info(vectors)")]
+            if "deleted" not in columns:
+                self._conn.execute(
+                    "ALTER TABLE vectors ADD COLUMN deleted INTEGER NOT NULL DEFAULT 0"
+                )
+        (self.count,) = self._conn.execute(
+            "SELECT COALESCE(MAX(row) + 1, 0) FROM vectors"
+        ).fetchone()
+        deleted = self._conn.execute("SELECT row FROM vectors WHERE deleted")
+        self._deleted = {row for (row,) in deleted}
+        stored = 0
+        if os.path.exists(vectors_path):
+            try:
+                stored = self._rows_on_disk()
+                self._matrix = np.load(vectors_path, mmap_mode="r+")
+            except (OSError, ValueError) as e:
+                print(f"Warning: Could not load vectors from {vectors_path}: {e}")
+        if self.count > stored:
+            self._drop_rows_without_vectors(stored)
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def live_count(self) -> int:
+        """Number of vectors not deleted."""
+        return self.count - len(self._deleted)
+
+    @property
+    def deleted_rows(self) -> np.ndarray:
+        """Sorted row numbers of deleted vectors."""
+        return np.array(sorted(self._deleted), dtype=np.int64)
+
+    @property
+    def capacity(self) -> int:
+        return 0 if self._matrix is None else self._matrix.shape[0]
+
+    @property
+    def dimensions(self) -> Optional[int]:
+        return None if self._matrix is None else self._matrix.shape[1]
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """Read-only (count, dimensions) view of the stored vectors, not a copy."""
+        if self._matrix is None:
+            return np.empty((0, 0), dtype=np.float32)
+        view = self._matrix[: self.count].view(np.ndarray)
+        view.flags.writeable = False
+        return view
+
+    def append(
+        self, vectors: Sequence[Sequence[float]], metadata: Sequence[Dict[str, Any]]
+    ) -> List[int]:
+        """
+        Add vectors and their metadata.
+
+        Returns:
+            The row number of each vector
+        """
+        rows = np.asarray(vectors, dtype=np.float32)
+        if len(rows) != len(metadata):
+            raise ValueError(f"Got {len(rows)} vectors for {len(metadata)} metadata")
+        if rows.size == 0:
+            return []
+        if rows.ndim != 2:
+            raise ValueError("Vectors must all have the same length")
+        with self._lock:
+            if self.dimensions not in (None, rows.shape[1]):
+                raise ValueError(
+                    f"Expected {self.dimensions}-dimensional vectors, "
+                    f"got {rows.shape[1]}"
+                )
+            start = self.count
+            self._reserve(start + len(rows), rows.shape[1])
+            self._matrix[start : start + len(rows)] = rows
+            self._matrix.flush()
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO vectors (row, metadata, deleted) "
+                    "VALUES (?, ?, 0)",
+                    [
+                        (start + i, json.dumps(meta, default=str))
+                        for i, meta in enumerate(metadata)
+                    ],
+                )
+            self.count = start + len(rows)
+            self._deleted.difference_update(range(start, self.count))
+        return list(range(start, self.count))
+
+    def find(self, field: str, value: Any) -> List[int]:
+        """Return the rows, not deleted, whose metadata has field equal to value."""
+        with self._lock:
+            return [
+                row
+                for (row,) in self._conn.execute(
+                    "SELECT row FROM vectors "
+                    "WHERE NOT deleted AND json_extract(metadata, ?) = ?",
+                    (f"$.{field}", value),
+                )
+            ]
+
+    def delete(self, rows: Sequence[int]) -> None:
+        """Mark rows as deleted."""
+        rows = [int(row) for row in rows]
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "UPDATE vectors SET deleted = 1 WHERE row = ?",
+                    [(row,) for row in rows],
+                )
+            self._deleted.update(row for row in rows if row < self.count)
+
+    def metadata(self, rows: Sequence[int]) -> List[Dict[str, Any]]:
+        """Return the metadata of the given rows, in the same order."""
+        found = {}
+        with self._lock:
+            for start in range(0, len(rows), 500):
+                chunk = [int(row) for row in rows[start : start + 500]]
+                marks = ",".join("?" * len(chunk))
+                found.update(
+                    self._conn.execute(
+                        f"SELECT row, metadata FROM vectors WHERE row IN ({marks})",
+                        chunk,
+                    ).fetchall()
+                )
+        return [json.loads(found[int(row)]) for row in rows]
+
+    def clear(self) -> None:
+        """Remove every vector and its metadata."""
+        with self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM vectors")
+            self._matrix = None
+            self.count = 0
+            self._deleted.clear()
+            if os.path.exists(self.vectors_path):
+                os.remove(self.vectors_path)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the size and location of the store."""
+        return {
+            "vectors": self.count,
+            "deleted": len(self._deleted),
+            "capacity": self.capacity,
+            "dimensions": self.dimensions,
+            "vectors_path": self.vectors_path,
+            "metadata_path": self.metadata_path,
+        }
+
+    def _rows_on_disk(self) -> int:
+        """Count the matrix rows the .npy file holds in full."""
+        with open(self.vectors_path, "rb") as f:
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, _, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, _, dtype = np.lib.format.read_array_header_2_0(f)
+            data = os.path.getsize(self.vectors_path) - f.tell()
+        row_bytes = shape[1] * dtype.itemsize if len(shape) == 2 else 0
+        return min(shape[0], data // row_bytes) if row_bytes else 0
+
+    def _drop_rows_without_vectors(self, stored: int) -> None:
+        """Forget metadata rows past the end of a missing or truncated matrix."""
+        # Memory-mapping a truncated file pads it with zeros, so those rows
+        # would load without error as zero vectors
+        print(
+            f"Warning: {self.metadata_path} has {self.count} vectors but "
+            f"{self.vectors_path} holds {stored}; dropping the rest"
+        )
+        with self._conn:
+            self._conn.execute("DELETE FROM vectors WHERE row >= ?", (stored,))
+        self.count = stored
+        self._deleted = {row for row in self._deleted if row < stored}
+
+    def _reserve(self, rows: int, dimensions: int) -> None:
+        """Make room for rows vectors, doubling the matrix when it is full."""
+        if rows <= self.capacity:
+            return
+        capacity = max(rows, 2 * self.capacity, self.initial_capacity)
+        partial = self.vectors_path + ".tmp"
+        grown = np.lib.format.open_memmap(
+            partial, mode="w+", dtype=np.float32, shape=(capacity, dimensions)
+        )
+        if self._matrix is not None:
+            grown[: self.count] = self._matrix[: self.count]
+        grown.flush()
+        del grown
+        self._matrix = None
+        os.replace(partial, self.vectors_path)
+        self._matrix = np.load(self.vectors_path, mmap_mode="r+")
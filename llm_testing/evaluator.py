@@ -9,8 +9,9 @@ from .types import EvaluationResult
 
 # Import OpenAI client
 try:
-    from openai_client import client
+    from openai_client import get_client
 
+    client = get_client()
     OPENAI_AVAILABLE = client is not None
 except ImportError:
     OPENAI_AVAILABLE = False
@@ -5,14 +5,19 @@ from dotenv import load_dotenv
 # Load environment variables from .env FIRST
 load_dotenv()
 
+import threading
+
 import openai_client
-from utils.command_dispatcher import dispatch
+from utils.command_dispatcher import dispatch, prepare
 from core.conversation_manager import ConversationState
 
 # Main terminal loop
 if __name__ == "__main__":
     print("Welcome to the Terminal Calendar Assistant! Type 'exit' to quit.")
 
+    # Import the OpenAI SDK and load models while the user types
+    threading.Thread(target=openai_client.warm_up, daemon=True).start()
+
     # Initialize conversation state for session memory
     conversation_state = ConversationState()
     turn_count = 0
@@ -23,17 +28,16 @@ if __name__ == "__main__":
             print("Goodbye!")
             break
 
-        # Build conversation context for LLM, including current user input on subsequent turns
-        if conversation_state.turn_count > 0:
-            # Include recent turns and the current user input in context
-            context = conversation_state.get_context_for_llm_prompt()
-            context += f"\nUser: {user_input}"
-        else:
-            # No context on first turn
-            context = ""
-
-        # Interpret the command using GPT-4o with conversation context
-        interpreted = openai_client.interpret_command(user_input, context)
+        # Conversation context for the LLM: the earlier turns only (empty on
+        # the first turn). The input itself is sent as the user message, and
+        # leaving it out lets rephrasings hit the response cache.
+        context = conversation_state.build_llm_context()
+
+        # Interpret the command using GPT-4o with conversation context; the
+        # handler starts preparing as soon as the action name is known
+        interpreted = openai_client.interpret_command(
+            user_input, context, on_action=prepare
+        )
         print(f"\n[Interpreted]: {interpreted}")
 
         # Handle different action types
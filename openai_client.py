@@ -2,13 +2,20 @@
 
 from dotenv import load_dotenv  # type: ignore
 import os
-
-try:
-    import openai  # type: ignore
-except Exception:  # pragma: no cover - optional dependency
-    openai = None
+import asyncio
+import copy
 import json
+import random
+import re
+import time
+import weakref
 from datetime import datetime
+from typing import Dict, Any, List, Optional, Callable, Tuple
+
+from utils.circuit_breaker import CircuitBreaker
+from utils.command_utils import classify_intent, parse_command_with_confidence
+from utils.date_utils import parse_date_string
+from utils.response_cache import ResponseCache
 
 
 # Load environment variables from .env
@@ -16,8 +23,86 @@ load_dotenv()
 # Load API key from environment
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
-# Create OpenAI client (for SDK v1.x)
-client = openai.OpenAI(api_key=OPENAI_API_KEY) if openai and OPENAI_API_KEY else None
+# The OpenAI SDK takes about half a second to import, so it is imported and
+# the client (SDK v1.x) created on first use; see get_client() and warm_up().
+_LAZY = object()
+client = _LAZY
+_openai_module = _LAZY
+
+# Async interpretation settings: one pooled AsyncOpenAI client per event loop,
+# at most ASYNC_MAX_CONCURRENCY requests in flight, and retries with jittered
+# exponential backoff on timeouts, rate limits and server errors.
+ASYNC_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "8"))
+ASYNC_MAX_RETRIES = 3
+ASYNC_BACKOFF_BASE = 0.5
+ASYNC_BACKOFF_MAX = 8.0
+# OpenAI SDK errors raised when a request got no answer (APITimeoutError is a
+# subclass of APIConnectionError)
+_NETWORK_ERRORS = {"APIConnectionError"}
+_async_clients = weakref.WeakKeyDictionary()
+_async_semaphores = weakref.WeakKeyDictionary()
+
+# Local fast path: commands the regex parsers in utils.command_utils fully
+# explain are answered without a GPT-4o round trip. Set CALENDAR_FAST_PATH=0
+# to always go to the LLM.
+FAST_PATH_ENABLED = os.getenv("CALENDAR_FAST_PATH", "1") != "0"
+FAST_PATH_CONFIDENCE_THRESHOLD = 0.9
+_fast_path_stats = {"hits": 0, "misses": 0}
+
+# Persistent cache of LLM interpretations keyed on normalized input, context
+# fingerprint and date, opened on first use (see _get_response_cache()). Set
+# CALENDAR_RESPONSE_CACHE=0 to disable.
+RESPONSE_CACHE_ENABLED = os.getenv("CALENDAR_RESPONSE_CACHE", "1") != "0"
+response_cache = _LAZY
+
+# Local intent classifier (utils.intent_classifier): confident predictions of
+# the parameterless listing actions skip the LLM. Commands that need details
+# (titles, dates) or are ambiguous still escalate to GPT-4o. Set
+# CALENDAR_INTENT_CLASSIFIER=0 to disable.
+INTENT_CLASSIFIER_ENABLED = os.getenv("CALENDAR_INTENT_CLASSIFIER", "1") != "0"
+INTENT_ROUTE_THRESHOLD = 0.85
+INTENT_ROUTED_ACTIONS = {
+    "list_events_only",
+    "list_reminders_only",
+    "list_all",
+    "list_todays_events",
+}
+# Words that narrow a listing to dates the classifier cannot extract; commands
+# with any of them (or a weekday, or a digit) escalate so the range is kept
+_DATE_RANGE_WORDS = {
+    "tonight",
+    "yesterday",
+    "next",
+    "last",
+    "this",
+    "week",
+    "weekend",
+    "month",
+    "year",
+    "until",
+    "through",
+    "since",
+    "january",
+    "february",
+    "march",
+    "april",
+    "may",
+    "june",
+    "july",
+    "august",
+    "september",
+    "october",
+    "november",
+    "december",
+}
+intent_classifier = _LAZY  # loaded on first use, see _get_intent_classifier()
+_intent_route_stats = {"routed": 0, "escalated": 0}
+
+# Circuit breaker around the LLM: when recent calls mostly fail or are slow,
+# interpretation degrades to local-only parsing until a background probe sees
+# the API healthy again. Set CALENDAR_CIRCUIT_BREAKER=0 to disable.
+CIRCUIT_BREAKER_ENABLED = os.getenv("CALENDAR_CIRCUIT_BREAKER", "1") != "0"
+CIRCUIT_BREAKER_PROBE_TIMEOUT = 5.0
 
 # Define available functions for function calling
 calendar_functions = [
@@ -107,6 +192,42 @@ calendar_functions = [
             "required": ["title", "date"],
         },
     },
+    {
+        "name": "find_free_slots",
+        "description": "Find free time slots of a given length in the calendar.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "duration": {"type": "integer", "description": "Duration in minutes"},
+                "start_date": {
+                    "type": "string",
+                    "description": "First day to search (YYYY-MM-DD)",
+                },
+                "end_date": {
+                    "type": "string",
+                    "description": "Last day to search (YYYY-MM-DD)",
+                },
+                "work_start": {
+                    "type": "string",
+                    "description": "Earliest start time (e.g., 09:00)",
+                },
+                "work_end": {
+                    "type": "string",
+                    "description": "Latest end time (e.g., 17:00)",
+                },
+                "include_weekends": {
+                    "type": "boolean",
+                    "description": "Whether weekend days can be used",
+                },
+                "calendars": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Calendars that must all be free",
+                },
+            },
+            "required": ["duration"],
+        },
+    },
     {
         "name": "clarify",
         "description": "Ask user for clarification when request is ambiguous",
@@ -149,19 +270,485 @@ calendar_functions = [
 ]
 
 
+# Chat Completions tool schema, built once from calendar_functions
+calendar_tools = [
+    {"type": "function", "function": function} for function in calendar_functions
+]
+
+
+def _with_item_number(function: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy a function schema, adding the 'item' argument used in batch mode."""
+    parameters = copy.deepcopy(function["parameters"])
+    parameters["properties"]["item"] = {
+        "type": "integer",
+        "description": "Number of the command this call answers",
+    }
+    parameters["required"] = ["item"] + parameters.get("required", [])
+    return {"type": "function", "function": {**function, "parameters": parameters}}
+
+
+# Batch mode: one request carries several numbered commands and the model
+# answers each with its own tool call tagged with the command number
+BATCH_SIZE = 10
+calendar_batch_tools = [_with_item_number(function) for function in calendar_functions]
+BATCH_PROMPT_SUFFIX = (
+    "\nBATCH MODE: The user message contains several numbered commands. "
+    "They are independent of each other. Call exactly one function per command "
+    "and set 'item' to that command's number."
+)
+
+# Static system prompt, built once at import. It is sent first and unchanged on
+# every call so the provider can cache the prefix; per-call slots (date/time and
+# conversation context) are appended after it.
+SYSTEM_PROMPT_PREFIX = (
+    "You are a calendar assistant. "
+    "Handle user requests intelligently and gracefully. "
+    "Use the available functions to respond appropriately. "
+    "EDGE CASE HANDLING: "
+    "- Misspellings: 'shedule' → understand as 'schedule' "
+    "- Poor grammar: Extract the core intent, ignore extra words "
+    "- Ambiguous dates: Ask for clarification using 'clarify' function "
+    "- Vague requests: Ask specific questions using 'clarify' function "
+    "- Past dates: Return error with suggestion to use future date "
+    "- Invalid dates: Return error with suggestion to use YYYY-MM-DD format "
+    "- Vague references ('it', 'that meeting'): Ask for clarification "
+    "WHEN TO USE FUNCTIONS: "
+    "- create_event: For scheduling new events "
+    "- delete_event: For removing events "
+    "- move_event: For rescheduling events "
+    "- list_events_only: For viewing calendar events "
+    "- list_reminders_only: For viewing reminders/tasks "
+    "- list_all: For viewing both events and reminders "
+    "- find_free_slots: For finding free time (e.g. '30 minutes next week') "
+    "- clarify: When request is ambiguous or unclear "
+    "- error: When request cannot be processed (invalid dates, etc.) "
+    "Always provide helpful responses. If uncertain, ask for clarification rather than guess."
+)
+_SYSTEM_PROMPT_DATE_TEMPLATE = "\nToday is {day}, {date} at {time}.\n"
+
+
+def try_fast_path(user_input: str) -> Optional[Dict[str, Any]]:
+    """
+    Interpret a command locally with the rule-based parsers.
+
+    Args:
+        user_input: The user's raw input
+
+    Returns:
+        Dict with 'action' and 'details' when a parser explains the input with
+        at least FAST_PATH_CONFIDENCE_THRESHOLD confidence, otherwise None.
+    """
+    if not FAST_PATH_ENABLED:
+        return None
+    parsed = parse_command_with_confidence(user_input)
+    if parsed and parsed["confidence"] >= FAST_PATH_CONFIDENCE_THRESHOLD:
+        _fast_path_stats["hits"] += 1
+        return {"action": parsed["action"], "details": parsed["details"]}
+    _fast_path_stats["misses"] += 1
+    return None
+
+
+def _load_openai():
+    """Import the OpenAI SDK on first use; None if it is not installed."""
+    global _openai_module
+    if _openai_module is _LAZY:
+        try:
+            import openai  # type: ignore
+        except Exception:  # pragma: no cover - optional dependency
+            openai = None
+        _openai_module = openai
+    return _openai_module
+
+
+def get_client():
+    """Return the shared OpenAI client, creating it on first use (None without a key)."""
+    global client
+    if client is _LAZY:
+        openai = _load_openai()
+        client = (
+            openai.OpenAI(api_key=OPENAI_API_KEY) if openai and OPENAI_API_KEY else None
+        )
+    return client
+
+
+def _get_response_cache() -> Optional[ResponseCache]:
+    """Return the response cache, opening it on first use (None if disabled)."""
+    global response_cache
+    if response_cache is _LAZY:
+        response_cache = (
+            ResponseCache(
+                os.getenv("CALENDAR_RESPONSE_CACHE_PATH", "core/response_cache.db")
+            )
+            if RESPONSE_CACHE_ENABLED
+            else None
+        )
+    return response_cache
+
+
+def _get_intent_classifier():
+    """Return the local intent classifier, loading it on first use (None if disabled)."""
+    global intent_classifier
+    if intent_classifier is _LAZY:
+        if INTENT_CLASSIFIER_ENABLED:
+            # Deferred: pulls in NumPy
+            from utils.intent_classifier import DEFAULT_MODEL_PATH, IntentClassifier
+
+            intent_classifier = IntentClassifier.load(
+                os.getenv("CALENDAR_INTENT_MODEL_PATH", DEFAULT_MODEL_PATH)
+            )
+        else:
+            intent_classifier = None
+    return intent_classifier
+
+
+def warm_up() -> None:
+    """
+    Import the OpenAI SDK, create the client, open the response cache and
+    load the intent classifier.
+
+    Everything here otherwise happens lazily on the first command; main.py
+    calls this on a background thread once the prompt is shown.
+    """
+    get_client()
+    _get_response_cache()
+    _get_intent_classifier()
+
+
+def try_intent_classifier(user_input: str) -> Optional[Dict[str, Any]]:
+    """
+    Route a command with the local intent classifier.
+
+    Returns:
+        Dict with 'action' and empty 'details' when the classifier predicts a
+        listing action with at least INTENT_ROUTE_THRESHOLD probability and
+        the command names no date or range, otherwise None (escalate to the
+        LLM).
+    """
+    classifier = _get_intent_classifier()
+    if classifier is None:
+        return None
+    action, probability = classifier.predict(user_input)
+    if (
+        action in INTENT_ROUTED_ACTIONS
+        and probability >= INTENT_ROUTE_THRESHOLD
+        and not _mentions_date(user_input, action)
+    ):
+        _intent_route_stats["routed"] += 1
+        return {"action": action, "details": {}}
+    _intent_route_stats["escalated"] += 1
+    return None
+
+
+def _mentions_date(user_input: str, action: str) -> bool:
+    """Whether a command names a date or range that a routed listing would drop."""
+    text = user_input.lower()
+    if any(char.isdigit() for char in text):
+        return True
+    words = set(re.findall(r"[a-z]+", text))
+    if action == "list_todays_events":
+        words.discard("today")  # The action's own range
+    for word in words:
+        try:
+            parse_date_string(word)
+            return True
+        except ValueError:
+            pass
+    return not words.isdisjoint(_DATE_RANGE_WORDS)
+
+
+def get_intent_route_stats() -> Dict[str, Any]:
+    """Return how many commands the intent classifier routed vs. escalated."""
+    total = _intent_route_stats["routed"] + _intent_route_stats["escalated"]
+    return {
+        "routed": _intent_route_stats["routed"],
+        "escalated": _intent_route_stats["escalated"],
+        "route_rate": _intent_route_stats["routed"] / total if total else 0.0,
+    }
+
+
+def get_fast_path_stats() -> Dict[str, Any]:
+    """Return fast-path hit/miss counters and the hit rate."""
+    total = _fast_path_stats["hits"] + _fast_path_stats["misses"]
+    return {
+        "hits": _fast_path_stats["hits"],
+        "misses": _fast_path_stats["misses"],
+        "hit_rate": _fast_path_stats["hits"] / total if total else 0.0,
+    }
+
+
+def reset_fast_path_stats() -> None:
+    """Reset fast-path hit/miss counters."""
+    _fast_path_stats["hits"] = 0
+    _fast_path_stats["misses"] = 0
+
+
+def _probe_upstream() -> None:
+    """Cheap health check for the circuit breaker; raises if the API is unhealthy."""
+    client = get_client()
+    if not client:
+        raise RuntimeError("OpenAI client not configured")
+    client.with_options(timeout=CIRCUIT_BREAKER_PROBE_TIMEOUT).models.list()
+
+
+circuit_breaker = (
+    CircuitBreaker(probe=_probe_upstream) if CIRCUIT_BREAKER_ENABLED else None
+)
+
+# Command forms the offline mode can still understand, per action
+_OFFLINE_COMMAND_FORMS = {
+    "create_event": "schedule TITLE on YYYY-MM-DD at HH:MM for N minutes",
+    "delete_event": "delete TITLE on YYYY-MM-DD",
+    "move_event": "move TITLE on YYYY-MM-DD to YYYY-MM-DD at HH:MM",
+    "add_notification": "add notification to TITLE on YYYY-MM-DD N minutes before",
+}
+
+
+def interpret_offline(user_input: str) -> Dict[str, Any]:
+    """
+    Interpret a command without the LLM.
+
+    Used while the circuit breaker is open. An explicit parser match is
+    accepted at any confidence for listing actions, but commands that change
+    the calendar (create, delete, move, notify) need the fast-path threshold;
+    otherwise a keyword classifier picks the action. Listing actions need no
+    details and are answered directly; anything else asks the user for the
+    exact command form.
+
+    Args:
+        user_input: The user's raw input
+
+    Returns:
+        Dict with 'action' and 'details'
+    """
+    parsed = parse_command_with_confidence(user_input)
+    if parsed and parsed["confidence"] > 0:
+        mutating = parsed["action"] in _OFFLINE_COMMAND_FORMS
+        if not mutating or parsed["confidence"] >= FAST_PATH_CONFIDENCE_THRESHOLD:
+            return {"action": parsed["action"], "details": parsed["details"]}
+        action = parsed["action"]
+    else:
+        action = classify_intent(user_input)
+    if action in ("list_all", "list_events_only", "list_reminders_only"):
+        return {"action": action, "details": {}}
+
+    question = "The assistant is offline right now, so I can only follow exact commands."
+    form = _OFFLINE_COMMAND_FORMS.get(action)
+    if form:
+        question += f" Try: {form}"
+    else:
+        question += " Try 'list all' or 'schedule TITLE on YYYY-MM-DD at HH:MM for N minutes'."
+    return {
+        "action": "clarify",
+        "details": {
+            "question": question,
+            "context": "Language model unavailable; using local parsing only",
+        },
+    }
+
+
+def _llm_allowed() -> bool:
+    """Return False while the circuit breaker is short-circuiting LLM calls."""
+    return circuit_breaker is None or circuit_breaker.allow_request()
+
+
+def _record_llm_outcome(started: float, error: Optional[Exception] = None) -> None:
+    """Report an LLM call's latency and outcome to the circuit breaker."""
+    if circuit_breaker is None:
+        return
+    latency = time.monotonic() - started
+    # Only availability problems count against the upstream; a rejected
+    # request (e.g. 400) still proves the API is answering.
+    if error is not None and _is_retryable(error):
+        circuit_breaker.record_failure(latency)
+    else:
+        circuit_breaker.record_success(latency)
+
+
+def _no_client_error() -> Dict[str, Any]:
+    """Error result returned when no OpenAI client is configured."""
+    return {
+        "action": "error",
+        "details": {
+            "message": "OpenAI API not available",
+            "suggestion": "Please check your API key configuration",
+            "reason": "Missing or invalid OpenAI API key",
+        },
+    }
+
+
+def _build_messages(user_input: str, conversation_context: str) -> list:
+    """Build the system and user messages for a chat completion request.
+
+    The system prompt starts with the prebuilt static prefix so it is
+    byte-identical across calls; only the date/time and context slots vary.
+    """
+    now = datetime.now()
+    parts = [
+        SYSTEM_PROMPT_PREFIX,
+        _SYSTEM_PROMPT_DATE_TEMPLATE.format(
+            day=now.strftime("%A"),
+            date=now.strftime("%Y-%m-%d"),
+            time=now.strftime("%H:%M"),
+        ),
+    ]
+    # Add conversation context if available
+    if conversation_context:
+        parts.append(f"\nCONVERSATION CONTEXT:\n{conversation_context}\n")
+
+    system_message = {
+        "role": "system",
+        "content": "".join(parts),
+    }
+    return [system_message, {"role": "user", "content": user_input}]
+
+
+def _extract_function_call(message):
+    """Return the (name, arguments) call from a tool call or legacy function_call."""
+    tool_calls = getattr(message, "tool_calls", None)
+    if isinstance(tool_calls, list) and tool_calls:
+        return tool_calls[0].function
+    # Legacy functions/function_call responses
+    return getattr(message, "function_call", None)
+
+
+def _parse_completion(
+    response, user_input: str, conversation_context: str
+) -> Dict[str, Any]:
+    """Turn a chat completion response into an action/details dict."""
+    message = response.choices[0].message
+    function_call = _extract_function_call(message)
+    if function_call:
+        return _result_from_call(
+            function_call.name,
+            function_call.arguments,
+            user_input,
+            conversation_context,
+        )
+    return _unclear_request()
+
+
+def _result_from_call(
+    func_name: str, raw_arguments, user_input: str, conversation_context: str
+) -> Dict[str, Any]:
+    """Build the action/details result for a function call and cache it."""
+    try:
+        arguments = json.loads(raw_arguments) if raw_arguments else {}
+    except Exception:
+        arguments = raw_arguments or {}
+    result = {"action": func_name, "details": arguments}
+    _remember(user_input, result, conversation_context)
+    return result
+
+
+def _remember(
+    user_input: str, result: Dict[str, Any], conversation_context: str
+) -> None:
+    """Store an LLM interpretation in the response cache."""
+    # Errors are often transient (past dates, API hiccups); don't pin them
+    cache = _get_response_cache()
+    if cache is not None and result["action"] != "error":
+        cache.put(user_input, result, conversation_context)
+
+
+def _unclear_request() -> Dict[str, Any]:
+    """Clarification result used when the model returns no function call."""
+    return {
+        "action": "clarify",
+        "details": {
+            "question": "I didn't understand your request. Could you please rephrase it?",
+            "context": "The request was unclear or ambiguous",
+        },
+    }
+
+
+def _notify_action(on_action: Optional[Callable[[str], None]], action: str) -> None:
+    """Call the early-action callback without letting it break interpretation."""
+    if on_action is None:
+        return
+    try:
+        on_action(action)
+    except Exception as e:
+        print(f"Warning: Could not prepare handler for {action}: {e}")
+
+
+def _consume_stream(
+    stream, on_action: Optional[Callable[[str], None]]
+) -> Optional[Tuple[str, str]]:
+    """
+    Accumulate a streamed tool call, announcing its name as soon as it arrives.
+
+    Returns:
+        (function name, raw JSON arguments) for the first tool call, or None
+        if the model did not call a function
+    """
+    name_parts = []
+    argument_parts = []
+    announced = False
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta
+        for tool_call in getattr(delta, "tool_calls", None) or []:
+            # Only the first tool call is acted on, as in the non-streaming path
+            if getattr(tool_call, "index", 0) != 0 or tool_call.function is None:
+                continue
+            if tool_call.function.name:
+                name_parts.append(tool_call.function.name)
+            if tool_call.function.arguments:
+                argument_parts.append(tool_call.function.arguments)
+        if name_parts and not announced:
+            announced = True
+            _notify_action(on_action, "".join(name_parts))
+    if not name_parts:
+        return None
+    return "".join(name_parts), "".join(argument_parts)
+
+
+def _interpret_locally(
+    user_input: str, conversation_context: str
+) -> Optional[Dict[str, Any]]:
+    """Answer from the fast path, response cache or intent classifier, or return None."""
+    # Tier 1: deterministic local parsers
+    fast_result = try_fast_path(user_input)
+    if fast_result is not None:
+        return fast_result
+
+    # Tier 2: previously seen phrasings for the same context and day
+    cache = _get_response_cache()
+    if cache is not None:
+        cached = cache.get(user_input, conversation_context)
+        if cached is not None:
+            return cached
+
+    # Tier 3: confident local intent prediction for parameterless actions
+    return try_intent_classifier(user_input)
+
+
 def interpret_command(
-    user_input: str, conversation_context: str = ""
+    user_input: str,
+    conversation_context: str = "",
+    on_action: Optional[Callable[[str], None]] = None,
 ) -> Dict[str, Any]:
     """
     Use GPT-4o function calling to interpret the user's natural language command.
 
     This function takes natural language input and uses GPT-4o with function calling
     to parse it into structured actions. It handles edge cases like misspellings,
-    poor grammar, and ambiguous requests gracefully.
+    poor grammar, and ambiguous requests gracefully. Fully structured commands
+    (e.g. "delete standup on 2025-03-01") are answered by the local fast path
+    first, then the persistent response cache is consulted, then the local
+    intent classifier routes confident listing requests, and only the rest
+    go to the LLM.
+
+    When on_action is given the completion is streamed and on_action is called
+    with the function name as soon as it arrives, while the arguments are still
+    streaming, so the caller can start preparing the handler. Results found
+    locally or offline are complete at once, so on_action is not called.
 
     Args:
         user_input: The user's natural language input (e.g., "schedule team meeting tomorrow")
         conversation_context: Optional conversation context from previous turns for reference resolution
+        on_action: Optional callback invoked early with the chosen action name
 
     Returns:
         Dict containing:
@@ -181,89 +768,301 @@ def interpret_command(
         >>> interpret_command("shedule meeting")  # Handles misspellings
         {'action': 'create_event', 'details': {'title': 'meeting'}}
     """
+    local_result = _interpret_locally(user_input, conversation_context)
+    if local_result is not None:
+        return local_result
+
     # If no OpenAI client (e.g. missing API key), return error
-    if not client:
-        return {
-            "action": "error",
-            "details": {
-                "message": "OpenAI API not available",
-                "suggestion": "Please check your API key configuration",
-                "reason": "Missing or invalid OpenAI API key",
-            },
-        }
+    if not get_client():
+        return _no_client_error()
+    if not _llm_allowed():
+        return interpret_offline(user_input)
+
+    started = time.monotonic()
     try:
-        # Provide current date, time, and day context to the LLM
-        now = datetime.now()
-        current_date = now.strftime("%Y-%m-%d")
-        current_time = now.strftime("%H:%M")
-        current_day = now.strftime("%A")
-
-        # Build system message with conversation context
-        system_content = (
-            f"You are a calendar assistant. Today is {current_day}, {current_date} at {current_time}. "
-            "Handle user requests intelligently and gracefully. "
-            "Use the available functions to respond appropriately. "
-        )
+        request = _single_request(user_input, conversation_context)
+        if on_action is None:
+            result = _interpret_with_llm(request, user_input, conversation_context)
+        else:
+            result = _interpret_streaming(
+                request, user_input, conversation_context, on_action
+            )
+    except Exception as e:
+        _record_llm_outcome(started, e)
+        return {"action": "error", "details": str(e)}
+    _record_llm_outcome(started)
+    return result
 
-        # Add conversation context if available
-        if conversation_context:
-            system_content += f"\nCONVERSATION CONTEXT:\n{conversation_context}\n"
-
-        system_content += (
-            "EDGE CASE HANDLING: "
-            "- Misspellings: 'shedule' → understand as 'schedule' "
-            "- Poor grammar: Extract the core intent, ignore extra words "
-            "- Ambiguous dates: Ask for clarification using 'clarify' function "
-            "- Vague requests: Ask specific questions using 'clarify' function "
-            "- Past dates: Return error with suggestion to use future date "
-            "- Invalid dates: Return error with suggestion to use YYYY-MM-DD format "
-            "- Vague references ('it', 'that meeting'): Ask for clarification "
-            "WHEN TO USE FUNCTIONS: "
-            "- create_event: For scheduling new events "
-            "- delete_event: For removing events "
-            "- move_event: For rescheduling events "
-            "- list_events_only: For viewing calendar events "
-            "- list_reminders_only: For viewing reminders/tasks "
-            "- list_all: For viewing both events and reminders "
-            "- clarify: When request is ambiguous or unclear "
-            "- error: When request cannot be processed (invalid dates, etc.) "
-            "Always provide helpful responses. If uncertain, ask for clarification rather than guess."
-        )
 
-        system_message = {
-            "role": "system",
-            "content": system_content,
-        }
-
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[system_message, {"role": "user", "content": user_input}],
-            functions=calendar_functions,  # type: ignore
-            function_call="auto",
-            temperature=0.0,
-            max_tokens=256,
-            timeout=30,  # 30 second timeout to prevent hanging
-        )
-        message = response.choices[0].message
-        if message.function_call:
-            func_name = message.function_call.name
+def _interpret_streaming(
+    request: Dict[str, Any],
+    user_input: str,
+    conversation_context: str,
+    on_action: Callable[[str], None],
+) -> Dict[str, Any]:
+    """Send a streaming request, announcing the action as soon as it arrives."""
+    stream = get_client().chat.completions.create(stream=True, **request)
+    call = _consume_stream(stream, on_action)
+    if call is None:
+        return _unclear_request()
+    return _result_from_call(call[0], call[1], user_input, conversation_context)
+
+
+def _single_request(user_input: str, conversation_context: str) -> Dict[str, Any]:
+    """Keyword arguments for a single-command chat completion request."""
+    return dict(
+        model="gpt-4o",
+        messages=_build_messages(user_input, conversation_context),
+        tools=calendar_tools,  # type: ignore
+        tool_choice="auto",
+        temperature=0.0,
+        max_tokens=256,
+        timeout=30,  # 30 second timeout to prevent hanging
+    )
+
+
+def _interpret_with_llm(
+    request: Dict[str, Any], user_input: str, conversation_context: str
+) -> Dict[str, Any]:
+    """Send a single non-streaming request and parse the result."""
+    response = get_client().chat.completions.create(**request)
+    return _parse_completion(response, user_input, conversation_context)
+
+
+def _interpret_batch(
+    inputs: List[str], conversation_context: str
+) -> Dict[int, Dict[str, Any]]:
+    """
+    Interpret several commands with one request using parallel tool calls.
+
+    Returns:
+        Mapping of position in inputs to result for every command the model
+        answered; positions it skipped are left out
+    """
+    numbered = "\n".join(f"{n}. {text}" for n, text in enumerate(inputs, 1))
+    messages = _build_messages(numbered, conversation_context)
+    messages[0]["content"] += BATCH_PROMPT_SUFFIX
+    response = get_client().chat.completions.create(
+        model="gpt-4o",
+        messages=messages,
+        tools=calendar_batch_tools,  # type: ignore
+        tool_choice="auto",
+        parallel_tool_calls=True,
+        temperature=0.0,
+        max_tokens=256 * len(inputs),
+        timeout=30 + 5 * len(inputs),
+    )
+    tool_calls = getattr(response.choices[0].message, "tool_calls", None)
+    answered = {}
+    for tool_call in tool_calls if isinstance(tool_calls, list) else []:
+        try:
+            arguments = json.loads(tool_call.function.arguments or "{}")
+            position = int(arguments.pop("item")) - 1
+        except (ValueError, KeyError, TypeError):
+            continue
+        if 0 <= position < len(inputs) and position not in answered:
+            result = {"action": tool_call.function.name, "details": arguments}
+            _remember(inputs[position], result, conversation_context)
+            answered[position] = result
+    return answered
+
+
+def interpret_commands(
+    inputs: List[str],
+    conversation_context: str = "",
+    batch_size: int = BATCH_SIZE,
+) -> List[Dict[str, Any]]:
+    """
+    Interpret many commands, batching LLM calls.
+
+    Each input first goes through the local tiers (see interpret_command). The
+    remaining inputs are sent batch_size at a time in a single request that
+    asks for one parallel tool call per command. Commands a batch leaves
+    unanswered, or whose whole batch request fails, are retried one by one,
+    so one bad item never sinks the rest.
+
+    Args:
+        inputs: Commands to interpret, e.g. lines replayed from a command log
+        conversation_context: Optional shared conversation context
+        batch_size: Maximum number of commands per LLM request
+
+    Returns:
+        One action/details dict per input, in input order
+
+    Example:
+        >>> interpret_commands(["list all", "lunch with Sam friday at noon"])
+        [{'action': 'list_all', 'details': {}}, {'action': 'create_event', 'details': {...}}]
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(inputs)
+    pending = []
+    for index, user_input in enumerate(inputs):
+        local_result = _interpret_locally(user_input, conversation_context)
+        if local_result is not None:
+            results[index] = local_result
+        else:
+            pending.append(index)
+
+    if pending and not get_client():
+        for index in pending:
+            results[index] = _no_client_error()
+        return results
+
+    for start in range(0, len(pending), max(1, batch_size)):
+        chunk = pending[start : start + max(1, batch_size)]
+        answered = {}
+        if _llm_allowed():
+            started = time.monotonic()
             try:
-                arguments = (
-                    json.loads(message.function_call.arguments)
-                    if message.function_call.arguments
-                    else {}
+                answered = _interpret_batch(
+                    [inputs[i] for i in chunk], conversation_context
                 )
-            except Exception:
-                arguments = message.function_call.arguments or {}
-            return {"action": func_name, "details": arguments}
-        else:
-            # No function call returned - ask for clarification
-            return {
-                "action": "clarify",
-                "details": {
-                    "question": "I didn't understand your request. Could you please rephrase it?",
-                    "context": "The request was unclear or ambiguous",
-                },
-            }
-    except Exception as e:
-        return {"action": "error", "details": str(e)}
+                _record_llm_outcome(started)
+            except Exception as e:
+                _record_llm_outcome(started, e)
+                print(f"Warning: Batch interpretation failed, retrying individually: {e}")
+        for position, index in enumerate(chunk):
+            if position in answered:
+                results[index] = answered[position]
+                continue
+            if not _llm_allowed():
+                results[index] = interpret_offline(inputs[index])
+                continue
+            started = time.monotonic()
+            try:
+                results[index] = _interpret_with_llm(
+                    _single_request(inputs[index], conversation_context),
+                    inputs[index],
+                    conversation_context,
+                )
+                _record_llm_outcome(started)
+            except Exception as e:
+                _record_llm_outcome(started, e)
+                results[index] = {"action": "error", "details": str(e)}
+    return results
+
+
+def _get_async_client():
+    """Return the shared AsyncOpenAI client for the running event loop, or None."""
+    openai = _load_openai()
+    if not (openai and OPENAI_API_KEY):
+        return None
+    loop = asyncio.get_running_loop()
+    async_client = _async_clients.get(loop)
+    if async_client is None:
+        kwargs = {"api_key": OPENAI_API_KEY, "max_retries": 0}
+        try:
+            import httpx  # type: ignore
+        except Exception:  # pragma: no cover - optional dependency
+            httpx = None
+        if httpx is not None and hasattr(openai, "DefaultAsyncHttpxClient"):
+            # Keep-alive pool sized to the concurrency cap
+            kwargs["http_client"] = openai.DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=ASYNC_MAX_CONCURRENCY,
+                    max_keepalive_connections=ASYNC_MAX_CONCURRENCY,
+                    keepalive_expiry=30,
+                )
+            )
+        async_client = openai.AsyncOpenAI(**kwargs)
+        _async_clients[loop] = async_client
+    return async_client
+
+
+def _get_async_semaphore() -> asyncio.Semaphore:
+    """Return the concurrency-limiting semaphore for the running event loop."""
+    loop = asyncio.get_running_loop()
+    semaphore = _async_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(ASYNC_MAX_CONCURRENCY)
+        _async_semaphores[loop] = semaphore
+    return semaphore
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Timeouts, connection problems, rate limits and 5xx errors are retried."""
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return True
+    if any(cls.__name__ in _NETWORK_ERRORS for cls in type(error).__mro__):
+        return True
+    status = getattr(error, "status_code", None)
+    return isinstance(status, int) and (status == 429 or status >= 500)
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff delay in seconds for a retry attempt."""
+    return random.uniform(0, min(ASYNC_BACKOFF_MAX, ASYNC_BACKOFF_BASE * 2**attempt))
+
+
+async def interpret_command_async(
+    user_input: str,
+    conversation_context: str = "",
+    timeout: float = 30.0,
+    max_retries: int = ASYNC_MAX_RETRIES,
+) -> Dict[str, Any]:
+    """
+    Asyncio-native variant of interpret_command.
+
+    Uses the same fast path, response cache, prompt and result format as
+    interpret_command, but many calls can be in flight at once. Requests share
+    one pooled AsyncOpenAI client per event loop and are capped by a
+    semaphore of ASYNC_MAX_CONCURRENCY slots.
+
+    Args:
+        user_input: The user's natural language input
+        conversation_context: Optional conversation context from previous turns
+        timeout: Per-attempt timeout in seconds
+        max_retries: Retries after the first attempt for retryable errors
+
+    Returns:
+        Dict with 'action' and 'details', as interpret_command
+
+    Example:
+        >>> results = await asyncio.gather(
+        ...     *(interpret_command_async(cmd) for cmd in commands)
+        ... )
+    """
+    local_result = _interpret_locally(user_input, conversation_context)
+    if local_result is not None:
+        return local_result
+
+    async_client = _get_async_client()
+    if not async_client:
+        return _no_client_error()
+    if not _llm_allowed():
+        return interpret_offline(user_input)
+
+    messages = _build_messages(user_input, conversation_context)
+    semaphore = _get_async_semaphore()
+    for attempt in range(max_retries + 1):
+        started = time.monotonic()
+        try:
+            # Only hold a slot while a request is actually in flight
+            async with semaphore:
+                started = time.monotonic()
+                response = await asyncio.wait_for(
+                    async_client.chat.completions.create(
+                        model="gpt-4o",
+                        messages=messages,
+                        tools=calendar_tools,  # type: ignore
+                        tool_choice="auto",
+                        temperature=0.0,
+                        max_tokens=256,
+                        timeout=timeout,
+                    ),
+                    timeout,
+                )
+            _record_llm_outcome(started)
+            return _parse_completion(response, user_input, conversation_context)
+        except Exception as e:
+            _record_llm_outcome(started, e)
+            if attempt >= max_retries or not _is_retryable(e):
+                if isinstance(e, asyncio.TimeoutError):
+                    return {
+                        "action": "error",
+                        "details": f"Request timed out after {timeout} seconds",
+                    }
+                return {"action": "error", "details": str(e)}
+            if not _llm_allowed():
+                # The breaker tripped while retrying; stop waiting on the API
+                return interpret_offline(user_input)
+            await asyncio.sleep(_backoff_delay(attempt))
@@ -18,9 +18,9 @@ def main():
 
     # Check if OpenAI is available
     try:
-        from openai_client import client
+        from openai_client import get_client
 
-        if client is None:
+        if get_client() is None:
             print("⚠️  OpenAI client not available. Using placeholder evaluations.")
         else:
             print("✅ OpenAI client available. Running real LLM evaluations!")
@@ -1,5 +1,16 @@
 import pytest
 import calendar_agent_eventkit
+from utils.work_queue import DurableWorkQueue
+
+
+@pytest.fixture(autouse=True)
+def inline_post_commit(monkeypatch):
+    """Run memory updates before agent calls return, so tests can check them."""
+    monkeypatch.setattr(calendar_agent_eventkit, "POST_COMMIT_WORKERS", 0)
+    agent = vars(calendar_agent_eventkit).get("_agent")
+    if agent is not None:
+        inline = DurableWorkQueue(agent.post_commit.handlers, workers=0)
+        monkeypatch.setattr(agent, "post_commit", inline)
 
 
 @pytest.fixture(autouse=True)
@@ -47,3 +58,28 @@ def dummy_store(monkeypatch):
     monkeypatch.setattr(calendar_agent_eventkit, "EKEvent", DummyEvent)
     monkeypatch.setattr(calendar_agent_eventkit, "EKSpanThisEvent", 0)
     return dummy
+
+
+@pytest.fixture(autouse=True)
+def no_response_cache(monkeypatch):
+    """Keep interpretations from leaking between tests via the on-disk cache."""
+    import openai_client
+
+    monkeypatch.setattr(openai_client, "response_cache", None)
+
+
+@pytest.fixture(autouse=True)
+def fresh_circuit_breaker(monkeypatch):
+    """Give each test a closed circuit breaker so failures don't trip later tests."""
+    import openai_client
+    from utils.circuit_breaker import CircuitBreaker
+
+    monkeypatch.setattr(openai_client, "circuit_breaker", CircuitBreaker())
+
+
+@pytest.fixture(autouse=True)
+def no_intent_classifier(monkeypatch):
+    """Send commands to the mocked LLM instead of the trained local classifier."""
+    import openai_client
+
+    monkeypatch.setattr(openai_client, "intent_classifier", None)
@@ -14,9 +14,11 @@ def test_llm_invocation_calls_client(monkeypatch):
     fake_resp = SimpleNamespace(choices=[fake_choice])
 
     # Fake create method to capture parameters
-    def fake_create(model, messages, functions, function_call, temperature, max_tokens):
-        # Validate we are using GPT-4o
+    def fake_create(model, messages, tools, tool_choice, **kwargs):
+        # Validate we are using GPT-4o with the tools API
         assert model == "gpt-4o"
+        assert tool_choice == "auto"
+        assert tools[0]["type"] == "function"
         # The first message should be our system context with date/time
         assert isinstance(messages, list) and len(messages) >= 1
         sys_msg = messages[0]
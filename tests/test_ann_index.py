@@ -0,0 +1,99 @@
+import os
+
+import numpy as np
+import pytest
+
+import core.ann_index
+from core.ann_index import HNSWIndex, IVFIndex, create_ann_index
+
+
+def clustered(count, dimensions=32, clusters=40, seed=3):
+    """Unit vectors around random centers, shaped like real embeddings."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dimensions))
+    rows = centers[rng.integers(clusters, size=count)]
+    rows += 0.3 * rng.standard_normal((count, dimensions))
+    return (rows / np.linalg.norm(rows, axis=1, keepdims=True)).astype(np.float32)
+
+
+def exact(vectors, query, k, deleted=()):
+    scores = vectors @ query
+    scores[list(deleted)] = -np.inf
+    return set(np.argsort(-scores)[:k].tolist())
+
+
+def recall(index, vectors, queries, k=10, deleted=()):
+    found = [set(index.search(q, k, vectors)[0].tolist()) for q in queries]
+    truth = [exact(vectors, q, k, deleted) for q in queries]
+    return np.mean([len(f & t) / k for f, t in zip(found, truth)])
+
+
+def test_ivf_trains_inserts_tombstones_and_reloads(tmp_path):
+    vectors = clustered(3000)
+    queries = vectors[:20] + 0.05
+    path = str(tmp_path / "index.npz")
+    index = IVFIndex(path, n_probe=8, min_train_size=500)
+
+    index.add(range(400), vectors)
+    assert index.centroids is None  # Scans every row until trained
+    index.add(range(400, 1000), vectors)
+    index.add(range(1000, 3000), vectors)
+
+    assert index.get_stats()["lists"] == 31
+    assert recall(index, vectors, queries) >= 0.9
+    best = index.search(queries[0], 1, vectors)[0][0]
+    index.remove([best])
+    assert best not in index.search(queries[0], 10, vectors)[0]
+
+    reloaded = IVFIndex(path, n_probe=8)
+    assert reloaded.size == 3000
+    assert recall(reloaded, vectors, queries, deleted=[best]) >= 0.9
+
+
+def test_hnsw_inserts_tombstones_and_reloads(tmp_path):
+    pytest.importorskip("hnswlib")
+    vectors = clustered(1500)
+    queries = vectors[:20] + 0.05
+    path = str(tmp_path / "index.bin")
+    index = HNSWIndex(path)
+
+    index.add(range(1000), vectors)
+    index.add(range(1000, 1500), vectors)
+    rows, scores = index.search(queries[0], 5, vectors)
+
+    assert recall(index, vectors, queries) >= 0.9
+    assert scores == pytest.approx(vectors[rows] @ queries[0], abs=1e-4)
+    index.remove([rows[0]])
+    index.flush()
+    reloaded = HNSWIndex(path, dimensions=32)
+    assert reloaded.size == 1500
+    assert rows[0] not in reloaded.search(queries[0], 10, vectors)[0]
+
+
+def test_index_saves_in_batches(tmp_path):
+    vectors = clustered(10)
+    index = IVFIndex(str(tmp_path / "index.npz"), min_train_size=100)
+    index.save_every = 4
+
+    index.add(range(3), vectors)
+    assert not os.path.exists(index.path)
+    index.remove([0])  # Fourth change
+    assert IVFIndex(index.path).get_stats()["deleted"] == 1
+
+    index.add(range(3, 5), vectors)
+    assert IVFIndex(index.path).size == 3
+    index.flush()
+    assert IVFIndex(index.path).size == 5
+
+
+def test_hnsw_without_hnswlib_falls_back_to_ivf(tmp_path, monkeypatch):
+    monkeypatch.setattr(core.ann_index, "hnswlib", None)
+
+    index = create_ann_index("hnsw", str(tmp_path / "vectors"))
+
+    assert isinstance(index, IVFIndex)
+    assert index.path.endswith("vectors_ivf.npz")
+    with pytest.raises(ImportError):
+        HNSWIndex(str(tmp_path / "index.bin"))
+    with pytest.raises(ValueError):
+        create_ann_index("lsh", str(tmp_path / "vectors"))
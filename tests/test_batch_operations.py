@@ -0,0 +1,152 @@
+import json
+import os
+
+import pytest
+
+from calendar_agent_eventkit import EventKitAgent
+from core.embedding_manager import EMBEDDING_MODEL
+from core.memory_manager import CoreMemory
+from core.narrative_memory import NarrativeMemory
+
+
+def batch_agent(tmp_path, monkeypatch):
+    """Agent on the stub store with file-backed memories and write counters."""
+    agent = EventKitAgent()
+    agent.core_memory = CoreMemory(str(tmp_path / "memory.db"))
+    agent.narrative_memory = NarrativeMemory(str(tmp_path / "narrative.json"))
+    store = agent.store
+    store.calls = []
+    save = store.saveEvent_span_commit_error_
+
+    def save_uncommitted(event, span, commit, error_ptr):
+        store.calls.append(("save", commit))
+        return save(event, span, commit, error_ptr)
+
+    store.saveEvent_span_commit_error_ = save_uncommitted
+    store.commit_ = lambda error_ptr: store.calls.append("commit") or True
+
+    writes = []
+    dump = json.dump
+
+    def counting_dump(obj, fp, **kwargs):
+        writes.append(os.path.basename(fp.name))
+        return dump(obj, fp, **kwargs)
+
+    monkeypatch.setattr(json, "dump", counting_dump)
+    return agent, writes
+
+
+def meetings(count):
+    return [
+        {
+            "title": f"Meeting {i}",
+            "date": "2030-05-06",
+            "time": f"{9 + i:02d}:00",
+            "duration": 30,
+            "description": "team meeting",
+        }
+        for i in range(count)
+    ]
+
+
+def test_create_events_commits_and_persists_once(tmp_path, monkeypatch):
+    agent, writes = batch_agent(tmp_path, monkeypatch)
+
+    result = agent.create_events(meetings(5))
+
+    assert result["success"]
+    assert result["message"] == "5 of 5 events created"
+    assert agent.store.calls == [("save", False)] * 5 + ["commit"]
+    assert sorted(writes) == ["memory_memories.json", "narrative.json"]
+    assert len(agent.core_memory.memories) == 5
+    assert len(agent.core_memory.embedding_manager.vector_store) == 5
+    events = agent.list_events_and_reminders("2030-05-06", "2030-05-06")["events"]
+    assert len(events) == 5
+
+
+def test_delete_and_move_events_persist_once(tmp_path, monkeypatch):
+    agent, writes = batch_agent(tmp_path, monkeypatch)
+    agent.create_events(meetings(4))
+    writes.clear()
+
+    moved = agent.move_events(
+        [
+            {
+                "title": "Meeting 0",
+                "old_date": "2030-05-06",
+                "new_date": "2030-05-07",
+                "new_time": "09:00",
+            },
+            {
+                "title": "Meeting 3",
+                "old_date": "2030-05-06",
+                "new_date": "2030-05-07",
+                "new_time": "10:00",
+            },
+        ]
+    )
+    deleted = agent.delete_events(
+        [{"title": f"Meeting {i}", "date": "2030-05-06"} for i in (1, 2)]
+    )
+
+    assert moved["success"] and deleted["success"]
+    assert writes == ["memory_memories.json", "memory_memories.json"]
+    titles = sorted(m.title for m in agent.core_memory.memories.values())
+    assert titles == ["Meeting 0", "Meeting 3"]
+
+
+def test_delete_event_keeps_memories_on_other_dates(tmp_path, monkeypatch):
+    agent, _ = batch_agent(tmp_path, monkeypatch)
+    agent.create_events(
+        [
+            {"title": "Gym", "date": day, "time": "07:00", "duration": 60}
+            for day in ("2030-05-06", "2030-05-07")
+        ]
+    )
+
+    # Serve the search query's embedding from the cache, not the API
+    embeddings = agent.core_memory.embedding_manager
+    query = embeddings.vector_store.vectors[0].tolist()
+    embeddings.cache.put_many(EMBEDDING_MODEL, ["workout"], [query])
+
+    assert agent.delete_event({"title": "Gym", "date": "2030-05-06"})["success"]
+
+    dates = [m.date for m in agent.core_memory.memories.values()]
+    assert dates == ["2030-05-07"]
+    found = embeddings.search_similar("workout", top_k=5)
+    assert [r["metadata"]["start_date"] for r in found] == ["2030-05-07"]
+
+
+def test_failed_commit_is_reported(tmp_path, monkeypatch):
+    agent, _ = batch_agent(tmp_path, monkeypatch)
+    agent.store.commit_ = lambda error_ptr: (False, "disk full")
+    agent.store.reset = lambda: agent.store._events.clear()
+
+    series = dict(meetings(1)[0], title="Weekly", recurrence_rule="FREQ=WEEKLY")
+
+    result = agent.create_events(meetings(2) + [series])
+
+    error = "Failed to commit events"
+    assert result == {
+        "success": False,
+        "error": error,
+        "results": [{"success": False, "error": error}] * 3,
+    }
+    assert agent._recurring_events == []
+    assert agent.list_events_and_reminders("2030-05-06", "2030-05-06")["events"] == []
+
+
+def test_raising_operation_leaves_no_pending_batch(tmp_path, monkeypatch):
+    agent, _ = batch_agent(tmp_path, monkeypatch)
+    broken = dict(meetings(1)[0], title="Broken", duration="30")
+    agent.store.reset = lambda: agent.store._events.clear()
+
+    with pytest.raises(TypeError):
+        agent.create_events(meetings(1) + [broken])
+
+    assert agent._batch_depth == 0
+    assert agent._uncommitted is False
+    assert agent._batch_jobs == []
+    agent.create_events(meetings(1))
+    titles = [m.title for m in agent.core_memory.memories.values()]
+    assert titles == ["Meeting 0"]
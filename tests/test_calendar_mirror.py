@@ -0,0 +1,148 @@
+import time
+from datetime import datetime, timedelta
+
+from calendar_agent_eventkit import (
+    MAX_INDEXED_WINDOWS,
+    EventKitAgent,
+    _add_window,
+    _window_covered,
+)
+from core.types import EventRecord, ReminderRecord
+from utils.calendar_mirror import EVENT, REMINDER, CalendarMirror
+
+WEEK = (datetime(2030, 3, 4), datetime(2030, 3, 10, 23, 59))
+
+
+def event(key, title, day, hour, hours=1, modified=None):
+    start = datetime(2030, 3, day, hour)
+    return key, EventRecord(title, start, start + timedelta(hours=hours)), modified
+
+
+def test_sync_writes_only_differences():
+    mirror = CalendarMirror(":memory:")
+    first = mirror.sync_events(
+        *WEEK, [event("a", "Standup", 4, 9), event("b", "Review", 5, 14)]
+    )
+    second = mirror.sync_events(
+        *WEEK,
+        [
+            event("a", "Standup", 4, 9),
+            event("b", "Design review", 5, 14, modified=datetime(2030, 3, 1)),
+            event("c", "Retro", 8, 16),
+        ],
+    )
+    third = mirror.sync_events(*WEEK, [event("c", "Retro", 8, 16)])
+
+    assert first == {"added": 2, "updated": 0, "removed": 0}
+    assert second == {"added": 1, "updated": 1, "removed": 0}
+    assert third == {"added": 0, "updated": 0, "removed": 2}
+    assert mirror.get_stats()["rows_written"] == 4
+    assert [record.title for _, record in mirror.events_overlapping(*WEEK)] == [
+        "Retro"
+    ]
+
+
+def test_overlapping_includes_long_event_starting_earlier(tmp_path):
+    path = str(tmp_path / "mirror.db")
+    mirror = CalendarMirror(path)
+    mirror.put_event("trip", EventRecord("Trip", datetime(2030, 2, 25), WEEK[0]))
+    mirror.put_event("lunch", EventRecord("Lunch", datetime(2030, 3, 1, 12)))
+
+    # Reopened mirror still knows the longest event duration
+    reopened = CalendarMirror(path)
+    keys = [key for key, _ in reopened.events_overlapping(*WEEK)]
+
+    assert keys == ["trip"]
+
+
+def test_freshness_and_reminders():
+    mirror = CalendarMirror(":memory:")
+    due = datetime(2030, 3, 5, 9)
+    mirror.sync_reminders(*WEEK, [("r1", ReminderRecord("Pay rent", due), None)])
+
+    assert mirror.is_fresh(REMINDER, WEEK[0], WEEK[1], max_age=60)
+    assert not mirror.is_fresh(EVENT, WEEK[0], WEEK[1], max_age=60)
+    assert mirror.reminders_due(*WEEK) == [ReminderRecord("Pay rent", due)]
+
+    mirror.mark_stale()
+    assert not mirror.is_fresh(REMINDER, WEEK[0], WEEK[1], max_age=60)
+
+
+def test_agent_serves_fresh_window_from_mirror():
+    agent = EventKitAgent()
+    agent.create_event(
+        {"title": "Dentist", "date": "2030-03-05", "time": "15:00", "duration": 60}
+    )
+    agent.list_events_and_reminders("2030-03-05", "2030-03-05")
+    store_fetch = agent.store.eventsMatchingPredicate_
+
+    # Fresh process state: empty in-memory index, mirror still synced
+    agent._indexed_windows = []
+    agent._event_index.clear()
+    agent.store.eventsMatchingPredicate_ = lambda predicate: []
+    result = agent.list_events_and_reminders("2030-03-05", "2030-03-05")
+    assert [e.title for e in result["events"]] == ["Dentist"]
+
+    # Deleting an event loaded from the mirror resolves the EventKit object
+    agent.store.eventsMatchingPredicate_ = store_fetch
+    assert agent.delete_event({"title": "Dentist", "date": "2030-03-05"})["success"]
+    assert agent.store._events == []
+    assert agent.mirror.get_stats()["events"] == 0
+
+
+def test_agent_trusts_mirror_until_store_changes(monkeypatch):
+    agent = EventKitAgent()
+    agent.create_event(
+        {"title": "Dentist", "date": "2030-03-05", "time": "15:00", "duration": 60}
+    )
+    agent.list_events_and_reminders("2030-03-05")
+    later = time.time() + 3600
+    monkeypatch.setattr("utils.calendar_mirror.time.time", lambda: later)
+
+    # An hour on, the window is still read from the mirror
+    agent._indexed_windows = []
+    agent._event_index.clear()
+    fetches = []
+    store_fetch = agent.store.eventsMatchingPredicate_
+    agent.store.eventsMatchingPredicate_ = lambda p: fetches.append(p) or store_fetch(p)
+    assert agent.list_events_and_reminders("2030-03-05")["events"]
+    assert fetches == []
+
+    # A change notification re-diffs the window against the store
+    agent._store_changed = True
+    assert agent.list_events_and_reminders("2030-03-05")["events"]
+    assert len(fetches) == 1
+
+
+def test_agent_reloads_store_after_invalidate():
+    agent = EventKitAgent()
+    agent.create_event(
+        {"title": "Dentist", "date": "2030-03-05", "time": "15:00", "duration": 60}
+    )
+    assert agent.list_events_and_reminders("2030-03-05")["events"]
+
+    # Removed behind the agent's back: served from the index until told
+    agent.store._events.clear()
+    assert agent.list_events_and_reminders("2030-03-05")["events"]
+    agent.invalidate()
+    assert agent.list_events_and_reminders("2030-03-05")["events"] == []
+    assert agent.mirror.get_stats()["events"] == 0
+
+
+def test_indexed_windows_merge_and_stay_bounded():
+    def day(n, hour=0):
+        return datetime(2030, 3, n, hour)
+
+    windows = []
+    _add_window(windows, day(4), day(5))
+    _add_window(windows, day(8), day(9))
+    _add_window(windows, day(5), day(8))
+    assert windows == [(day(4), day(9))]
+    assert _window_covered(windows, day(6), day(7, 12))
+    assert not _window_covered(windows, day(3), day(5))
+
+    for n in range(1, 1 + 2 * MAX_INDEXED_WINDOWS):
+        start = datetime(2031, 1, 1) + timedelta(days=2 * n)
+        _add_window(windows, start, start + timedelta(hours=1))
+    assert len(windows) <= MAX_INDEXED_WINDOWS
+    assert _window_covered(windows, start, start + timedelta(minutes=30))
@@ -0,0 +1,178 @@
+"""Tests for the LLM circuit breaker and offline degradation."""
+
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+import openai_client
+from utils.circuit_breaker import BreakerState, CircuitBreaker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _breaker(**kwargs):
+    clock = FakeClock()
+    options = dict(min_calls=3, cooldown_seconds=10.0, clock=clock)
+    options.update(kwargs)
+    return CircuitBreaker(**options), clock
+
+
+def test_trips_on_failure_rate():
+    breaker, _ = _breaker()
+    breaker.record_success(0.1)
+    breaker.record_failure()
+    assert breaker.state == BreakerState.CLOSED  # below min_calls
+    breaker.record_failure()
+
+    assert breaker.state == BreakerState.OPEN
+    assert not breaker.allow_request()
+    assert breaker.get_stats()["short_circuited"] == 1
+
+
+def test_trips_on_slow_calls():
+    breaker, _ = _breaker(slow_call_seconds=5.0)
+    for _ in range(3):
+        breaker.record_success(6.0)
+
+    assert breaker.state == BreakerState.OPEN
+
+
+def test_healthy_calls_stay_closed():
+    breaker, _ = _breaker()
+    for _ in range(10):
+        breaker.record_success(0.2)
+    breaker.record_failure()
+
+    assert breaker.state == BreakerState.CLOSED
+    assert breaker.get_stats()["average_latency"] == pytest.approx(0.2)
+
+
+def test_half_open_trial_without_probe():
+    breaker, clock = _breaker()
+    for _ in range(3):
+        breaker.record_failure()
+
+    clock.now = 10.0
+    assert breaker.allow_request()  # single trial request
+    assert breaker.state == BreakerState.HALF_OPEN
+    assert not breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == BreakerState.OPEN
+    assert breaker.trips == 2
+
+    clock.now = 20.0
+    assert breaker.allow_request()
+    breaker.record_success(0.1)
+    assert breaker.state == BreakerState.CLOSED
+
+
+def test_background_probe_closes_breaker():
+    probe = MagicMock()
+    breaker, clock = _breaker(probe=probe)
+    for _ in range(3):
+        breaker.record_failure()
+
+    clock.now = 10.0
+    # The probe runs in the background; this request still degrades
+    assert not breaker.allow_request()
+    breaker._probe_thread.join(timeout=5)
+
+    probe.assert_called_once()
+    assert breaker.state == BreakerState.CLOSED
+    assert breaker.allow_request()
+
+
+def test_failed_probe_restarts_cooldown():
+    probe = MagicMock(side_effect=Exception("still down"))
+    breaker, clock = _breaker(probe=probe)
+    for _ in range(3):
+        breaker.record_failure()
+
+    clock.now = 10.0
+    breaker.allow_request()
+    breaker._probe_thread.join(timeout=5)
+    assert breaker.state == BreakerState.OPEN
+
+    clock.now = 15.0
+    breaker.allow_request()
+    assert probe.call_count == 1  # still cooling down
+
+
+def test_interpret_command_degrades_when_open():
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.side_effect = ConnectionError(
+        "Connection error"
+    )
+    breaker, _ = _breaker()
+
+    with patch("openai_client.client", mock_client), patch(
+        "openai_client.circuit_breaker", breaker
+    ):
+        for _ in range(3):
+            assert openai_client.interpret_command("whats up")["action"] == "error"
+        assert breaker.state == BreakerState.OPEN
+
+        result = openai_client.interpret_command("show my reminders please")
+
+    assert result == {"action": "list_reminders_only", "details": {}}
+    assert mock_client.chat.completions.create.call_count == 3
+
+
+def test_client_errors_do_not_trip_breaker():
+    error = Exception("bad request")
+    error.status_code = 400
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.side_effect = error
+    breaker, _ = _breaker()
+
+    with patch("openai_client.client", mock_client), patch(
+        "openai_client.circuit_breaker", breaker
+    ):
+        for _ in range(5):
+            openai_client.interpret_command("whats up")
+
+    assert breaker.state == BreakerState.CLOSED
+
+
+def test_interpret_offline():
+    assert openai_client.interpret_offline("delete standup on 2025-03-01") == {
+        "action": "delete_event",
+        "details": {"title": "standup", "date": "2025-03-01"},
+    }
+    # Partial matches are accepted offline even below the fast-path threshold
+    assert (
+        openai_client.interpret_offline("list events for 2025-03-01 please")["action"]
+        == "list_events_only"
+    )
+
+    result = openai_client.interpret_offline("cancel my dentist thing")
+    assert result["action"] == "clarify"
+    assert "delete TITLE on YYYY-MM-DD" in result["details"]["question"]
+
+    # Changes to the calendar are not made from a partial match
+    result = openai_client.interpret_offline(
+        "delete standup on 2025-03-01 and also something else please"
+    )
+    assert result["action"] == "clarify"
+    assert "delete TITLE on YYYY-MM-DD" in result["details"]["question"]
+
+
+def test_unrecognised_errors_do_not_trip_breaker():
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.side_effect = ValueError("bad JSON")
+    breaker, _ = _breaker()
+
+    with patch("openai_client.client", mock_client), patch(
+        "openai_client.circuit_breaker", breaker
+    ):
+        for _ in range(5):
+            openai_client.interpret_command("whats up")
+
+    assert breaker.state == BreakerState.CLOSED
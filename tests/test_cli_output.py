@@ -2,6 +2,7 @@
 
 import pytest
 from datetime import datetime
+from core.types import EventRecord, ReminderRecord
 from utils.cli_output import (
     format_events,
     format_reminders,
@@ -101,6 +102,16 @@ class TestFormatEvents:
         result = format_events(events)
         assert "📅 Meeting with Missing Fields" in result
 
+    def test_format_events_records(self):
+        """Test formatting EventRecords returned by the calendar agent."""
+        events = [
+            EventRecord(
+                "Standup", datetime(2024, 1, 15, 9, 0), datetime(2024, 1, 15, 9, 15)
+            )
+        ]
+        result = format_events(events)
+        assert result == "📅 Standup (09:00 AM) (15min)"
+
 
 class TestFormatReminders:
     """Test reminder formatting functionality."""
@@ -163,6 +174,15 @@ class TestFormatReminders:
         result = format_reminders(reminders)
         assert "✅ Reminder with Missing Fields" in result
 
+    def test_format_reminders_records(self):
+        """Test formatting ReminderRecords, with and without a due date."""
+        reminders = [
+            ReminderRecord("Pay rent", datetime(2024, 2, 1, 9, 0)),
+            ReminderRecord("Call mom"),
+        ]
+        result = format_reminders(reminders)
+        assert result == "✅ Pay rent (Due: Feb 01)\n✅ Call mom"
+
 
 class TestFormatMessages:
     """Test message formatting functionality."""
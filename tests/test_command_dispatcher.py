@@ -1,5 +1,9 @@
+import threading
+
 import pytest
-from utils.command_dispatcher import HANDLERS, dispatch
+from unittest.mock import patch
+from utils import command_dispatcher
+from utils.command_dispatcher import HANDLERS, dispatch, prepare
 
 
 class TestHandlerRegistration:
@@ -13,6 +17,7 @@ class TestHandlerRegistration:
             "delete_event",
             "move_event",
             "add_notification",
+            "find_free_slots",
         ]
         for action in expected:
             assert action in HANDLERS, f"Handler for '{action}' not registered"
@@ -33,3 +38,49 @@ class TestDispatchFunction:
     def test_dispatch_calls_handler(self, action, details):
         # Should not raise for registered handlers
         assert dispatch(action, details) is None
+
+
+class TestPrepare:
+    def test_list_handler_reuses_prefetched_listing(self):
+        listing = {"events": [], "reminders": []}
+        with patch(
+            "utils.command_dispatcher.list_events_and_reminders",
+            return_value=listing,
+        ) as mock_list:
+            prepare("list_all")
+            dispatch("list_all", {})
+        mock_list.assert_called_once_with(None, None)
+
+    def test_prefetch_ignored_for_other_ranges(self):
+        listing = {"events": [], "reminders": []}
+        with patch(
+            "utils.command_dispatcher.list_events_and_reminders",
+            return_value=listing,
+        ) as mock_list:
+            # Keep the prefetch queued behind another job until dispatch is done
+            gate = threading.Event()
+            command_dispatcher._prefetch_executor.submit(gate.wait, 5)
+            prepare("list_events_only")
+            (prefetch,) = command_dispatcher._prefetched.values()
+            dispatch("list_events_only", {"start_date": "2030-01-01"})
+            gate.set()
+        # The unused prefetch was cancelled before it started
+        assert prefetch.cancelled()
+        assert command_dispatcher._prefetched == {}
+        mock_list.assert_called_once_with("2030-01-01", None)
+
+    def test_prepare_cancels_previous_prefetch(self):
+        with patch("utils.command_dispatcher.list_events_and_reminders"):
+            gate = threading.Event()
+            command_dispatcher._prefetch_executor.submit(gate.wait, 5)
+            prepare("list_all")
+            (prefetch,) = command_dispatcher._prefetched.values()
+            prepare("create_event")
+            gate.set()
+        assert prefetch.cancelled()
+        assert command_dispatcher._prefetched == {}
+
+    def test_prepare_non_list_action_does_nothing(self):
+        with patch("utils.command_dispatcher.list_events_and_reminders") as mock_list:
+            prepare("create_event")
+        mock_list.assert_not_called()
@@ -0,0 +1,98 @@
+"""Tests for the rule-based command parsers."""
+
+from datetime import datetime, timedelta
+
+from utils.command_utils import (
+    classify_intent,
+    parse_command,
+    parse_command_with_confidence,
+)
+
+
+class TestParseCommandWithConfidence:
+    """Test confidence scoring for the fast-path parsers."""
+
+    def test_structured_schedule_is_high_confidence(self):
+        result = parse_command_with_confidence(
+            "schedule Team Sync on 2025-03-01 at 2pm for 30 minutes"
+        )
+        assert result["action"] == "create_event"
+        assert result["details"] == {
+            "title": "Team Sync",
+            "date": "2025-03-01",
+            "time": "14:00",
+            "duration": 30,
+        }
+        assert result["confidence"] >= 0.9
+
+    def test_schedule_without_duration_leaves_duration_out(self):
+        result = parse_command_with_confidence("schedule Lunch on 2025-03-01 at 12pm")
+        assert result["action"] == "create_event"
+        assert "duration" not in result["details"]
+        assert result["details"]["time"] == "12:00"
+
+    def test_move_delete_and_notification(self):
+        move = parse_command_with_confidence(
+            "move standup on 2025-03-01 to 2025-03-02 at 9:30am"
+        )
+        assert move["action"] == "move_event"
+        assert move["details"]["new_time"] == "09:30"
+
+        delete = parse_command_with_confidence("delete standup on 2025-03-01.")
+        assert delete["action"] == "delete_event"
+        assert delete["confidence"] >= 0.9
+
+        notify = parse_command_with_confidence(
+            "add notification to standup on 2025-03-01 15 minutes before"
+        )
+        assert notify["action"] == "add_notification"
+        assert notify["details"]["minutes_before"] == 15
+
+    def test_list_commands(self):
+        assert parse_command_with_confidence("list events")["action"] == (
+            "list_events_only"
+        )
+        assert parse_command_with_confidence("list my reminders")["action"] == (
+            "list_reminders_only"
+        )
+        assert parse_command_with_confidence("list all")["action"] == "list_all"
+        # Conversational phrasings are left to the LLM
+        assert parse_command_with_confidence("show my events") is None
+
+        today = datetime.now().strftime("%Y-%m-%d")
+        result = parse_command_with_confidence("list events for today")
+        assert result["details"] == {"start_date": today, "end_date": today}
+        assert result["confidence"] >= 0.9
+
+    def test_partial_match_lowers_confidence(self):
+        result = parse_command_with_confidence(
+            "delete standup on 2025-03-01 and then email the team"
+        )
+        assert result["action"] == "delete_event"
+        assert result["confidence"] < 0.9
+
+    def test_reference_titles_are_not_trusted(self):
+        tomorrow = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+        result = parse_command_with_confidence(f"delete it on {tomorrow}")
+        assert result["confidence"] == 0.0
+
+    def test_free_form_input_does_not_match(self):
+        assert parse_command_with_confidence("shedule meeting tomorrow") is None
+        assert parse_command_with_confidence("delete meeting on the 5th") is None
+        assert parse_command_with_confidence("   ") is None
+
+
+def test_parse_command_verb_fallback_unchanged():
+    assert parse_command("please cancel my thing") == {
+        "action": "delete_event",
+        "details": {},
+    }
+
+
+def test_classify_intent_matches_whole_words():
+    assert classify_intent("what's going on today") == "list_all"
+    assert classify_intent("show my tasks") == "list_reminders_only"
+    # "on" inside another word is not a keyword
+    assert classify_intent("monday plans") == "unknown"
+    assert classify_intent("done") == "unknown"
+    assert classify_intent("address book") == "create_event"
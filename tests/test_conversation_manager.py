@@ -3,7 +3,7 @@
 import pytest
 from unittest.mock import Mock, patch
 from datetime import datetime
-from core.conversation_manager import ConversationState, Turn
+from core.conversation_manager import ConversationState, Turn, estimate_tokens
 
 
 class TestConversationState:
@@ -209,6 +209,67 @@ class TestConversationState:
         assert len(context) == 1  # Should return all available turns
 
 
+class TestBuildLLMContext:
+    """Test token-budgeted context building."""
+
+    def _verbose_state(self, turns=8, **kwargs):
+        state = ConversationState(**kwargs)
+        for i in range(turns):
+            state.append_turn(
+                f"schedule meeting {i}",
+                "create_event",
+                {
+                    "title": f"Meeting {i}",
+                    "date": "2024-01-15",
+                    "time": "14:00",
+                    "description": "x" * 500,
+                },
+            )
+        return state
+
+    def test_empty_state(self):
+        assert ConversationState().build_llm_context() == ""
+
+    def test_recent_turns_full_older_turns_summarized(self):
+        state = self._verbose_state(turns=4, token_budget=1000)
+        context = state.build_llm_context()
+        lines = context.splitlines()
+
+        assert lines[-3:] == [
+            "User: schedule meeting 3",
+            "Assistant: create_event",
+            lines[-1],
+        ]
+        assert lines[-1].startswith("Details: title=Meeting 3")
+        assert 'Earlier: User: "schedule meeting 0" -> Assistant: create_event(' in (
+            context
+        )
+        # Raw dict reprs and long values never reach the prompt
+        assert "{" not in context
+        assert "x" * 100 not in context
+
+    def test_summaries_keep_reference_fields(self):
+        state = self._verbose_state(turns=3, token_budget=1000)
+        summary = state.build_llm_context().splitlines()[0]
+        assert "title=Meeting 0" in summary
+        assert "date=2024-01-15" in summary
+        assert "description" not in summary
+
+    def test_budget_is_enforced_dropping_oldest_first(self):
+        state = self._verbose_state(turns=10, token_budget=120)
+        context = state.build_llm_context()
+
+        assert estimate_tokens(context) <= 120
+        assert "schedule meeting 9" in context
+        assert "schedule meeting 0" not in context
+
+    def test_tiny_budget_keeps_latest_turn(self):
+        state = self._verbose_state(turns=3)
+        context = state.build_llm_context(token_budget=5)
+        assert context
+        assert len(context) <= 20
+
+
 class TestTurn:
     """Test the Turn data class."""
 
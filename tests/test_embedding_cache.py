@@ -0,0 +1,33 @@
+import itertools
+
+import numpy as np
+
+import core.embedding_cache
+from core.embedding_cache import EmbeddingCache
+
+
+def test_vectors_round_trip_as_float32_per_model(tmp_path):
+    path = str(tmp_path / "cache.db")
+    EmbeddingCache(path).put_many("small", ["hello"], [[0.5, -1.25, 0.1]])
+
+    reopened = EmbeddingCache(path)
+
+    (vector, missing) = reopened.get_many("small", ["hello", "other"])
+    assert vector == [0.5, -1.25, float(np.float32(0.1))]
+    assert missing is None
+    assert reopened.get_many("large", ["hello"]) == [None]
+    stats = reopened.get_stats()
+    assert (stats["entries"], stats["hits"], stats["misses"]) == (1, 1, 2)
+
+
+def test_least_recently_used_vectors_are_evicted(monkeypatch):
+    clock = itertools.count()
+    monkeypatch.setattr(core.embedding_cache.time, "time", lambda: next(clock))
+    cache = EmbeddingCache(":memory:", max_entries=2)
+    cache.put_many("m", ["a", "b"], [[1.0], [2.0]])
+
+    cache.get_many("m", ["a"])
+    cache.put_many("m", ["c"], [[3.0]])
+
+    assert cache.get_many("m", ["a", "b", "c"]) == [[1.0], None, [3.0]]
+    assert cache.get_stats()["entries"] == 2
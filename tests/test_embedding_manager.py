@@ -154,33 +154,39 @@ class TestEmbeddingManager:
         # Should be random embeddings
         assert isinstance(embeddings[0][0], float)
 
-    def test_store_embeddings_json_fallback(self):
-        """Test storing embeddings in JSON when ChromaDB is not available."""
+    def test_store_embeddings_vector_store_fallback(self):
+        """Test storing embeddings locally when ChromaDB is not available."""
         manager = EmbeddingManager(self.test_db_path)
         manager.collection = None
 
         embeddings = [[0.1, 0.2, 0.3] * 512]  # 1536 dimensions
         metadata = [{"title": "Test Event", "text_for_embedding": "Test description"}]
 
-        result = manager.store_embeddings(embeddings, metadata)
+        assert manager.store_embeddings(embeddings, metadata) is True
+        assert manager.store_embeddings(embeddings, metadata) is True
 
-        assert result is True
+        # Appends land in the memory-mapped matrix without a JSON file
+        store = manager.vector_store
+        assert os.path.exists(store.vectors_path)
+        assert not os.path.exists(self.test_db_path.replace(".db", ".json"))
+        assert store.vectors.shape == (2, 1536)
+        assert store.metadata([1]) == metadata
 
-        # Check that JSON file was created
+    def test_old_json_embeddings_are_imported(self):
+        """Test that embeddings saved by the JSON fallback move to the vector store."""
         json_path = self.test_db_path.replace(".db", ".json")
-        assert os.path.exists(json_path)
+        with open(json_path, "w") as f:
+            json.dump({"embeddings": [[3.0, 4.0]], "metadata": [{"title": "Old"}]}, f)
 
-        # Check file contents
-        with open(json_path, "r") as f:
-            data = json.load(f)
+        manager = EmbeddingManager(self.test_db_path)
 
-        assert "embeddings" in data
-        assert "metadata" in data
-        assert len(data["embeddings"]) == 1
-        assert len(data["metadata"]) == 1
+        # Stored at unit length
+        assert manager.vector_store.vectors.tolist() == [pytest.approx([0.6, 0.8])]
+        assert manager.get_stats()["total_events"] == 1
+        assert len(EmbeddingManager(self.test_db_path).vector_store) == 1
 
-    def test_search_similar_json_fallback(self):
-        """Test searching similar events using JSON fallback."""
+    def test_search_similar_vector_store_fallback(self):
+        """Test searching similar events using the local vector store."""
         manager = EmbeddingManager(self.test_db_path)
         manager.openai_client = None
         manager.collection = None
@@ -222,6 +228,90 @@ class TestEmbeddingManager:
             # Should find the team meeting as most similar
             assert results[0]["metadata"]["title"] == "Team Meeting"
 
+    def test_vector_store_search_matches_full_sort(self):
+        """Test that the partitioned top-k search ranks like a full cosine sort."""
+        manager = EmbeddingManager(self.test_db_path)
+        manager.collection = None
+        rng = np.random.default_rng(7)
+        embeddings = rng.normal(size=(50, 8)) * rng.uniform(0.5, 3, size=(50, 1))
+        manager.store_embeddings(embeddings.tolist(), [{"n": i} for i in range(50)])
+        query = rng.normal(size=8)
+
+        results = manager._search_in_vector_store(query.tolist(), top_k=5)
+
+        cosine = embeddings @ query / np.linalg.norm(embeddings, axis=1)
+        cosine /= np.linalg.norm(query)
+        expected = np.argsort(-cosine)[:5]
+        assert [r["metadata"]["n"] for r in results] == expected.tolist()
+        assert [r["similarity"] for r in results] == pytest.approx(cosine[expected])
+        assert len(manager._search_in_vector_store(query.tolist(), top_k=80)) == 50
+
+    def test_ann_index_search_skips_deleted_events(self):
+        """Test searching through an IVF index and tombstoning a deleted event."""
+        manager = EmbeddingManager(self.test_db_path, ann_index="ivf")
+        manager.collection = None
+        manager.store_embeddings(
+            [[1.0, 0.0], [0.9, 0.1], [0.0, 1.0]],
+            [{"event_id": f"e{i}", "title": f"Event {i}"} for i in range(3)],
+        )
+
+        assert manager.delete_event_embedding("e0") is True
+        results = manager._search_in_vector_store([1.0, 0.0], top_k=5)
+
+        assert [r["metadata"]["event_id"] for r in results] == ["e1", "e2"]
+        reopened = EmbeddingManager(self.test_db_path, ann_index="ivf")
+        stats = reopened.get_stats()
+        assert stats["total_events"] == 2
+        assert (stats["ann_index"]["kind"], stats["ann_index"]["deleted"]) == ("ivf", 1)
+        assert reopened._search_in_vector_store([1.0, 0.0], top_k=1) == results[:1]
+        exact = EmbeddingManager(self.test_db_path, ann_index="exact")
+        assert exact._search_in_vector_store([1.0, 0.0], top_k=5) == results
+
+    def test_unsaved_ann_index_changes_are_replayed_from_store(self):
+        """Test that index changes lost before a save are rebuilt on startup."""
+        manager = EmbeddingManager(self.test_db_path, ann_index="ivf")
+        manager.collection = None
+        for i in range(3):
+            manager.store_embeddings([[1.0, i]], [{"event_id": f"e{i}"}])
+        manager.delete_event_embedding("e0")
+        assert not os.path.exists(manager.ann_index.path)
+
+        # As if the process died without flushing
+        reopened = EmbeddingManager(self.test_db_path, ann_index="ivf")
+
+        stats = reopened.ann_index.get_stats()
+        assert (stats["rows"], stats["deleted"]) == (3, 1)
+        assert os.path.exists(reopened.ann_index.path)
+
+    def test_hnsw_index_falls_back_to_ivf_without_hnswlib(self):
+        """Test that asking for HNSW without hnswlib installed gives an IVF index."""
+        with patch("core.ann_index.hnswlib", None):
+            manager = EmbeddingManager(self.test_db_path, ann_index="hnsw")
+        assert manager.ann_index.kind == "ivf"
+        with pytest.raises(ValueError):
+            EmbeddingManager(self.test_db_path, ann_index="lsh")
+
+    def test_chromadb_leaves_no_local_store_files(self):
+        """Test that the local store and its files are only made without ChromaDB."""
+        collection = Mock()
+
+        def init_chromadb(manager):
+            manager.collection = collection
+
+        with patch.object(EmbeddingManager, "_init_vector_db", init_chromadb):
+            manager = EmbeddingManager(self.test_db_path, ann_index="ivf")
+        manager.store_embeddings([[1.0, 0.0]], [{"event_id": "e1"}])
+        manager.get_stats()
+
+        collection.add.assert_called_once()
+        assert manager._vector_store is None
+        # Only the embedding cache, which ChromaDB cannot stand in for
+        assert os.listdir(self.temp_dir) == ["embedding_cache.db"]
+
+        manager.collection = None  # ChromaDB failed; fall back
+        assert manager.store_embeddings([[1.0, 0.0]], [{"event_id": "e1"}])
+        assert len(manager.vector_store) == 1
+
     def test_add_event_embedding(self):
         """Test adding a single event embedding."""
         manager = EmbeddingManager(self.test_db_path)
@@ -265,7 +355,7 @@ class TestEmbeddingManager:
         stats = manager.get_stats()
 
         assert stats["total_events"] == 1
-        assert stats["storage_type"] == "json"
+        assert stats["storage_type"] == "vector_store"
 
     def test_calculate_duration(self):
         """Test duration calculation."""
@@ -333,6 +423,126 @@ class TestEmbeddingManager:
         results = manager.search_similar("test query")
         assert results == []
 
+    def _fake_embeddings(self, calls, fail=None):
+        """Embeddings client returning [number] per input, results shuffled."""
+
+        def create(model, input):
+            calls.append(list(input))
+            if fail:
+                fail(input)
+            data = [
+                Mock(index=i, embedding=[float(text.split()[-1])])
+                for i, text in enumerate(input)
+            ]
+            return Mock(data=data[::-1])
+
+        client = Mock()
+        client.embeddings.create.side_effect = create
+        return client
+
+    def test_create_embeddings_batches_and_keeps_order(self):
+        """Test that inputs are sent in concurrent chunks and results stay ordered."""
+        manager = EmbeddingManager(self.test_db_path)
+        calls = []
+        manager.openai_client = self._fake_embeddings(calls)
+        events = [{"text_for_embedding": f"event {i}"} for i in range(25)]
+
+        with patch("core.embedding_manager.EMBEDDING_BATCH_SIZE", 10):
+            embeddings = manager.create_embeddings(events)
+
+        assert embeddings == [[float(i)] for i in range(25)]
+        assert sorted(len(chunk) for chunk in calls) == [5, 10, 10]
+        assert manager.requests_sent == 3
+
+    def test_create_embeddings_retries_rate_limits(self):
+        """Test that a rate-limited request is retried after a backoff."""
+        manager = EmbeddingManager(self.test_db_path)
+        calls = []
+
+        rate_limited = type("RateLimitError", (Exception,), {"status_code": 429})
+
+        def fail(texts):
+            if len(calls) == 1:
+                raise rate_limited("slow down")
+
+        manager.openai_client = self._fake_embeddings(calls, fail)
+
+        with patch("core.embedding_manager.time.sleep") as sleep:
+            embeddings = manager.create_embeddings([{"text_for_embedding": "a 7"}])
+
+        assert embeddings == [[7.0]]
+        assert manager.retries == 1
+        sleep.assert_called_once()
+
+    def test_rejected_chunk_falls_back_per_event(self):
+        """Test that only the event the API rejects gets a random embedding."""
+        manager = EmbeddingManager(self.test_db_path)
+        calls = []
+        rejected = type("BadRequestError", (Exception,), {"status_code": 400})
+
+        def fail(texts):
+            if any(text.startswith("bad") for text in texts):
+                raise rejected("input too long")
+
+        manager.openai_client = self._fake_embeddings(calls, fail)
+        events = [{"text_for_embedding": text} for text in ("a 1", "bad 2", "c 3")]
+
+        embeddings = manager.create_embeddings(events)
+
+        assert embeddings[0] == [1.0] and embeddings[2] == [3.0]
+        assert len(embeddings[1]) == 1536
+        assert [len(chunk) for chunk in calls] == [3, 1, 1, 1]
+
+    def test_cached_texts_are_not_embedded_again(self):
+        """Test that repeated and duplicate texts only reach the API once."""
+        manager = EmbeddingManager(self.test_db_path)
+        calls = []
+        manager.openai_client = self._fake_embeddings(calls)
+        events = [{"text_for_embedding": t} for t in ("a 1", "b 2", "a 1")]
+
+        first = manager.create_embeddings(events)
+        again = EmbeddingManager(self.test_db_path)
+        again.openai_client = manager.openai_client
+        second = again.create_embeddings(events + [{"text_for_embedding": "c 3"}])
+
+        assert first == [[1.0], [2.0], [1.0]]
+        assert second == first + [[3.0]]
+        assert calls == [["a 1", "b 2"], ["c 3"]]
+        assert again.get_stats()["embedding_cache"]["hits"] == 3
+
+    def test_cache_persists_with_chromadb(self):
+        """Test that embeddings are cached on disk when ChromaDB is in use."""
+
+        def init_chromadb(manager):
+            manager.collection = Mock()
+
+        calls = []
+        events = [{"text_for_embedding": "a 1"}]
+        with patch.object(EmbeddingManager, "_init_vector_db", init_chromadb):
+            manager = EmbeddingManager(self.test_db_path)
+            manager.openai_client = self._fake_embeddings(calls)
+            manager.create_embeddings(events)
+            again = EmbeddingManager(self.test_db_path)
+
+        assert again.create_embeddings(events) == [[1.0]]
+        assert calls == [["a 1"]]
+
+    def test_search_similar_reuses_query_embedding(self):
+        """Test that a repeated query is answered from the embedding cache."""
+        manager = EmbeddingManager(self.test_db_path)
+        manager.collection = None
+        manager.store_embeddings([[1.0], [-1.0]], [{"title": "Up"}, {"title": "Down"}])
+        calls = []
+        manager.openai_client = self._fake_embeddings(calls)
+
+        first = manager.search_similar("query 1", top_k=1)
+        manager.openai_client = None
+        second = manager.search_similar("query 1", top_k=1)
+
+        assert first == second
+        assert first[0]["metadata"]["title"] == "Up"
+        assert calls == [["query 1"]]
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
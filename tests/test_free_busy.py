@@ -0,0 +1,95 @@
+from datetime import date, datetime, time, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from calendar_agent_eventkit import EventKitAgent
+from utils.cli_output import format_free_slots
+from utils.free_busy import FreeBusy
+
+MONDAY = date(2030, 6, 3)
+
+
+def at(day, hour, minute=0):
+    return datetime(2030, 6, day, hour, minute)
+
+
+def test_first_and_best_fit():
+    free_busy = FreeBusy.from_intervals(
+        MONDAY, 2, [(at(3, 9), at(3, 10, 7)), (at(3, 11), at(3, 16, 30))]
+    )
+    half_hour = timedelta(minutes=30)
+
+    # Busy until 10:07 rounds up to the 10:10 slot boundary
+    assert free_busy.find_slots(half_hour, count=2) == [
+        (at(3, 10, 10), at(3, 10, 40)),
+        (at(3, 16, 30), at(3, 17)),
+    ]
+    # Best fit takes the exactly fitting 16:30 gap before the longer ones
+    assert free_busy.find_slots(half_hour, strategy="best", count=3) == [
+        (at(3, 16, 30), at(3, 17)),
+        (at(3, 10, 10), at(3, 10, 40)),
+        (at(4, 9), at(4, 9, 30)),
+    ]
+    assert free_busy.free_periods(timedelta(hours=1)) == [(at(4, 9), at(4, 17))]
+
+
+def test_all_free_combines_calendars():
+    alice = FreeBusy.from_intervals(MONDAY, 1, [(at(3, 9), at(3, 12))])
+    bob = FreeBusy.from_intervals(MONDAY, 1, [(at(3, 13), at(3, 16))])
+
+    both = alice & bob
+
+    assert both.free_periods() == [(at(3, 12), at(3, 13)), (at(3, 16), at(3, 17))]
+    assert FreeBusy.all_free([alice, bob]).busy.tolist() == both.busy.tolist()
+    with pytest.raises(ValueError):
+        alice & FreeBusy(MONDAY, 2)
+
+
+def test_working_hours_weekdays_and_custom_mask():
+    free_busy = FreeBusy(date(2030, 6, 8), 3, resolution=15)  # Saturday
+    hour = timedelta(hours=1)
+
+    assert free_busy.find_slots(hour) == [(at(10, 9), at(10, 10))]
+    early_sunday = free_busy.find_slots(
+        hour, working_hours=(time(7), time(8)), weekdays=[6]
+    )
+    assert early_sunday == [(at(9, 7), at(9, 8))]
+    evenings = np.zeros(free_busy.slots_per_day, dtype=bool)
+    evenings[18 * 4 : 22 * 4] = True
+    assert free_busy.find_slots(hour, mask=evenings) == [(at(8, 18), at(8, 19))]
+    with pytest.raises(ValueError):
+        free_busy.find_slots(hour, strategy="random")
+    with pytest.raises(ValueError):
+        FreeBusy(MONDAY, 1, resolution=7)
+
+
+def test_agent_finds_slots_free_in_every_calendar():
+    def event(calendar, start, end):
+        return SimpleNamespace(
+            title="Busy",
+            startDate=start,
+            endDate=end,
+            calendar=SimpleNamespace(title=calendar),
+        )
+
+    agent = EventKitAgent()
+    agent.store._events = [
+        event("Alice", at(3, 9), at(3, 11)),
+        event("Bob", at(3, 11), at(3, 12)),
+        event("Carol", at(3, 12), at(3, 17)),
+    ]
+
+    shared = agent.find_free_slots(
+        {"duration": 45, "start_date": "2030-06-03", "calendars": ["Alice", "Bob"]}
+    )
+    anyone = agent.find_free_slots(
+        {"duration": 45, "start_date": "2030-06-03", "end_date": "2030-06-03"}
+    )
+
+    assert shared["slots"][0] == (at(3, 12), at(3, 12, 45))
+    assert anyone == {"success": False, "error": "No free slot found", "slots": []}
+    assert format_free_slots(shared["slots"][:1]) == (
+        "🟢 Mon Jun 03 12:00 PM - 12:45 PM"
+    )
@@ -0,0 +1,98 @@
+"""Tests for the local intent classifier and its routing in openai_client."""
+
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+import openai_client
+from utils.intent_classifier import (
+    INTENT_LABELS,
+    IntentClassifier,
+    build_training_corpus,
+    extract_features,
+    train_intent_classifier,
+)
+
+
+@pytest.fixture(scope="module")
+def classifier():
+    return train_intent_classifier(build_training_corpus(cache_path=None))
+
+
+def test_extract_features_collapses_digits():
+    assert extract_features("at 2pm") == extract_features("at 9pm")
+    assert "b:list tasks" in extract_features("List tasks")
+
+
+def test_corpus_includes_llm_testing_prompts():
+    corpus = build_training_corpus(cache_path=None)
+    texts = {text for text, _ in corpus}
+
+    assert "What does 'recurring' mean in calendar terms?" in texts
+    assert {action for _, action in corpus} == set(INTENT_LABELS)
+
+
+def test_predicts_common_intents(classifier):
+    assert classifier.predict("what reminders do I have")[0] == "list_reminders_only"
+    assert classifier.predict("cancel the dentist")[0] == "delete_event"
+    assert classifier.predict("move standup to 3pm")[0] == "move_event"
+    assert classifier.predict("hello there")[0] == "clarify"
+
+
+def test_save_and_load_round_trip(classifier, tmp_path):
+    path = str(tmp_path / "intent_model.npz")
+    classifier.save(path)
+    loaded = IntentClassifier.load(path)
+
+    assert loaded.labels == classifier.labels
+    assert loaded.predict("show my tasks")[0] == classifier.predict("show my tasks")[0]
+    assert IntentClassifier.load(str(tmp_path / "missing.npz")) is None
+
+
+def test_confident_listing_skips_llm(classifier):
+    mock_client = MagicMock()
+    with patch("openai_client.client", mock_client), patch(
+        "openai_client.intent_classifier", classifier
+    ):
+        result = openai_client.interpret_command("can you show my reminders")
+
+    assert result == {"action": "list_reminders_only", "details": {}}
+    mock_client.chat.completions.create.assert_not_called()
+
+
+def test_actions_needing_details_escalate(classifier):
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.return_value.choices[
+        0
+    ].message.tool_calls = None
+    mock_client.chat.completions.create.return_value.choices[
+        0
+    ].message.function_call = None
+    with patch("openai_client.client", mock_client), patch(
+        "openai_client.intent_classifier", classifier
+    ):
+        openai_client.interpret_command("cancel the dentist")
+
+    mock_client.chat.completions.create.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "list my reminders for next week",
+        "what reminders do i have tomorrow",
+        "show reminders due friday",
+        "list my tasks for monday",
+        "show my events on 2025-03-01",
+    ],
+)
+def test_listing_with_date_escalates(classifier, text):
+    with patch("openai_client.intent_classifier", classifier):
+        assert openai_client.try_intent_classifier(text) is None
+
+
+def test_todays_listing_still_routes(classifier):
+    with patch("openai_client.intent_classifier", classifier):
+        result = openai_client.try_intent_classifier("what do I have today")
+
+    assert result == {"action": "list_todays_events", "details": {}}
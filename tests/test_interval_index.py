@@ -0,0 +1,118 @@
+import random
+from datetime import datetime, timedelta
+
+import calendar_agent_eventkit
+from utils.interval_index import IntervalIndex
+
+
+def dt(hour, minute=0):
+    return datetime(2025, 3, 3, hour, minute)
+
+
+def test_overlapping_and_starting_in():
+    index = IntervalIndex(seed=1)
+    index.add("standup", dt(9), dt(9, 15))
+    index.add("review", dt(10), dt(11))
+    index.add("lunch", dt(12), dt(13))
+
+    assert index.overlapping(dt(9, 10), dt(10, 30)) == ["standup", "review"]
+    # Touching intervals don't overlap
+    assert index.overlapping(dt(11), dt(12)) == []
+    assert index.starting_in(dt(10), dt(12)) == ["review", "lunch"]
+    assert len(index) == 3
+
+
+def test_add_existing_key_replaces_and_remove():
+    index = IntervalIndex(seed=1)
+    index.add("sync", dt(9), dt(10))
+    index.add("sync", dt(15), dt(16))
+
+    assert len(index) == 1
+    assert index.overlapping(dt(9), dt(10)) == []
+    assert index.remove("sync") is True
+    assert index.remove("sync") is False
+    assert "sync" not in index
+
+
+def test_gaps_merge_busy_time():
+    index = IntervalIndex(seed=1)
+    index.add("a", dt(10), dt(11))
+    index.add("b", dt(10, 30), dt(12))
+    index.add("c", dt(14), dt(14, 20))
+
+    assert index.gaps(dt(9), dt(17)) == [
+        (dt(9), dt(10)),
+        (dt(12), dt(14)),
+        (dt(14, 20), dt(17)),
+    ]
+    assert index.gaps(dt(9), dt(17), min_length=timedelta(hours=2)) == [
+        (dt(12), dt(14)),
+        (dt(14, 20), dt(17)),
+    ]
+
+
+def test_matches_brute_force():
+    rng = random.Random(7)
+    index = IntervalIndex(seed=7)
+    intervals = {}
+    for step in range(2000):
+        key = rng.randrange(200)
+        if rng.random() < 0.3:
+            assert index.remove(key) == (intervals.pop(key, None) is not None)
+            continue
+        start = rng.randrange(1000)
+        end = start + rng.randrange(50)
+        index.add(key, start, end)
+        intervals[key] = (start, end)
+
+        if step % 50 == 0:
+            lo = rng.randrange(1000)
+            hi = lo + rng.randrange(1, 100)
+            expected = {
+                k for k, (s, e) in intervals.items() if s < hi and (e > lo or s >= lo)
+            }
+            assert set(index.overlapping(lo, hi)) == expected
+            expected = {k for k, (s, _) in intervals.items() if lo <= s <= hi}
+            assert set(index.starting_in(lo, hi)) == expected
+
+
+def test_create_event_reports_conflicts(dummy_store, monkeypatch):
+    monkeypatch.setattr(
+        calendar_agent_eventkit.EKEvent,
+        "setEndDate_",
+        lambda self, date: setattr(self, "endDate", date),
+        raising=False,
+    )
+    agent = calendar_agent_eventkit._agent
+    first = agent.create_event(
+        {"title": "Standup", "date": "2030-01-07", "time": "09:00", "duration": 60}
+    )
+    second = agent.create_event(
+        {"title": "Review", "date": "2030-01-07", "time": "09:30", "duration": 30}
+    )
+
+    assert "conflicts" not in first
+    assert second["success"] is True
+    assert second["conflicts"] == ["Standup"]
+
+
+def test_delete_event_removes_matching_event(dummy_store):
+    agent = calendar_agent_eventkit._agent
+    agent.create_event(
+        {"title": "Dentist", "date": "2030-01-08", "time": "15:00", "duration": 60}
+    )
+    saved = list(dummy_store.saved_events)
+    removed = []
+
+    def remove(event, span, error_ptr):
+        removed.append(event)
+        dummy_store.saved_events.remove(event)
+        return True
+
+    dummy_store.removeEvent_span_error_ = remove
+
+    result = agent.delete_event({"title": "dentist", "date": "2030-01-08"})
+
+    assert result["success"] is True
+    assert removed == saved
+    assert agent.find_conflicts(datetime(2030, 1, 8), datetime(2030, 1, 9)) == []
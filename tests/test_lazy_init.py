@@ -0,0 +1,58 @@
+"""Tests that heavy subsystems are created on first use, not at startup."""
+
+import subprocess
+import sys
+from unittest.mock import patch, MagicMock
+
+import calendar_agent_eventkit
+import openai_client
+from calendar_agent_eventkit import EventKitAgent
+
+
+def test_import_main_skips_heavy_dependencies():
+    code = (
+        "import sys, main; "
+        "print(sorted(m for m in ('openai', 'numpy', 'core.memory_manager') "
+        "if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, timeout=60
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().splitlines()[-1] == "[]"
+
+
+def test_agent_builds_memory_on_first_use():
+    with patch("core.memory_manager.CoreMemory") as core_memory_cls:
+        agent = EventKitAgent()
+        core_memory_cls.assert_not_called()
+
+        assert agent.core_memory is core_memory_cls.return_value
+        assert agent.core_memory is core_memory_cls.return_value
+        core_memory_cls.assert_called_once()
+
+
+def test_nudger_uses_assigned_core_memory():
+    agent = EventKitAgent()
+    core_memory = MagicMock()
+    agent.core_memory = core_memory
+
+    with patch("core.nudge_engine.ContextualNudger") as nudger_cls:
+        assert agent.nudger is nudger_cls.return_value
+    nudger_cls.assert_called_once_with(core_memory)
+
+
+def test_module_agent_is_shared():
+    assert calendar_agent_eventkit._agent is calendar_agent_eventkit._get_agent()
+
+
+def test_client_created_on_first_use(monkeypatch):
+    fake_openai = MagicMock()
+    monkeypatch.setattr(openai_client, "client", openai_client._LAZY)
+    monkeypatch.setattr(openai_client, "_openai_module", fake_openai)
+    monkeypatch.setattr(openai_client, "OPENAI_API_KEY", "test-key")
+
+    assert openai_client.get_client() is fake_openai.OpenAI.return_value
+    assert openai_client.get_client() is fake_openai.OpenAI.return_value
+    fake_openai.OpenAI.assert_called_once_with(api_key="test-key")
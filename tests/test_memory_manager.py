@@ -180,6 +180,70 @@ class TestCoreMemory:
         result = self.core_memory.delete_memory("nonexistent_id")
         assert result is False
 
+    def test_find_past_events_by_title_and_date(self):
+        """Test the title/date index through add, move, delete and reload."""
+        standup = self.core_memory.add_past_event(
+            {"title": "Daily  Standup", "start_date": "2024-01-15"}
+        )
+        later = self.core_memory.add_past_event(
+            {"title": "Daily Standup", "start_date": "2024-01-16"}
+        )
+        self.core_memory.add_past_event({"title": "Retro", "start_date": "2024-01-15"})
+
+        assert self.core_memory.find_past_events("daily standup", "2024-01-15") == [
+            standup
+        ]
+        assert sorted(self.core_memory.find_past_events("Daily Standup")) == sorted(
+            [standup, later]
+        )
+
+        assert self.core_memory.move_past_event(standup, "2024-01-17") is True
+        assert self.core_memory.find_past_events("Daily Standup", "2024-01-15") == []
+        assert self.core_memory.delete_memories([later, "nonexistent_id"]) == 1
+
+        reloaded = CoreMemory(self.test_db_path)
+        assert reloaded.find_past_events("Daily Standup") == [standup]
+        assert reloaded.memories[standup].date == "2024-01-17"
+
+    def test_move_past_event_replaces_embedding(self):
+        """Test that a moved event's stored embedding carries the new date."""
+        standup = self.core_memory.add_past_event(
+            {"title": "Standup", "start_date": "2024-01-15"}
+        )
+
+        self.core_memory.move_past_event(standup, "2024-01-17")
+
+        store = self.core_memory.embedding_manager.vector_store
+        rows = store.find("event_id", standup)
+        assert [m["start_date"] for m in store.metadata(rows)] == ["2024-01-17"]
+        assert store.live_count == 1
+
+    def test_move_past_event_in_deferred_batch(self):
+        """Test that moving a not yet embedded event embeds it once, re-dated."""
+        with self.core_memory.deferred_save():
+            standup = self.core_memory.add_past_event(
+                {"title": "Standup", "start_date": "2024-01-15"}
+            )
+            self.core_memory.move_past_event(standup, "2024-01-17")
+
+        store = self.core_memory.embedding_manager.vector_store
+        assert [m["start_date"] for m in store.metadata(range(len(store)))] == [
+            "2024-01-17"
+        ]
+
+    def test_delete_memories_writes_once(self):
+        """Test that deleting several memories saves once."""
+        ids = [
+            self.core_memory.add_past_event({"title": "Gym", "start_date": day})
+            for day in ("2024-01-15", "2024-01-16", "2024-01-17")
+        ]
+
+        with patch.object(self.core_memory, "_save_memories") as save:
+            assert self.core_memory.delete_memories(ids) == 3
+
+        save.assert_called_once()
+        assert self.core_memory.find_past_events("Gym") == []
+
     def test_get_patterns(self):
         """Test getting patterns from past events."""
         # Add some past events
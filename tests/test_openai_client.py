@@ -1,6 +1,8 @@
 """Test OpenAI client functionality."""
 
-from unittest.mock import patch, MagicMock, PropertyMock
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock, AsyncMock
 import openai_client
 
 
@@ -12,14 +14,22 @@ def test_interpret_command_no_api_key():
         assert "details" in result
 
 
+def completion(tool_calls=None, content=None):
+    """Chat completion response carrying an assistant message."""
+    message = SimpleNamespace(
+        tool_calls=tool_calls, function_call=None, content=content
+    )
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def tool_call(name, arguments="{}"):
+    return SimpleNamespace(function=SimpleNamespace(name=name, arguments=arguments))
+
+
 def test_interpret_command_with_api_key():
     """Test interpretation when API key is available."""
     mock_client = MagicMock()
-    mock_response = MagicMock()
-    mock_message = MagicMock()
-    mock_message.function_call = None
-    mock_response.choices = [mock_message]
-    mock_client.chat.completions.create.return_value = mock_response
+    mock_client.chat.completions.create.return_value = completion(content="Hi!")
 
     with patch("openai_client.client", mock_client):
         result = openai_client.interpret_command("hello", "")
@@ -28,18 +38,11 @@ def test_interpret_command_with_api_key():
 
 
 def test_interpret_command_function_call():
-    """Test interpretation with function call response."""
+    """Test interpretation with a tool call response."""
     mock_client = MagicMock()
-    mock_response = MagicMock()
-    mock_message = MagicMock()
-    mock_function_call = MagicMock()
-
-    # Use PropertyMock to properly mock the attributes
-    type(mock_function_call).name = PropertyMock(return_value="list_all")
-    type(mock_function_call).arguments = PropertyMock(return_value="{}")
-    mock_message.function_call = mock_function_call
-    mock_response.choices = [mock_message]
-    mock_client.chat.completions.create.return_value = mock_response
+    mock_client.chat.completions.create.return_value = completion(
+        tool_calls=[tool_call("list_all")]
+    )
 
     with patch("openai_client.client", mock_client):
         result = openai_client.interpret_command("show me today's events", "")
@@ -56,3 +59,330 @@ def test_interpret_command_exception():
         result = openai_client.interpret_command("hello", "")
         assert result["action"] == "error"
         assert "API Error" in result["details"]
+
+
+def test_interpret_command_fast_path_skips_llm():
+    """Structured commands are answered locally without calling the LLM."""
+    mock_client = MagicMock()
+    openai_client.reset_fast_path_stats()
+
+    with patch("openai_client.client", mock_client):
+        result = openai_client.interpret_command("delete standup on 2025-03-01", "")
+
+    assert result == {
+        "action": "delete_event",
+        "details": {"title": "standup", "date": "2025-03-01"},
+    }
+    mock_client.chat.completions.create.assert_not_called()
+    assert openai_client.get_fast_path_stats()["hits"] == 1
+
+
+def test_interpret_command_fast_path_miss_uses_llm():
+    """Free-form input falls through to the LLM and counts as a miss."""
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.side_effect = Exception("API Error")
+    openai_client.reset_fast_path_stats()
+
+    with patch("openai_client.client", mock_client):
+        openai_client.interpret_command("can you find time for lunch", "")
+
+    mock_client.chat.completions.create.assert_called_once()
+    stats = openai_client.get_fast_path_stats()
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.0
+
+
+def test_interpret_command_parses_tool_calls():
+    """Tool call responses from the tools API are parsed into actions."""
+    tool_call = MagicMock()
+    tool_call.function.name = "delete_event"
+    tool_call.function.arguments = '{"title": "standup", "date": "2025-03-01"}'
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.return_value.choices[
+        0
+    ].message.tool_calls = [tool_call]
+
+    with patch("openai_client.client", mock_client):
+        result = openai_client.interpret_command("drop standup", "")
+
+    assert result == {
+        "action": "delete_event",
+        "details": {"title": "standup", "date": "2025-03-01"},
+    }
+    kwargs = mock_client.chat.completions.create.call_args.kwargs
+    assert kwargs["tools"] is openai_client.calendar_tools
+    assert kwargs["tool_choice"] == "auto"
+
+
+def test_system_prompt_starts_with_static_prefix():
+    """Per-call slots are appended after the prebuilt prefix."""
+    messages = openai_client._build_messages("hi", "User: earlier turn")
+    content = messages[0]["content"]
+    assert content.startswith(openai_client.SYSTEM_PROMPT_PREFIX)
+    assert "Today is" in content
+    assert content.endswith("CONVERSATION CONTEXT:\nUser: earlier turn\n")
+
+
+def _stream_chunk(name=None, arguments=None):
+    function = SimpleNamespace(name=name, arguments=arguments)
+    delta = SimpleNamespace(tool_calls=[SimpleNamespace(index=0, function=function)])
+    return SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+
+def test_interpret_command_streaming_announces_action_early():
+    """on_action fires with the function name before the arguments finish."""
+    consumed = []
+
+    def stream():
+        chunks = [
+            _stream_chunk(name="list_events_only", arguments=""),
+            _stream_chunk(arguments='{"start_date": '),
+            _stream_chunk(arguments='"2025-03-01"}'),
+        ]
+        for i, chunk in enumerate(chunks):
+            consumed.append(i)
+            yield chunk
+
+    announced = []
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.return_value = stream()
+
+    with patch("openai_client.client", mock_client):
+        result = openai_client.interpret_command(
+            "what's on march 1st",
+            "",
+            on_action=lambda action: announced.append((action, len(consumed))),
+        )
+
+    assert announced == [("list_events_only", 1)]
+    assert result == {
+        "action": "list_events_only",
+        "details": {"start_date": "2025-03-01"},
+    }
+    assert mock_client.chat.completions.create.call_args.kwargs["stream"] is True
+
+
+def test_interpret_command_streaming_without_tool_call():
+    """A stream with no tool call asks for clarification."""
+    empty = SimpleNamespace(
+        choices=[SimpleNamespace(delta=SimpleNamespace(tool_calls=None))]
+    )
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.return_value = iter([empty])
+    announced = []
+
+    with patch("openai_client.client", mock_client):
+        result = openai_client.interpret_command(
+            "hmm", "", on_action=announced.append
+        )
+
+    assert result["action"] == "clarify"
+    assert announced == []
+
+
+def test_interpret_command_local_result_skips_on_action():
+    """Fast-path results are complete at once; nothing is prepared early."""
+    announced = []
+    mock_client = MagicMock()
+
+    with patch("openai_client.client", mock_client):
+        result = openai_client.interpret_command(
+            "list all", "", on_action=announced.append
+        )
+
+    assert result == {"action": "list_all", "details": {}}
+    assert announced == []
+    mock_client.chat.completions.create.assert_not_called()
+
+
+def _async_client_returning(*outcomes):
+    """Build a mock AsyncOpenAI client whose create() yields the given outcomes."""
+    async_client = MagicMock()
+    async_client.chat.completions.create = AsyncMock(side_effect=list(outcomes))
+    return async_client
+
+
+def _function_call_response(name, arguments="{}"):
+    response = MagicMock()
+    response.choices[0].message.function_call.name = name
+    response.choices[0].message.function_call.arguments = arguments
+    return response
+
+
+class _StatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def test_interpret_command_async_success():
+    """Async interpretation parses function calls like the sync path."""
+    async_client = _async_client_returning(_function_call_response("list_all"))
+
+    with patch("openai_client._get_async_client", return_value=async_client):
+        result = asyncio.run(openai_client.interpret_command_async("what's up", ""))
+
+    assert result == {"action": "list_all", "details": {}}
+
+
+def test_interpret_command_async_retries_transient_errors():
+    """Server errors are retried with backoff until a response arrives."""
+    async_client = _async_client_returning(
+        _StatusError(503), _function_call_response("list_all")
+    )
+
+    with patch("openai_client._get_async_client", return_value=async_client), patch(
+        "openai_client._backoff_delay", return_value=0
+    ):
+        result = asyncio.run(openai_client.interpret_command_async("what's up", ""))
+
+    assert result["action"] == "list_all"
+    assert async_client.chat.completions.create.await_count == 2
+
+
+def test_interpret_command_async_does_not_retry_client_errors():
+    """4xx errors other than rate limits fail immediately."""
+    async_client = _async_client_returning(_StatusError(400))
+
+    with patch("openai_client._get_async_client", return_value=async_client):
+        result = asyncio.run(openai_client.interpret_command_async("what's up", ""))
+
+    assert result["action"] == "error"
+    assert async_client.chat.completions.create.await_count == 1
+
+
+def test_is_retryable():
+    """Only network errors, timeouts, rate limits and 5xx errors are retried."""
+    api_connection_error = type("APIConnectionError", (Exception,), {})
+    api_timeout_error = type("APITimeoutError", (api_connection_error,), {})
+
+    for error in (
+        asyncio.TimeoutError(),
+        ConnectionError(),
+        api_timeout_error(),
+        _StatusError(429),
+        _StatusError(502),
+    ):
+        assert openai_client._is_retryable(error), error
+    for error in (_StatusError(400), ValueError("bad JSON"), KeyError("choices")):
+        assert not openai_client._is_retryable(error), error
+
+
+def test_interpret_command_async_bounds_concurrency():
+    """No more than ASYNC_MAX_CONCURRENCY requests are in flight at once."""
+    in_flight = {"now": 0, "peak": 0}
+
+    async def fake_create(**kwargs):
+        in_flight["now"] += 1
+        in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        await asyncio.sleep(0.01)
+        in_flight["now"] -= 1
+        return _function_call_response("list_all")
+
+    async_client = MagicMock()
+    async_client.chat.completions.create = fake_create
+
+    async def run_many():
+        return await asyncio.gather(
+            *(openai_client.interpret_command_async(f"query {i}") for i in range(6))
+        )
+
+    with patch("openai_client._get_async_client", return_value=async_client), patch(
+        "openai_client.ASYNC_MAX_CONCURRENCY", 2
+    ):
+        results = asyncio.run(run_many())
+
+    assert all(r["action"] == "list_all" for r in results)
+    assert in_flight["peak"] == 2
+
+
+def test_interpret_command_async_no_client():
+    """Without an API key the async path returns the same error as the sync path."""
+    with patch("openai_client._get_async_client", return_value=None):
+        result = asyncio.run(openai_client.interpret_command_async("hello", ""))
+    assert result["action"] == "error"
+
+
+def _tool_call(name, arguments):
+    tool_call = MagicMock()
+    tool_call.function.name = name
+    tool_call.function.arguments = arguments
+    return tool_call
+
+
+def _tool_calls_response(*tool_calls):
+    response = MagicMock()
+    response.choices[0].message.tool_calls = list(tool_calls)
+    return response
+
+
+def test_interpret_commands_batches_and_maps_items():
+    """Misses go out in one request and results come back in input order."""
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.return_value = _tool_calls_response(
+        _tool_call("list_reminders_only", '{"item": 2}'),
+        _tool_call("list_all", '{"item": 1}'),
+    )
+
+    with patch("openai_client.client", mock_client):
+        results = openai_client.interpret_commands(
+            ["what's going on", "what do I need to do", "list all"]
+        )
+
+    assert results == [
+        {"action": "list_all", "details": {}},
+        {"action": "list_reminders_only", "details": {}},
+        {"action": "list_all", "details": {}},
+    ]
+    # The third command was answered by the fast path; one request for the rest
+    assert mock_client.chat.completions.create.call_count == 1
+    kwargs = mock_client.chat.completions.create.call_args.kwargs
+    assert kwargs["tools"] is openai_client.calendar_batch_tools
+    assert "2. what do I need to do" in kwargs["messages"][1]["content"]
+
+
+def test_interpret_commands_retries_unanswered_items_individually():
+    """Items missing from the batch response fall back to single requests."""
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.side_effect = [
+        _tool_calls_response(_tool_call("list_all", '{"item": 1}')),
+        _tool_calls_response(_tool_call("list_events_only", "{}")),
+    ]
+
+    with patch("openai_client.client", mock_client):
+        results = openai_client.interpret_commands(["first thing", "second thing"])
+
+    assert [r["action"] for r in results] == ["list_all", "list_events_only"]
+    assert mock_client.chat.completions.create.call_count == 2
+
+
+def test_interpret_commands_partial_failure():
+    """A failed batch is retried per item and only the failing item errors."""
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.side_effect = [
+        Exception("batch too large"),
+        _tool_calls_response(_tool_call("list_all", "{}")),
+        Exception("API Error"),
+    ]
+
+    with patch("openai_client.client", mock_client):
+        results = openai_client.interpret_commands(["first thing", "second thing"])
+
+    assert results[0] == {"action": "list_all", "details": {}}
+    assert results[1] == {"action": "error", "details": "API Error"}
+
+
+def test_interpret_commands_respects_batch_size():
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.side_effect = [
+        _tool_calls_response(
+            _tool_call("list_all", '{"item": 1}'), _tool_call("list_all", '{"item": 2}')
+        ),
+        _tool_calls_response(_tool_call("list_all", '{"item": 1}')),
+    ]
+
+    with patch("openai_client.client", mock_client):
+        results = openai_client.interpret_commands(["a a", "b b", "c c"], batch_size=2)
+
+    assert len(results) == 3
+    assert mock_client.chat.completions.create.call_count == 2
@@ -0,0 +1,33 @@
+from utils.rate_limiter import RateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_bursts_up_to_capacity_then_waits_for_refill():
+    clock = FakeClock()
+    limiter = RateLimiter(60, period=60.0, capacity=3, clock=clock, sleep=clock.sleep)
+
+    waits = [limiter.acquire() for _ in range(4)]
+
+    assert waits == [0.0, 0.0, 0.0, 1.0]
+    assert clock.now == 1.0
+
+
+def test_large_request_waits_for_full_bucket():
+    clock = FakeClock()
+    limiter = RateLimiter(100, period=10.0, clock=clock, sleep=clock.sleep)
+    limiter.acquire(100)
+
+    assert limiter.acquire(500) == 10.0
+    assert limiter.waited == 10.0
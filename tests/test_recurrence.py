@@ -0,0 +1,213 @@
+import random
+from datetime import date, datetime, timedelta
+
+import pytest
+
+import calendar_agent_eventkit
+from utils.recurrence import OccurrenceCache, Recurrence, RecurrenceRule
+
+
+def days(series, start, end):
+    return [occ.date() for occ in series.between(start, end)]
+
+
+def test_parse_rule():
+    rule = RecurrenceRule.parse("RRULE:FREQ=MONTHLY;INTERVAL=2;BYDAY=-1FR,2TU;COUNT=4")
+
+    assert rule.freq == "MONTHLY"
+    assert rule.interval == 2
+    assert rule.count == 4
+    assert rule.byday == ((-1, 4), (2, 1))
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "COUNT=3",
+        "FREQ=HOURLY",
+        "FREQ=DAILY;COUNT=0",
+        "FREQ=DAILY;COUNT=2;UNTIL=20240101",
+        "FREQ=WEEKLY;BYDAY=2MO",
+        "FREQ=WEEKLY;BYMONTHDAY=1,15",
+        "FREQ=DAILY;BYHOUR=9",
+    ],
+)
+def test_parse_rejects_invalid_rules(text):
+    with pytest.raises(ValueError):
+        RecurrenceRule.parse(text)
+
+
+def test_monthly_skips_months_without_the_day():
+    series = Recurrence(datetime(2024, 1, 31, 9), "FREQ=MONTHLY;COUNT=4")
+
+    assert days(series, datetime(2024, 1, 1), datetime(2026, 1, 1)) == [
+        date(2024, 1, 31),
+        date(2024, 3, 31),
+        date(2024, 5, 31),
+        date(2024, 7, 31),
+    ]
+
+
+def test_yearly_nth_weekday():
+    series = Recurrence(datetime(2024, 1, 1, 18), "FREQ=YEARLY;BYMONTH=11;BYDAY=4TH")
+
+    assert days(series, datetime(2024, 1, 1), datetime(2026, 12, 31)) == [
+        date(2024, 11, 28),
+        date(2025, 11, 27),
+        date(2026, 11, 26),
+    ]
+
+
+def test_weekly_interval_byday_until():
+    series = Recurrence(
+        datetime(2024, 1, 3, 9), "FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,WE,FR;UNTIL=20240131"
+    )
+
+    assert days(series, datetime(2024, 1, 1), datetime(2024, 12, 31)) == [
+        date(2024, 1, 3),
+        date(2024, 1, 5),
+        date(2024, 1, 15),
+        date(2024, 1, 17),
+        date(2024, 1, 19),
+        date(2024, 1, 29),
+        date(2024, 1, 31),
+    ]
+
+
+def test_exdates_do_not_shift_count():
+    series = Recurrence(
+        datetime(2024, 1, 1, 9),
+        "FREQ=DAILY;COUNT=5\nEXDATE:20240102T090000",
+        exdates=["2024-01-04"],
+    )
+
+    assert days(series, datetime(2024, 1, 1), datetime(2024, 2, 1)) == [
+        date(2024, 1, 1),
+        date(2024, 1, 3),
+        date(2024, 1, 5),
+    ]
+
+
+def test_window_matches_full_expansion():
+    rules = [
+        "FREQ=DAILY;INTERVAL=3;COUNT=40",
+        "FREQ=DAILY;BYDAY=MO,FR;COUNT=30",
+        "FREQ=WEEKLY;INTERVAL=3;WKST=SU;BYDAY=SU,SA;COUNT=20",
+        "FREQ=MONTHLY;BYMONTHDAY=-1,15;COUNT=30",
+        "FREQ=MONTHLY;BYDAY=MO;BYMONTHDAY=1,2,3,4,5,6,7;COUNT=12",
+        "FREQ=YEARLY;BYDAY=20MO;COUNT=4",
+    ]
+    rng = random.Random(3)
+    for text in rules:
+        for _ in range(20):
+            start = datetime(2024, 1, 1, 9) + timedelta(days=rng.randrange(400))
+            series = Recurrence(start, text)
+            full = list(series.between(datetime(2000, 1, 1), datetime(2040, 1, 1)))
+            lo = start + timedelta(days=rng.randrange(-30, 2000))
+            hi = lo + timedelta(days=rng.randrange(200))
+            assert list(series.between(lo, hi)) == [o for o in full if lo <= o <= hi]
+
+
+def test_far_window_does_not_walk_from_series_start():
+    series = Recurrence(datetime(2024, 1, 1, 9), "FREQ=DAILY;COUNT=3650")
+    calls = []
+    original = series._period_occurrences
+    series._period_occurrences = lambda period: calls.append(period) or original(
+        period
+    )
+
+    result = list(series.between(datetime(2033, 6, 1), datetime(2033, 6, 7, 23, 59)))
+
+    assert len(result) == 7
+    assert len(calls) <= 10
+
+
+def test_yearly_ordinal_weekday_with_monthday():
+    rule = "FREQ=YEARLY;BYDAY=-1TU;BYMONTHDAY=28;COUNT=4"
+    series = Recurrence(datetime(2025, 1, 1, 9), rule)
+
+    result = list(series.between(datetime(2025, 1, 1), datetime(2060, 1, 1)))
+
+    assert result == [
+        datetime(2027, 12, 28, 9),
+        datetime(2032, 12, 28, 9),
+        datetime(2038, 12, 28, 9),
+        datetime(2049, 12, 28, 9),
+    ]
+
+
+def test_far_window_counts_irregular_periods_one_calendar_cycle():
+    rule = "FREQ=MONTHLY;BYDAY=FR;BYMONTHDAY=13;COUNT=5000"
+    series = Recurrence(datetime(2024, 1, 1, 9), rule)
+
+    result = list(series.between(datetime(3000, 1, 1), datetime(3001, 1, 1)))
+
+    assert result
+    assert [o.day for o in result] == [13] * len(result)
+    assert all(o.weekday() == 4 for o in result)
+    assert len(series._counts_after_first) <= 4801
+
+
+def test_agent_lists_weekly_series():
+    agent = calendar_agent_eventkit.EventKitAgent()
+    agent.create_event(
+        {
+            "title": "Team Sync",
+            "date": "2024-01-01",
+            "time": "10:00",
+            "duration": 30,
+            "recurrence_rule": "FREQ=WEEKLY;BYDAY=MO,TH",
+        }
+    )
+
+    result = agent.list_events_and_reminders("2030-01-07", "2030-01-13")
+
+    assert [(e.title, e.start) for e in result["events"]] == [
+        ("Team Sync", datetime(2030, 1, 7, 10)),
+        ("Team Sync", datetime(2030, 1, 10, 10)),
+    ]
+
+
+def test_occurrence_cache_invalidates_only_affected_windows():
+    cache = OccurrenceCache()
+    week1 = (datetime(2024, 1, 1), datetime(2024, 1, 7, 23, 59))
+    week2 = (datetime(2024, 1, 8), datetime(2024, 1, 14, 23, 59))
+    for window in (week1, week2):
+        cache.get("a", *window, lambda: [window[0]])
+        cache.get("b", *window, lambda: [window[0]])
+    cache.get("a", *week1, lambda: pytest.fail("expected a cache hit"))
+
+    cache.invalidate_day("a", date(2024, 1, 9))
+    cache.invalidate_series("b")
+
+    stats = cache.get_stats()
+    assert stats["entries"] == 1
+    assert (stats["hits"], stats["misses"], stats["invalidations"]) == (1, 4, 3)
+
+
+def test_agent_reuses_and_invalidates_cached_occurrences():
+    agent = calendar_agent_eventkit.EventKitAgent()
+    agent.create_event(
+        {
+            "title": "Standup",
+            "date": "2024-01-01",
+            "time": "09:00",
+            "duration": 15,
+            "recurrence_rule": "FREQ=DAILY",
+        }
+    )
+
+    first = agent.list_events_and_reminders("2024-01-01", "2024-01-07")
+    second = agent.list_events_and_reminders("2024-01-01", "2024-01-07")
+    assert first == second
+    assert agent._occurrence_cache.get_stats()["hits"] == 1
+
+    agent.delete_event({"title": "Standup", "date": "2024-01-03"})
+    third = agent.list_events_and_reminders("2024-01-01", "2024-01-07")
+    assert len(third["events"]) == 6
+    assert datetime(2024, 1, 3, 9) not in [e.start for e in third["events"]]
+
+    agent.delete_event(
+        {"title": "Standup", "date": "2024-01-01", "delete_series": True}
+    )
+    assert agent.list_events_and_reminders("2024-01-01", "2024-01-07")["events"] == []
@@ -33,7 +33,7 @@ def test_list_recurring_daily():
     result = list_events_and_reminders("2024-01-01", "2024-01-03")
     assert "Daily Standup" in str(result["events"])
     # Should have 3 occurrences
-    assert len([e for e in result["events"] if "Daily Standup" in e]) == 3
+    assert len([e for e in result["events"] if e.title == "Daily Standup"]) == 3
 
 
 def test_delete_recurring_series():
@@ -59,7 +59,7 @@ def test_delete_recurring_series():
     assert result["success"] is True
     # Verify no events remain
     list_result = list_events_and_reminders("2024-01-01", "2024-01-05")
-    assert len([e for e in list_result["events"] if "Daily Standup" in e]) == 0
+    assert len([e for e in list_result["events"] if e.title == "Daily Standup"]) == 0
 
 
 def test_delete_recurring_occurrence():
@@ -85,4 +85,4 @@ def test_delete_recurring_occurrence():
     assert result["success"] is True
     # Verify only 4 events remain (5 - 1 deleted)
     list_result = list_events_and_reminders("2024-01-01", "2024-01-05")
-    assert len([e for e in list_result["events"] if "Daily Standup" in e]) == 4
+    assert len([e for e in list_result["events"] if e.title == "Daily Standup"]) == 4
@@ -0,0 +1,74 @@
+import threading
+from datetime import datetime
+
+from calendar_agent_eventkit import EventKitAgent
+
+
+class Reminder:
+    def __init__(self, title, due):
+        self.title = title
+        self.dueDate = due
+
+
+class ThreadedStore:
+    """Store whose reminder fetch completes on another thread, like EventKit."""
+
+    def __init__(self, reminders):
+        self.reminders = reminders
+        self.calls = []
+        self.fetch_started = threading.Event()
+        self.events_queried = threading.Event()
+
+    def predicateForEventsWithStartDate_endDate_calendars_(self, s, e, c):
+        return None
+
+    def eventsMatchingPredicate_(self, predicate):
+        self.calls.append("events")
+        self.events_queried.set()
+        return []
+
+    def predicateForIncompleteRemindersWithDueDateStarting_ending_calendars_(
+        self, s, e, c
+    ):
+        return (s, e)
+
+    def fetchRemindersMatchingPredicate_completion_(self, predicate, completion):
+        self.calls.append("reminders")
+        start, end = predicate
+
+        def deliver():
+            # Only completes once events were queried, so listing must overlap
+            self.events_queried.wait(timeout=5)
+            completion([r for r in self.reminders if start <= r.dueDate <= end])
+
+        threading.Thread(target=deliver).start()
+
+
+def test_reminders_fetched_concurrently_and_filtered_by_due_date():
+    agent = EventKitAgent()
+    agent.store = ThreadedStore(
+        [
+            Reminder("Pay rent", datetime(2030, 3, 1, 9)),
+            Reminder("File taxes", datetime(2030, 4, 15, 9)),
+        ]
+    )
+
+    result = agent.list_events_and_reminders("2030-03-01", "2030-03-02")
+
+    assert agent.store.calls == ["reminders", "events"]
+    assert [(r.title, r.due) for r in result["reminders"]] == [
+        ("Pay rent", datetime(2030, 3, 1, 9))
+    ]
+
+
+def test_stub_store_filters_reminders_by_due_date():
+    agent = EventKitAgent()
+    agent.store._reminders = [
+        Reminder("Today", datetime(2030, 3, 1, 17)),
+        Reminder("Undated", None),
+        Reminder("Next week", datetime(2030, 3, 8, 9)),
+    ]
+
+    result = agent.list_events_and_reminders("2030-03-01", "2030-03-01")
+
+    assert [r.title for r in result["reminders"]] == ["Today"]
@@ -0,0 +1,113 @@
+"""Tests for the persistent interpret_command response cache."""
+
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+import openai_client
+from core.conversation_manager import ConversationState
+from utils.response_cache import ResponseCache, normalize_input
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(str(tmp_path / "cache.db"), ttl_seconds=60, max_entries=3)
+
+
+def test_normalize_input():
+    assert normalize_input("  What's on TODAY? ") == "whats on today"
+    assert normalize_input("list  my\treminders!") == "list my reminders"
+
+
+def test_put_and_get_round_trip(cache):
+    result = {"action": "list_all", "details": {}}
+    cache.put("What's on today?", result, date_bucket="2025-03-01")
+
+    assert cache.get("whats on today", date_bucket="2025-03-01") == result
+    assert cache.get_stats()["hits"] == 1
+
+
+def test_key_includes_context_and_date(cache):
+    result = {"action": "list_all", "details": {}}
+    cache.put("what's on tomorrow", result, "User: hi", date_bucket="2025-03-01")
+
+    assert cache.get("what's on tomorrow", "", date_bucket="2025-03-01") is None
+    assert cache.get("what's on tomorrow", "User: hi", date_bucket="2025-03-02") is None
+    assert cache.get("what's on tomorrow", "User: hi", date_bucket="2025-03-01")
+
+
+def test_expired_entries_are_misses(cache):
+    cache.put("list all", {"action": "list_all", "details": {}}, date_bucket="d")
+    with patch("utils.response_cache.time.time", return_value=10**12):
+        assert cache.get("list all", date_bucket="d") is None
+    assert cache.get_stats()["entries"] == 0
+
+
+def test_lru_eviction(cache):
+    for i in range(3):
+        cache.put(f"cmd {i}", {"action": "list_all", "details": {"i": i}}, date_bucket="d")
+    # Touch the oldest entry so it becomes most recently used
+    assert cache.get("cmd 0", date_bucket="d")
+    cache.put("cmd 3", {"action": "list_all", "details": {}}, date_bucket="d")
+
+    assert cache.get_stats()["entries"] == 3
+    assert cache.get("cmd 0", date_bucket="d") is not None
+    assert cache.get("cmd 1", date_bucket="d") is None
+
+
+def test_interpret_command_uses_cache(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.db"))
+    mock_client = MagicMock()
+    function_call = MagicMock()
+    function_call.name = "list_reminders_only"
+    function_call.arguments = "{}"
+    mock_client.chat.completions.create.return_value.choices[
+        0
+    ].message.function_call = function_call
+
+    with patch("openai_client.client", mock_client), patch(
+        "openai_client.response_cache", cache
+    ):
+        first = openai_client.interpret_command("what do I need to do?", "")
+        second = openai_client.interpret_command("What do I need to do", "")
+
+    assert first == second == {"action": "list_reminders_only", "details": {}}
+    assert mock_client.chat.completions.create.call_count == 1
+
+
+def test_second_turn_rephrasing_hits_cache(tmp_path):
+    """Context holds only the earlier turns, so a rephrased input still hits."""
+    cache = ResponseCache(str(tmp_path / "cache.db"))
+    mock_client = MagicMock()
+    function_call = MagicMock()
+    function_call.name = "list_reminders_only"
+    function_call.arguments = "{}"
+    mock_client.chat.completions.create.return_value.choices[
+        0
+    ].message.function_call = function_call
+    state = ConversationState()
+    state.append_turn("list all", "list_all", {})
+
+    with patch("openai_client.client", mock_client), patch(
+        "openai_client.response_cache", cache
+    ):
+        first = openai_client.interpret_command(
+            "what do I need to do?", state.build_llm_context()
+        )
+        second = openai_client.interpret_command(
+            "What do I need to do", state.build_llm_context()
+        )
+
+    assert first == second == {"action": "list_reminders_only", "details": {}}
+    assert mock_client.chat.completions.create.call_count == 1
+
+
+def test_response_cache_opened_on_first_use(tmp_path, monkeypatch):
+    path = tmp_path / "cache.db"
+    monkeypatch.setenv("CALENDAR_RESPONSE_CACHE_PATH", str(path))
+    monkeypatch.setattr(openai_client, "response_cache", openai_client._LAZY)
+    assert not path.exists()
+
+    cache = openai_client._get_response_cache()
+    assert isinstance(cache, ResponseCache) and path.exists()
+    assert openai_client._get_response_cache() is cache
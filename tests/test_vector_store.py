@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from core.vector_store import VectorStore
+
+
+def test_appends_grow_in_place_and_reopen_memory_mapped(tmp_path):
+    path = str(tmp_path / "vectors.npy")
+    store = VectorStore(path, initial_capacity=2)
+
+    assert store.append([[1, 0], [0, 1]], [{"n": 0}, {"n": 1}]) == [0, 1]
+    assert store.capacity == 2
+    assert store.append([[1, 1]], [{"n": 2}]) == [2]
+    assert store.capacity == 4
+
+    reopened = VectorStore(path)
+    vectors = reopened.vectors
+    assert isinstance(vectors.base, np.memmap)
+    assert not vectors.flags.writeable
+    assert vectors.tolist() == [[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]]
+    assert reopened.metadata([2, 0]) == [{"n": 2}, {"n": 0}]
+    with pytest.raises(ValueError):
+        reopened.append([[1, 2, 3]], [{}])
+
+    reopened.delete(reopened.find("n", 1))
+    tombstoned = VectorStore(path)
+    assert (len(tombstoned), tombstoned.live_count) == (3, 2)
+    assert tombstoned.deleted_rows.tolist() == [1]
+    assert tombstoned.find("n", 1) == []
+
+
+def test_rows_without_metadata_are_reused(tmp_path):
+    path = str(tmp_path / "vectors.npy")
+    store = VectorStore(path)
+    store.append([[1.0]], [{"n": 0}])
+    # An append that wrote its vector but died before committing metadata
+    store._matrix[1] = 9.0
+    store._matrix.flush()
+
+    reopened = VectorStore(path)
+    assert len(reopened) == 1
+    assert reopened.append([[2.0]], [{"n": 1}]) == [1]
+    assert reopened.vectors.ravel().tolist() == [1.0, 2.0]
+
+    reopened.clear()
+    assert len(VectorStore(path)) == 0
+
+
+@pytest.mark.parametrize("damage", ["missing", "truncated"])
+def test_rows_without_a_vectors_file_are_dropped(tmp_path, capsys, damage):
+    path = tmp_path / "vectors.npy"
+    VectorStore(str(path)).append([[1.0, 0.0]] * 3, [{"n": n} for n in range(3)])
+    if damage == "missing":
+        path.unlink()
+    else:
+        # Header plus the first vector and half of the second
+        path.write_bytes(path.read_bytes()[:140])
+    kept = 0 if damage == "missing" else 1
+
+    reopened = VectorStore(str(path))
+    assert "Warning" in capsys.readouterr().out
+    assert len(reopened) == len(reopened.vectors) == kept
+    assert reopened.append([[0.0, 1.0]], [{"n": 3}]) == [kept]
+    assert VectorStore(str(path)).metadata([kept]) == [{"n": 3}]
@@ -0,0 +1,130 @@
+import threading
+from unittest.mock import MagicMock
+
+from calendar_agent_eventkit import EventKitAgent
+from utils.work_queue import DurableWorkQueue
+
+
+def test_jobs_run_in_order_with_metrics():
+    seen = []
+    work = DurableWorkQueue({"note": seen.append}, ":memory:")
+
+    for number in range(5):
+        work.submit("note", {"n": number})
+
+    assert work.drain(timeout=5)
+    assert seen == [{"n": n} for n in range(5)]
+    stats = work.get_stats()
+    assert (stats["depth"], stats["processed"], stats["failed"]) == (0, 5, 0)
+    assert stats["max_lag_seconds"] >= stats["average_lag_seconds"] > 0
+
+
+def test_unfinished_jobs_are_replayed_from_journal(tmp_path):
+    journal = str(tmp_path / "journal.db")
+    release = threading.Event()
+    stuck = DurableWorkQueue({"note": lambda payload: release.wait(5)}, journal)
+    stuck.submit("note", "first")
+    stuck.submit("note", "second")
+    assert stuck.get_stats()["depth"] == 2
+
+    # A new process finds both jobs in the journal and runs them
+    seen = []
+    restarted = DurableWorkQueue({"note": seen.append}, journal)
+    try:
+        assert restarted.drain(timeout=5)
+        assert seen == ["first", "second"]
+        assert restarted.get_stats()["replayed"] == 2
+    finally:
+        release.set()
+    assert stuck.drain(timeout=5)
+    assert DurableWorkQueue({"note": seen.append}, journal).replayed == 0
+
+
+def test_failed_job_is_retried_on_restart_then_dead_lettered(tmp_path):
+    journal = str(tmp_path / "journal.db")
+
+    def fail(payload):
+        raise RuntimeError("boom")
+
+    work = DurableWorkQueue({"fail": fail}, journal, max_attempts=2)
+    work.submit("fail", {"n": 1})
+    assert work.drain(timeout=5)
+    stats = work.get_stats()
+    assert stats["failed"] == stats["awaiting_retry"] == 1
+    assert stats["dead_letters"] == 0
+
+    retried = DurableWorkQueue({"fail": fail}, journal, max_attempts=2)
+    assert retried.replayed == 1
+    assert retried.drain(timeout=5)
+    assert retried.dead_letters() == [
+        {"id": 1, "kind": "fail", "payload": {"n": 1}, "attempts": 2, "error": "boom"}
+    ]
+
+    # Dead letters stay in the journal but are not run again
+    restarted = DurableWorkQueue({"fail": fail}, journal, max_attempts=2)
+    assert restarted.replayed == 0
+    assert restarted.get_stats()["dead_letters"] == 1
+
+
+def test_inline_jobs_are_tracked_separately():
+    depths = []
+    work = DurableWorkQueue(
+        {
+            "outer": lambda payload: work.submit("inner", None),
+            "inner": lambda payload: depths.append(work.get_stats()["depth"]),
+        },
+        workers=0,
+    )
+
+    work.submit("outer", None)
+
+    # The inner job ran while the outer one was still outstanding
+    assert depths == [2]
+    assert work.get_stats()["depth"] == 0
+    assert work.drain(timeout=0)
+
+
+def test_create_event_returns_before_memory_update():
+    agent = EventKitAgent()
+    agent.post_commit = DurableWorkQueue(agent.post_commit.handlers, ":memory:")
+    agent.narrative_memory = None
+    agent.core_memory = MagicMock()
+    release = threading.Event()
+    agent.core_memory.add_past_event.side_effect = lambda data: release.wait(5)
+
+    result = agent.create_event(
+        {"title": "Lunch", "date": "2030-06-03", "time": "12:00", "duration": 60}
+    )
+
+    assert result["success"]
+    assert agent.get_stats()["post_commit"]["depth"] == 1
+    release.set()
+    assert agent.post_commit.drain(timeout=5)
+    assert agent.core_memory.add_past_event.call_args[0][0]["title"] == "Lunch"
+
+
+def test_memory_reads_wait_for_background_update():
+    agent = EventKitAgent()
+    agent.post_commit = DurableWorkQueue(agent.post_commit.handlers, ":memory:")
+    agent.narrative_memory = None
+    agent.nudger = None
+    agent.core_memory = MagicMock()
+    started, release = threading.Event(), threading.Event()
+    agent.core_memory.add_past_event.side_effect = lambda data: (
+        started.set(),
+        release.wait(5),
+    )
+    agent.create_event(
+        {"title": "Lunch", "date": "2030-06-03", "time": "12:00", "duration": 60}
+    )
+    assert started.wait(5)
+
+    reader = threading.Thread(target=agent.get_stats)
+    reader.start()
+    reader.join(timeout=0.2)
+    # Core memory is mid-update on the worker; the reader waits its turn
+    assert reader.is_alive()
+    release.set()
+    reader.join(timeout=5)
+    assert not reader.is_alive()
+    assert agent.post_commit.drain(timeout=5)
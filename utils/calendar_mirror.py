@@ -0,0 +1,346 @@
+"""Local SQLite mirror of calendar events and reminders.
+
+The mirror keeps an indexed copy of the store's events and reminders for
+each date window that has been synced. A sync diffs the items fetched from
+EventKit against the mirrored rows (by key, fields and modification
+timestamp) and writes only the rows that changed. Reads for a window that
+is still fresh are then served from SQLite without touching EventKit; a
+window stays fresh until mark_stale() is called, when the store reports a
+change.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from core.types import EventRecord, ReminderRecord
+
+EVENT = "event"
+REMINDER = "reminder"
+
+
+def _ts(value: Optional[datetime]) -> Optional[float]:
+    return value.timestamp() if value is not None else None
+
+
+def _dt(value: Optional[float]) -> Optional[datetime]:
+    return datetime.fromtimestamp(value) if value is not None else None
+
+
+class CalendarMirror:
+    """SQLite mirror of events and reminders, synced per date window."""
+
+    def __init__(self, db_path: str = "core/calendar_mirror.db"):
+        """
+        Initialize the mirror.
+
+        Args:
+            db_path: Path to the SQLite database file (":memory:" for a
+                mirror that lives only as long as this object)
+        """
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory and db_path != ":memory:":
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.reads = 0
+        self.syncs = 0
+        self.rows_written = 0
+        self.rows_deleted = 0
+        self._create_tables()
+        row = self._conn.execute(
+            "SELECT value FROM meta WHERE name = 'longest_event'"
+        ).fetchone()
+        self._longest_event = row[0] if row else 0.0
+
+    def _create_tables(self):
+        """Create the mirror tables if they don't exist."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS events (
+                    item_key TEXT PRIMARY KEY,
+                    item_id TEXT,
+                    title TEXT NOT NULL,
+                    start REAL NOT NULL,
+                    end REAL NOT NULL,
+                    calendar TEXT,
+                    modified REAL
+                )
+            """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_events_start ON events (start)"
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS reminders (
+                    item_key TEXT PRIMARY KEY,
+                    item_id TEXT,
+                    title TEXT NOT NULL,
+                    due REAL,
+                    calendar TEXT,
+                    modified REAL
+                )
+            """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_reminders_due ON reminders (due)"
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS synced_windows (
+                    kind TEXT NOT NULL,
+                    start REAL NOT NULL,
+                    end REAL NOT NULL,
+                    synced_at REAL NOT NULL
+                )
+            """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS meta (
+                    name TEXT PRIMARY KEY,
+                    value REAL NOT NULL
+                )
+            """
+            )
+
+    def is_fresh(
+        self,
+        kind: str,
+        start: datetime,
+        end: datetime,
+        max_age: Optional[float] = None,
+    ) -> bool:
+        """
+        Return True if [start, end] was synced since the mirror was last marked
+        stale (and, if max_age is given, less than max_age seconds ago).
+        """
+        synced_after = -1.0 if max_age is None else time.time() - max_age
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM synced_windows "
+                "WHERE kind = ? AND start <= ? AND end >= ? AND synced_at >= ? "
+                "LIMIT 1",
+                (kind, start.timestamp(), end.timestamp(), synced_after),
+            ).fetchone()
+        return row is not None
+
+    def events_overlapping(
+        self, start: datetime, end: datetime
+    ) -> List[Tuple[str, EventRecord]]:
+        """Return (key, record) for mirrored events overlapping [start, end]."""
+        start_ts, end_ts = start.timestamp(), end.timestamp()
+        with self._lock:
+            # Bounding start by the longest event lets SQLite use the start index
+            rows = self._conn.execute(
+                "SELECT item_key, title, start, end, calendar, item_id FROM events "
+                "WHERE start BETWEEN ? AND ? AND end >= ? ORDER BY start",
+                (start_ts - self._longest_event, end_ts, start_ts),
+            ).fetchall()
+        self.reads += 1
+        return [
+            (key, EventRecord(title, _dt(s), _dt(e), calendar, item_id))
+            for key, title, s, e, calendar, item_id in rows
+        ]
+
+    def reminders_due(self, start: datetime, end: datetime) -> List[ReminderRecord]:
+        """Return mirrored reminders due in [start, end], by due date."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT title, due, calendar, item_id FROM reminders "
+                "WHERE due BETWEEN ? AND ? ORDER BY due",
+                (start.timestamp(), end.timestamp()),
+            ).fetchall()
+        self.reads += 1
+        return [
+            ReminderRecord(title, _dt(due), calendar, item_id)
+            for title, due, calendar, item_id in rows
+        ]
+
+    def sync_events(
+        self,
+        start: datetime,
+        end: datetime,
+        items: Iterable[Tuple[str, EventRecord, Optional[datetime]]],
+    ) -> Dict[str, int]:
+        """
+        Reconcile mirrored events overlapping [start, end] with the store.
+
+        Args:
+            start: Window start
+            end: Window end
+            items: (key, record, last modified) for every event the store
+                returned for the window
+
+        Returns:
+            Counts of added, updated and removed rows
+        """
+        fetched = {
+            key: (
+                record.id,
+                record.title,
+                record.start.timestamp(),
+                record.end.timestamp(),
+                record.calendar,
+                _ts(modified),
+            )
+            for key, record, modified in items
+        }
+        start_ts, end_ts = start.timestamp(), end.timestamp()
+        with self._lock, self._conn:
+            # Bounded by the longest event, as in events_overlapping
+            existing = {
+                row[0]: row[1:]
+                for row in self._conn.execute(
+                    "SELECT item_key, item_id, title, start, end, calendar, modified "
+                    "FROM events WHERE start BETWEEN ? AND ? AND end >= ?",
+                    (start_ts - self._longest_event, end_ts, start_ts),
+                )
+            }
+            return self._apply(EVENT, start_ts, end_ts, existing, fetched)
+
+    def sync_reminders(
+        self,
+        start: datetime,
+        end: datetime,
+        items: Iterable[Tuple[str, ReminderRecord, Optional[datetime]]],
+    ) -> Dict[str, int]:
+        """Reconcile mirrored reminders due in [start, end] with the store."""
+        fetched = {
+            key: (
+                record.id,
+                record.title,
+                _ts(record.due),
+                record.calendar,
+                _ts(modified),
+            )
+            for key, record, modified in items
+        }
+        start_ts, end_ts = start.timestamp(), end.timestamp()
+        with self._lock, self._conn:
+            existing = {
+                row[0]: row[1:]
+                for row in self._conn.execute(
+                    "SELECT item_key, item_id, title, due, calendar, modified "
+                    "FROM reminders WHERE due BETWEEN ? AND ?",
+                    (start_ts, end_ts),
+                )
+            }
+            return self._apply(REMINDER, start_ts, end_ts, existing, fetched)
+
+    def put_event(
+        self, key: str, record: EventRecord, modified: Optional[datetime] = None
+    ) -> None:
+        """Write one event (e.g. after the agent saved it)."""
+        with self._lock, self._conn:
+            self._upsert(
+                EVENT,
+                {
+                    key: (
+                        record.id,
+                        record.title,
+                        record.start.timestamp(),
+                        record.end.timestamp(),
+                        record.calendar,
+                        _ts(modified),
+                    )
+                },
+            )
+
+    def delete_events(self, keys: Iterable[str]) -> None:
+        """Remove events by key (e.g. after the agent removed them)."""
+        keys = list(keys)
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM events WHERE item_key = ?", [(k,) for k in keys]
+            )
+        self.rows_deleted += len(keys)
+
+    def mark_stale(self) -> None:
+        """Forget sync times so every window is diffed against the store again."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM synced_windows")
+
+    def clear(self) -> None:
+        """Drop all mirrored data."""
+        with self._lock, self._conn:
+            for table in ("events", "reminders", "synced_windows"):
+                self._conn.execute(f"DELETE FROM {table}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get mirror statistics."""
+        with self._lock:
+            (events,) = self._conn.execute("SELECT COUNT(*) FROM events").fetchone()
+            (reminders,) = self._conn.execute(
+                "SELECT COUNT(*) FROM reminders"
+            ).fetchone()
+        return {
+            "events": events,
+            "reminders": reminders,
+            "reads": self.reads,
+            "syncs": self.syncs,
+            "rows_written": self.rows_written,
+            "rows_deleted": self.rows_deleted,
+            "database_path": self.db_path,
+        }
+
+    def _apply(self, kind, start_ts, end_ts, existing, fetched) -> Dict[str, int]:
+        """Write the delta between existing and fetched rows (lock held)."""
+        changed = {
+            key: row for key, row in fetched.items() if existing.get(key) != row
+        }
+        removed = [key for key in existing if key not in fetched]
+        self._upsert(kind, changed)
+        table = "events" if kind == EVENT else "reminders"
+        self._conn.executemany(
+            f"DELETE FROM {table} WHERE item_key = ?", [(k,) for k in removed]
+        )
+        # Windows inside this one are superseded by it
+        self._conn.execute(
+            "DELETE FROM synced_windows WHERE kind = ? AND start >= ? AND end <= ?",
+            (kind, start_ts, end_ts),
+        )
+        self._conn.execute(
+            "INSERT INTO synced_windows (kind, start, end, synced_at) "
+            "VALUES (?, ?, ?, ?)",
+            (kind, start_ts, end_ts, time.time()),
+        )
+        self.syncs += 1
+        self.rows_deleted += len(removed)
+        added = sum(1 for key in changed if key not in existing)
+        return {
+            "added": added,
+            "updated": len(changed) - added,
+            "removed": len(removed),
+        }
+
+    def _upsert(self, kind, rows) -> None:
+        if kind == EVENT:
+            sql = (
+                "INSERT OR REPLACE INTO events "
+                "(item_key, item_id, title, start, end, calendar, modified) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)"
+            )
+        else:
+            sql = (
+                "INSERT OR REPLACE INTO reminders "
+                "(item_key, item_id, title, due, calendar, modified) "
+                "VALUES (?, ?, ?, ?, ?, ?)"
+            )
+        self._conn.executemany(sql, [(key, *row) for key, row in rows.items()])
+        self.rows_written += len(rows)
+        if kind == EVENT and rows:
+            longest = max(row[3] - row[2] for row in rows.values())
+            if longest > self._longest_event:
+                self._longest_event = longest
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO meta (name, value) "
+                    "VALUES ('longest_event', ?)",
+                    (longest,),
+                )
@@ -0,0 +1,185 @@
+"""Circuit breaker for the upstream LLM client."""
+
+import threading
+import time
+from collections import deque
+from enum import Enum
+from typing import Any, Callable, Dict, Optional
+
+
+class BreakerState(Enum):
+    """States of the circuit breaker."""
+
+    CLOSED = "closed"  # upstream healthy, requests go through
+    OPEN = "open"  # upstream unhealthy, requests are short-circuited
+    HALF_OPEN = "half_open"  # one trial request decides whether to close
+
+
+class CircuitBreaker:
+    """
+    Tracks recent call outcomes and latency and trips when the upstream is unhealthy.
+
+    The breaker trips when, over the last window_size calls (and at least
+    min_calls), the failure rate or the rate of slow calls reaches its
+    threshold. While open, callers should degrade to a local fallback. After
+    cooldown_seconds the breaker checks for recovery: with a probe callable it
+    runs the probe on a background thread and closes on success; without one
+    it lets a single trial request through.
+    """
+
+    def __init__(
+        self,
+        window_size: int = 20,
+        min_calls: int = 5,
+        failure_rate_threshold: float = 0.5,
+        slow_call_seconds: float = 10.0,
+        slow_call_rate_threshold: float = 0.5,
+        cooldown_seconds: float = 30.0,
+        probe: Optional[Callable[[], Any]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            window_size: Number of recent calls considered
+            min_calls: Minimum calls in the window before the breaker can trip
+            failure_rate_threshold: Failure rate (0.0 to 1.0) that trips the breaker
+            slow_call_seconds: Latency at or above which a call counts as slow
+            slow_call_rate_threshold: Slow-call rate (0.0 to 1.0) that trips the breaker
+            cooldown_seconds: How long to stay open before checking for recovery
+            probe: Optional health check; raising means still unhealthy
+            clock: Time source (monotonic seconds)
+        """
+        self.window_size = window_size
+        self.min_calls = min_calls
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.probe = probe
+        self.clock = clock
+
+        self.state = BreakerState.CLOSED
+        self.trips = 0
+        self.short_circuited = 0
+        self._calls = deque(maxlen=window_size)  # (ok, latency)
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._probe_thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """Return True if a request may go upstream, False to use the fallback."""
+        with self._lock:
+            if self.state == BreakerState.CLOSED:
+                return True
+            if self.state == BreakerState.HALF_OPEN:
+                if not self._trial_in_flight:
+                    self._trial_in_flight = True
+                    return True
+                self.short_circuited += 1
+                return False
+
+            # Open: wait out the cooldown, then check for recovery
+            if self.clock() - self._opened_at >= self.cooldown_seconds:
+                if self.probe is not None:
+                    self._start_probe()
+                else:
+                    self.state = BreakerState.HALF_OPEN
+                    self._trial_in_flight = True
+                    return True
+            self.short_circuited += 1
+            return False
+
+    def record_success(self, latency: float) -> None:
+        """Record a successful upstream call and its latency in seconds."""
+        with self._lock:
+            if self.state == BreakerState.HALF_OPEN:
+                self._close()
+                return
+            self._calls.append((True, latency))
+            self._maybe_trip()
+
+    def record_failure(self, latency: Optional[float] = None) -> None:
+        """Record a failed upstream call (error or timeout)."""
+        with self._lock:
+            if self.state == BreakerState.HALF_OPEN:
+                self._trip()
+                return
+            self._calls.append((False, latency or 0.0))
+            self._maybe_trip()
+
+    def _rates(self):
+        """Return (failure rate, slow-call rate) over the window."""
+        total = len(self._calls)
+        if not total:
+            return 0.0, 0.0
+        failures = sum(1 for ok, _ in self._calls if not ok)
+        slow = sum(1 for _, latency in self._calls if latency >= self.slow_call_seconds)
+        return failures / total, slow / total
+
+    def _maybe_trip(self) -> None:
+        """Trip the breaker if the window shows an unhealthy upstream."""
+        if self.state != BreakerState.CLOSED or len(self._calls) < self.min_calls:
+            return
+        failure_rate, slow_rate = self._rates()
+        if (
+            failure_rate >= self.failure_rate_threshold
+            or slow_rate >= self.slow_call_rate_threshold
+        ):
+            self._trip()
+
+    def _trip(self) -> None:
+        self.state = BreakerState.OPEN
+        self._opened_at = self.clock()
+        self._trial_in_flight = False
+        self.trips += 1
+
+    def _close(self) -> None:
+        self.state = BreakerState.CLOSED
+        self._calls.clear()
+        self._trial_in_flight = False
+
+    def _start_probe(self) -> None:
+        """Run the health probe on a background thread unless one is running."""
+        if self._probe_thread is not None and self._probe_thread.is_alive():
+            return
+        self._probe_thread = threading.Thread(
+            target=self._run_probe, name="llm-breaker-probe", daemon=True
+        )
+        self._probe_thread.start()
+
+    def _run_probe(self) -> None:
+        try:
+            self.probe()
+        except Exception:
+            with self._lock:
+                # Still unhealthy; start a new cooldown
+                self._opened_at = self.clock()
+            return
+        with self._lock:
+            if self.state == BreakerState.OPEN:
+                self._close()
+
+    def reset(self) -> None:
+        """Close the breaker and forget recorded calls."""
+        with self._lock:
+            self._close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get breaker state and health statistics."""
+        with self._lock:
+            failure_rate, slow_rate = self._rates()
+            latencies = [latency for ok, latency in self._calls if ok]
+            return {
+                "state": self.state.value,
+                "calls_in_window": len(self._calls),
+                "failure_rate": failure_rate,
+                "slow_call_rate": slow_rate,
+                "average_latency": (
+                    sum(latencies) / len(latencies) if latencies else 0.0
+                ),
+                "trips": self.trips,
+                "short_circuited": self.short_circuited,
+            }
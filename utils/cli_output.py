@@ -1,15 +1,42 @@
 """CLI output formatting helpers for the calendar assistant."""
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Union
 from datetime import datetime
 
+from core.types import EventRecord, ReminderRecord
 
-def format_events(events: List[Dict[str, Any]]) -> str:
+
+def _event_fields(event: Union[EventRecord, Dict[str, Any], str]) -> Tuple[Any, ...]:
+    """Return (title, start, end) from an EventRecord, dict or "title | date" string."""
+    if isinstance(event, EventRecord):
+        return event.title, event.start, event.end
+    if isinstance(event, dict):
+        return (
+            event.get("title", "Untitled Event"),
+            event.get("start_date"),
+            event.get("end_date"),
+        )
+    title, _, start = str(event).partition(" | ")
+    return title, start or None, None
+
+
+def _reminder_fields(reminder: Union[ReminderRecord, Dict[str, Any], str]):
+    """Return (title, due) from a ReminderRecord, dict or "title | date" string."""
+    if isinstance(reminder, ReminderRecord):
+        return reminder.title, reminder.due
+    if isinstance(reminder, dict):
+        return reminder.get("title", "Untitled Reminder"), reminder.get("due_date")
+    title, _, due = str(reminder).partition(" | ")
+    return title, due or None
+
+
+def format_events(events: List[Union[EventRecord, Dict[str, Any]]]) -> str:
     """
     Format a list of calendar events for display.
 
     Args:
-        events: List of event dictionaries with keys like 'title', 'start_date', 'end_date', etc.
+        events: EventRecords (as returned by the calendar agent) or event
+            dictionaries with keys like 'title', 'start_date', 'end_date', etc.
 
     Returns:
         Formatted string representation of events
@@ -24,9 +51,7 @@ def format_events(events: List[Dict[str, Any]]) -> str:
 
     formatted_events = []
     for event in events:
-        title = event.get("title", "Untitled Event")
-        start_date = event.get("start_date")
-        end_date = event.get("end_date")
+        title, start_date, end_date = _event_fields(event)
 
         # Format time
         time_str = ""
@@ -63,12 +88,13 @@ def format_events(events: List[Dict[str, Any]]) -> str:
     return "\n".join(formatted_events)
 
 
-def format_reminders(reminders: List[Dict[str, Any]]) -> str:
+def format_reminders(reminders: List[Union[ReminderRecord, Dict[str, Any]]]) -> str:
     """
     Format a list of reminders/tasks for display.
 
     Args:
-        reminders: List of reminder dictionaries with keys like 'title', 'due_date', etc.
+        reminders: ReminderRecords (as returned by the calendar agent) or
+            reminder dictionaries with keys like 'title', 'due_date', etc.
 
     Returns:
         Formatted string representation of reminders
@@ -83,8 +109,7 @@ def format_reminders(reminders: List[Dict[str, Any]]) -> str:
 
     formatted_reminders = []
     for reminder in reminders:
-        title = reminder.get("title", "Untitled Reminder")
-        due_date = reminder.get("due_date")
+        title, due_date = _reminder_fields(reminder)
 
         # Format due date
         due_str = ""
@@ -103,15 +128,39 @@ def format_reminders(reminders: List[Dict[str, Any]]) -> str:
     return "\n".join(formatted_reminders)
 
 
+def format_free_slots(slots: List[Tuple[datetime, datetime]]) -> str:
+    """
+    Format free time slots for display.
+
+    Args:
+        slots: (start, end) datetimes, as returned by find_free_slots
+
+    Returns:
+        Formatted string representation of the slots
+
+    Example:
+        >>> slot = (datetime(2024, 1, 15, 9), datetime(2024, 1, 15, 9, 30))
+        >>> format_free_slots([slot])
+        '🟢 Mon Jan 15 09:00 AM - 09:30 AM'
+    """
+    if not slots:
+        return "🟢 No free slots found"
+    return "\n".join(
+        f"🟢 {start.strftime('%a %b %d %I:%M %p')} - {end.strftime('%I:%M %p')}"
+        for start, end in slots
+    )
+
+
 def print_events_and_reminders(
-    events: List[Dict[str, Any]], reminders: List[Dict[str, Any]]
+    events: List[Union[EventRecord, Dict[str, Any]]],
+    reminders: List[Union[ReminderRecord, Dict[str, Any]]],
 ) -> None:
     """
     Print formatted events and reminders to the console.
 
     Args:
-        events: List of event dictionaries
-        reminders: List of reminder dictionaries
+        events: EventRecords or event dictionaries
+        reminders: ReminderRecords or reminder dictionaries
 
     Example:
         >>> events = [{'title': 'Team Meeting', 'start_date': '2024-01-15 10:00:00'}]
@@ -1,27 +1,95 @@
 """Command dispatcher for main loop actions."""
 
 import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from calendar_agent_eventkit import (
     list_events_and_reminders,
     create_event,
     delete_event,
     move_event,
     add_notification,
+    find_free_slots,
 )
 from utils.cli_output import (
     format_events,
+    format_free_slots,
     format_reminders,
     print_events_and_reminders,
     format_error_message,
     format_success_message,
 )
+from utils.date_utils import parse_date_string
+
+LIST_ACTIONS = {
+    "list_todays_events",
+    "list_all",
+    "list_events_only",
+    "list_reminders_only",
+}
+
+# Listings started by prepare() while the LLM is still streaming arguments,
+# keyed by the resolved (start_date, end_date) range
+_prefetch_executor = ThreadPoolExecutor(max_workers=1)
+_prefetched = {}
+
+
+def _resolve_range(start_date, end_date):
+    """Resolve a listing range the way list_events_and_reminders does, or None."""
+    try:
+        start = (
+            parse_date_string(start_date)
+            if start_date
+            else datetime.now().strftime("%Y-%m-%d")
+        )
+        end = parse_date_string(end_date) if end_date else start
+    except ValueError:
+        return None
+    return (start, end)
+
+
+def _discard_prefetched():
+    """Drop unused prefetches, cancelling those that have not started."""
+    for future in _prefetched.values():
+        future.cancel()
+    _prefetched.clear()
+
+
+def prepare(action: str) -> None:
+    """
+    Start preparing the handler for an action before its details are known.
+
+    Called with the action name as soon as it is known. For list actions this
+    prefetches today's events and reminders (the range used when no dates are
+    given) in the background, and the list handler reuses the result if the
+    final details ask for the same range.
+    """
+    _discard_prefetched()
+    if action in LIST_ACTIONS:
+        key = _resolve_range(None, None)
+        _prefetched[key] = _prefetch_executor.submit(
+            list_events_and_reminders, None, None
+        )
+
+
+def _fetch_listing(details):
+    """Return the listing for details, reusing a matching prefetch if any."""
+    start_date, end_date = details.get("start_date"), details.get("end_date")
+    key = _resolve_range(start_date, end_date)
+    future = _prefetched.pop(key, None) if key else None
+    # A prefetch for another range will not be used
+    _discard_prefetched()
+    if future is not None:
+        try:
+            return future.result()
+        except Exception:
+            pass
+    return list_events_and_reminders(start_date, end_date)
 
 
 def handle_list_todays_events(details):
     """Handle listing today's events and reminders."""
-    result = list_events_and_reminders(
-        details.get("start_date"), details.get("end_date")
-    )
+    result = _fetch_listing(details)
     if result.get("error"):
         print(format_error_message(result["error"]))
         return
@@ -35,9 +103,7 @@ def handle_list_all(details):
 
 def handle_list_events_only(details):
     """Handle listing only events."""
-    result = list_events_and_reminders(
-        details.get("start_date"), details.get("end_date")
-    )
+    result = _fetch_listing(details)
     if result.get("error"):
         print(format_error_message(result["error"]))
         return
@@ -46,9 +112,7 @@ def handle_list_events_only(details):
 
 def handle_list_reminders_only(details):
     """Handle listing only reminders."""
-    result = list_events_and_reminders(
-        details.get("start_date"), details.get("end_date")
-    )
+    result = _fetch_listing(details)
     if result.get("error"):
         print(format_error_message(result["error"]))
         return
@@ -78,6 +142,8 @@ def handle_create_event(details):
     result = create_event(details)
     if result.get("success"):
         print(format_success_message(result.get("message")))
+        if result.get("conflicts"):
+            print(f"⚠️  Overlaps with: {', '.join(result['conflicts'])}")
     else:
         print(format_error_message(result.get("error")))
 
@@ -109,6 +175,15 @@ def handle_add_notification(details):
         print(format_error_message(result.get("error")))
 
 
+def handle_find_free_slots(details):
+    """Handle finding free time slots."""
+    result = find_free_slots(details)
+    if result.get("success"):
+        print(format_free_slots(result["slots"]))
+    else:
+        print(format_error_message(result.get("error")))
+
+
 # Map actions to handlers
 HANDLERS = {
     "list_todays_events": handle_list_todays_events,
@@ -119,6 +194,7 @@ HANDLERS = {
     "delete_event": handle_delete_event,
     "move_event": handle_move_event,
     "add_notification": handle_add_notification,
+    "find_free_slots": handle_find_free_slots,
 }
 
 
@@ -2,10 +2,57 @@ import re
 from utils.date_utils import parse_date_string
 from typing import Optional, Dict, Any
 
+# Precompiled patterns shared by the explicit parsers and the fast path
+_TIME_PATTERN = r"\d{1,2}(?::\d{2})?\s*(?:am|pm)?"
+_LIST_RANGE_RE = re.compile(r"list events from\s+(\S+)\s+to\s+(\S+)", re.IGNORECASE)
+_SCHEDULE_RE = re.compile(
+    rf"schedule\s+(.+?)\s+on\s+(\S+)\s+at\s+({_TIME_PATTERN})\s+for\s*(\d+)\s*minutes",
+    re.IGNORECASE,
+)
+_SCHEDULE_NO_DURATION_RE = re.compile(
+    rf"schedule\s+(.+?)\s+on\s+(\S+)\s+at\s+({_TIME_PATTERN})", re.IGNORECASE
+)
+_DELETE_RE = re.compile(r"delete\s+(.+?)\s+on\s+(\S+)", re.IGNORECASE)
+_MOVE_RE = re.compile(
+    rf"move\s+(.+?)\s+on\s+(\S+)\s+to\s+(\S+)\s+at\s+({_TIME_PATTERN})",
+    re.IGNORECASE,
+)
+_ADD_NOTIFICATION_RE = re.compile(
+    r"add\s+notification\s+to\s+(.+?)\s+on\s+(\S+)\s+(\d+)\s+minutes?\s+before",
+    re.IGNORECASE,
+)
+_SINGLE_DATE_LIST_RE = re.compile(
+    r"(?:list\s+(?:my\s+)?)?events?\s+(?:for|on)\s+(\S+)", re.IGNORECASE
+)
+_LIST_EVENTS_RE = re.compile(r"list\s+(?:my\s+)?events", re.IGNORECASE)
+_LIST_REMINDERS_RE = re.compile(r"list\s+(?:my\s+)?(?:reminders|tasks)", re.IGNORECASE)
+_LIST_ALL_RE = re.compile(
+    r"list\s+(?:all|everything|events and reminders)", re.IGNORECASE
+)
+
+# Titles that only make sense with conversation context; never fast-path these
+_REFERENCE_TITLES = {"it", "that", "this", "them", "that meeting", "the meeting"}
+
+
+def _normalize_time(time_raw: str) -> str:
+    """Normalize a '2pm' / '14:30' style time to HH:MM."""
+    tm = re.match(r"(\d{1,2})(?::(\d{2}))?\s*(am|pm)?", time_raw, re.IGNORECASE)
+    if not tm:
+        return time_raw
+    hour = int(tm.group(1))
+    minute = int(tm.group(2) or 0)
+    ampm = tm.group(3).lower() if tm.group(3) else None
+    if ampm:
+        if ampm == "pm" and hour < 12:
+            hour += 12
+        if ampm == "am" and hour == 12:
+            hour = 0
+    return f"{hour:02d}:{minute:02d}"
+
 
 def parse_list_range(cmd: str) -> Optional[Dict[str, Any]]:
     """Parse 'list events from START to END' and return {'start_date': str, 'end_date': str} or None."""
-    m = re.search(r"list events from\s+(\S+)\s+to\s+(\S+)", cmd, re.IGNORECASE)
+    m = _LIST_RANGE_RE.search(cmd)
     if m:
         return {
             "start_date": parse_date_string(m.group(1)),
@@ -16,11 +63,7 @@ def parse_list_range(cmd: str) -> Optional[Dict[str, Any]]:
 
 def parse_schedule_event(cmd: str) -> Optional[Dict[str, Any]]:
     """Parse 'schedule TITLE on DATE at TIME for DURATION minutes' into event creation details or None."""
-    m = re.match(
-        r"schedule\s+(.+?)\s+on\s+(\S+)\s+at\s+(\d{1,2}(?::\d{2})?\s*(?:am|pm)?)\s+for\s*(\d+)\s*minutes",
-        cmd,
-        re.IGNORECASE,
-    )
+    m = _SCHEDULE_RE.match(cmd)
     if m:
         title, date_raw, time_raw, duration = (
             m.group(1),
@@ -28,33 +71,33 @@ def parse_schedule_event(cmd: str) -> Optional[Dict[str, Any]]:
             m.group(3),
             m.group(4),
         )
-        date = parse_date_string(date_raw)
-        # Normalize time to HH:MM
-        tm = re.match(r"(\d{1,2})(?::(\d{2}))?\s*(am|pm)?", time_raw, re.IGNORECASE)
-        if tm:
-            hour = int(tm.group(1))
-            minute = int(tm.group(2) or 0)
-            ampm = tm.group(3).lower() if tm.group(3) else None
-            if ampm:
-                if ampm == "pm" and hour < 12:
-                    hour += 12
-                if ampm == "am" and hour == 12:
-                    hour = 0
-            time_str = f"{hour:02d}:{minute:02d}"
-        else:
-            time_str = time_raw
         return {
             "title": title.strip(),
-            "date": date,
-            "time": time_str,
+            "date": parse_date_string(date_raw),
+            "time": _normalize_time(time_raw),
             "duration": int(duration),
         }
     return None
 
 
+def parse_schedule_event_without_duration(cmd: str) -> Optional[Dict[str, Any]]:
+    """Parse 'schedule TITLE on DATE at TIME' into event creation details or None.
+
+    Duration is left out so the create handler can prompt for it.
+    """
+    m = _SCHEDULE_NO_DURATION_RE.match(cmd)
+    if m:
+        return {
+            "title": m.group(1).strip(),
+            "date": parse_date_string(m.group(2)),
+            "time": _normalize_time(m.group(3)),
+        }
+    return None
+
+
 def parse_delete_event(cmd: str) -> Optional[Dict[str, Any]]:
     """Parse 'delete TITLE on DATE' into deletion details or None."""
-    m = re.match(r"delete\s+(.+?)\s+on\s+(\S+)", cmd, re.IGNORECASE)
+    m = _DELETE_RE.match(cmd)
     if m:
         title, date_raw = m.group(1).strip(), m.group(2)
         date = parse_date_string(date_raw)
@@ -64,11 +107,7 @@ def parse_delete_event(cmd: str) -> Optional[Dict[str, Any]]:
 
 def parse_move_event(cmd: str) -> Optional[Dict[str, Any]]:
     """Parse 'move TITLE on OLD_DATE to NEW_DATE at NEW_TIME' into move details or None."""
-    m = re.match(
-        r"move\s+(.+?)\s+on\s+(\S+)\s+to\s+(\S+)\s+at\s+(\d{1,2}(?::\d{2})?\s*(?:am|pm)?)",
-        cmd,
-        re.IGNORECASE,
-    )
+    m = _MOVE_RE.match(cmd)
     if m:
         title, old_raw, new_raw, time_raw = (
             m.group(1).strip(),
@@ -76,37 +115,18 @@ def parse_move_event(cmd: str) -> Optional[Dict[str, Any]]:
             m.group(3),
             m.group(4),
         )
-        old_date = parse_date_string(old_raw)
-        new_date = parse_date_string(new_raw)
-        tm = re.match(r"(\d{1,2})(?::(\d{2}))?\s*(am|pm)?", time_raw, re.IGNORECASE)
-        if tm:
-            hour = int(tm.group(1))
-            minute = int(tm.group(2) or 0)
-            ampm = tm.group(3).lower() if tm.group(3) else None
-            if ampm:
-                if ampm == "pm" and hour < 12:
-                    hour += 12
-                if ampm == "am" and hour == 12:
-                    hour = 0
-            new_time = f"{hour:02d}:{minute:02d}"
-        else:
-            new_time = time_raw
         return {
             "title": title,
-            "old_date": old_date,
-            "new_date": new_date,
-            "new_time": new_time,
+            "old_date": parse_date_string(old_raw),
+            "new_date": parse_date_string(new_raw),
+            "new_time": _normalize_time(time_raw),
         }
     return None
 
 
 def parse_add_notification(cmd: str) -> Optional[Dict[str, Any]]:
     """Parse 'add notification to TITLE on DATE MIN minutes before' into reminder details or None."""
-    m = re.match(
-        r"add\s+notification\s+to\s+(.+?)\s+on\s+(\S+)\s+(\d+)\s+minutes?\s+before",
-        cmd,
-        re.IGNORECASE,
-    )
+    m = _ADD_NOTIFICATION_RE.match(cmd)
     if m:
         title, date_raw, minutes = m.group(1).strip(), m.group(2), int(m.group(3))
         date = parse_date_string(date_raw)
@@ -116,7 +136,7 @@ def parse_add_notification(cmd: str) -> Optional[Dict[str, Any]]:
 
 def parse_single_date_list(cmd: str) -> Optional[Dict[str, Any]]:
     """Parse 'events for/on DATE' into a single-date list query or None."""
-    m = re.search(r"events?\s+(?:for|on)\s+(\S+)", cmd, re.IGNORECASE)
+    m = _SINGLE_DATE_LIST_RE.search(cmd)
     if m:
         date = parse_date_string(m.group(1))
         return {"start_date": date, "end_date": date}
@@ -141,18 +161,105 @@ def parse_command(cmd: str):
         if details:
             return {"action": action, "details": details}
     # Generic verb-based fallback
-    lower = cmd.lower()
-    if any(k in lower for k in ("delete", "cancel", "remove")):
-        return {"action": "delete_event", "details": {}}
-    if any(k in lower for k in ("move", "reschedule", "shift")):
-        return {"action": "move_event", "details": {}}
-    if any(k in lower for k in ("schedule", "create", "add", "book")):
-        return {"action": "create_event", "details": {}}
-    if "reminder" in lower or "task" in lower:
-        return {"action": "list_reminders_only", "details": {}}
-    if "event" in lower:
-        return {"action": "list_events_only", "details": {}}
-    if "today" in lower or "on" in lower:
-        return {"action": "list_all", "details": {}}
-    # Unknown command
-    return {"action": "unknown", "details": {}}
+    return {"action": classify_intent(cmd), "details": {}}
+
+
+# Whole words suggesting an action, checked in order by classify_intent
+_WORD_RE = re.compile(r"[a-z]+")
+_INTENT_KEYWORDS = [
+    ({"delete", "cancel", "remove"}, "delete_event"),
+    ({"move", "reschedule", "shift"}, "move_event"),
+    ({"schedule", "create", "add", "book"}, "create_event"),
+    ({"reminder", "reminders", "task", "tasks"}, "list_reminders_only"),
+    ({"event", "events"}, "list_events_only"),
+    ({"today", "on"}, "list_all"),
+]
+
+
+def classify_intent(cmd: str) -> str:
+    """
+    Guess the action of a command from its keywords alone.
+
+    Used as the last resort when no explicit parser matches; the action comes
+    without details. Returns 'unknown' when no keyword applies.
+    """
+    words = set(_WORD_RE.findall(cmd.lower()))
+    for keywords, action in _INTENT_KEYWORDS:
+        if words & keywords:
+            return action
+    return "unknown"
+
+
+# Fast-path rules: (pattern, parser, action, base confidence). Order matters;
+# more specific patterns come first so e.g. a schedule with a duration wins
+# over the duration-less variant.
+_FAST_PATH_RULES = [
+    (_LIST_RANGE_RE, parse_list_range, "list_events_only", 0.95),
+    (_SCHEDULE_RE, parse_schedule_event, "create_event", 0.95),
+    (
+        _SCHEDULE_NO_DURATION_RE,
+        parse_schedule_event_without_duration,
+        "create_event",
+        0.9,
+    ),
+    (_MOVE_RE, parse_move_event, "move_event", 0.95),
+    (_DELETE_RE, parse_delete_event, "delete_event", 0.95),
+    (_ADD_NOTIFICATION_RE, parse_add_notification, "add_notification", 0.95),
+    (_SINGLE_DATE_LIST_RE, parse_single_date_list, "list_events_only", 0.9),
+    (_LIST_ALL_RE, lambda cmd: {}, "list_all", 0.95),
+    (_LIST_REMINDERS_RE, lambda cmd: {}, "list_reminders_only", 0.95),
+    (_LIST_EVENTS_RE, lambda cmd: {}, "list_events_only", 0.95),
+]
+
+
+def _normalize_command(cmd: str) -> str:
+    """Collapse whitespace and strip trailing punctuation before rule matching."""
+    return " ".join(cmd.split()).rstrip(".!?")
+
+
+def parse_command_with_confidence(cmd: str) -> Optional[Dict[str, Any]]:
+    """
+    Run the explicit parsers and score how completely they explain the input.
+
+    Unlike parse_command, there is no verb-based fallback: only explicit rules
+    can answer, and the confidence is scaled down when the rule leaves part of
+    the input unexplained (e.g. trailing words a regex did not consume).
+
+    Args:
+        cmd: Raw user input
+
+    Returns:
+        Dict with 'action', 'details' and 'confidence' (0.0 to 1.0), or None
+        when no explicit rule matches.
+
+    Example:
+        >>> parse_command_with_confidence("delete standup on 2025-03-01")
+        {'action': 'delete_event', 'details': {'title': 'standup', 'date': '2025-03-01'}, 'confidence': 0.95}
+    """
+    normalized = _normalize_command(cmd)
+    if not normalized:
+        return None
+
+    for pattern, parser, action, base_confidence in _FAST_PATH_RULES:
+        m = pattern.search(normalized)
+        if not m:
+            continue
+        try:
+            details = parser(normalized)
+        except ValueError:
+            # Relative or malformed date the rule parser cannot resolve
+            continue
+        if details is None:
+            continue
+
+        coverage = (m.end() - m.start()) / len(normalized)
+        confidence = base_confidence if coverage >= 1.0 else base_confidence * coverage
+        title = str(details.get("title", "")).lower()
+        if title in _REFERENCE_TITLES:
+            confidence = 0.0
+        return {
+            "action": action,
+            "details": details,
+            "confidence": round(confidence, 3),
+        }
+    return None
@@ -33,13 +33,15 @@ def parse_date_string(date_str: str, from_date: datetime = None) -> str:
     """
     Parse a date string and return an ISO date (YYYY-MM-DD). Supported inputs:
       - ISO strings YYYY-MM-DD
-      - 'tomorrow'
+      - 'today' / 'tomorrow'
       - Weekday names (e.g., 'Friday')
     Raises ValueError for invalid formats.
     """
     if from_date is None:
         from_date = datetime.now()
     s = date_str.strip().lower()
+    if s == "today":
+        return from_date.strftime("%Y-%m-%d")
     if s == "tomorrow":
         return (from_date + timedelta(days=1)).strftime("%Y-%m-%d")
     if s in WEEKDAYS:
@@ -0,0 +1,211 @@
+"""Free/busy bitmaps and slot search for scheduling.
+
+A FreeBusy covers consecutive days as a boolean NumPy array with one row per
+day and one column per fixed-length slot (5 minutes by default); True marks
+a busy slot. Calendars combine by OR-ing busy slots, so the result is free
+only where every calendar is free, and slot queries are vectorized scans
+over the flattened free mask.
+"""
+
+import math
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_RESOLUTION_MINUTES = 5
+DEFAULT_WORKING_HOURS = (time(9), time(17))
+WEEKDAYS = (0, 1, 2, 3, 4)
+
+MINUTES_PER_DAY = 24 * 60
+
+
+class FreeBusy:
+    """Busy slots over consecutive days at a fixed resolution."""
+
+    def __init__(
+        self, start: date, days: int, resolution: int = DEFAULT_RESOLUTION_MINUTES
+    ):
+        """
+        Initialize an all-free bitmap.
+
+        Args:
+            start: First day covered
+            days: Number of days covered
+            resolution: Slot length in minutes; must divide a day evenly
+        """
+        if days < 1:
+            raise ValueError("FreeBusy must cover at least one day")
+        if resolution < 1 or MINUTES_PER_DAY % resolution:
+            raise ValueError(f"Resolution must divide a day: {resolution}")
+        self.start = start.date() if isinstance(start, datetime) else start
+        self.days = days
+        self.resolution = resolution
+        self.slots_per_day = MINUTES_PER_DAY // resolution
+        self.busy = np.zeros((days, self.slots_per_day), dtype=bool)
+
+    @classmethod
+    def from_intervals(
+        cls,
+        start: date,
+        days: int,
+        intervals: Iterable[Tuple[datetime, datetime]],
+        resolution: int = DEFAULT_RESOLUTION_MINUTES,
+    ) -> "FreeBusy":
+        """Build a bitmap with the given (start, end) intervals marked busy."""
+        free_busy = cls(start, days, resolution)
+        free_busy.add_busy(intervals)
+        return free_busy
+
+    @classmethod
+    def all_free(cls, calendars: Sequence["FreeBusy"]) -> "FreeBusy":
+        """Combine calendars into one that is free only where all of them are."""
+        first = calendars[0]
+        for other in calendars[1:]:
+            first._check_compatible(other)
+        combined = cls(first.start, first.days, first.resolution)
+        np.logical_or.reduce([c.busy for c in calendars], out=combined.busy)
+        return combined
+
+    def __and__(self, other: "FreeBusy") -> "FreeBusy":
+        return FreeBusy.all_free([self, other])
+
+    def add_busy(self, intervals: Iterable[Tuple[datetime, datetime]]) -> None:
+        """Mark every slot overlapping one of the (start, end) intervals busy."""
+        bounds = [
+            (self._slot(start, math.floor), self._slot(end, math.ceil))
+            for start, end in intervals
+            if end > start
+        ]
+        if not bounds:
+            return
+        starts, ends = np.array(bounds, dtype=np.int64).T
+        # +1 where a busy interval begins and -1 where it ends; a positive
+        # running total means at least one interval covers the slot
+        delta = np.zeros(self.busy.size + 1, dtype=np.int32)
+        np.add.at(delta, starts, 1)
+        np.add.at(delta, ends, -1)
+        flat = self.busy.reshape(-1)
+        np.logical_or(flat, np.cumsum(delta[:-1]) > 0, out=flat)
+
+    def working_mask(
+        self,
+        working_hours: Optional[Tuple[time, time]] = DEFAULT_WORKING_HOURS,
+        weekdays: Iterable[int] = WEEKDAYS,
+    ) -> np.ndarray:
+        """
+        Return a (days, slots) mask of slots inside working hours.
+
+        Args:
+            working_hours: (start, end) times of day, or None for all day
+            weekdays: Days of the week to include (0 is Monday)
+        """
+        minutes = np.arange(self.slots_per_day) * self.resolution
+        if working_hours is None:
+            in_hours = np.ones(self.slots_per_day, dtype=bool)
+        else:
+            begin, end = (t.hour * 60 + t.minute for t in working_hours)
+            in_hours = (minutes >= begin) & (minutes + self.resolution <= end)
+        day_of_week = (self.start.weekday() + np.arange(self.days)) % 7
+        on_weekday = np.isin(day_of_week, list(weekdays))
+        return on_weekday[:, None] & in_hours[None, :]
+
+    def free_periods(
+        self,
+        min_length: timedelta = timedelta(0),
+        working_hours: Optional[Tuple[time, time]] = DEFAULT_WORKING_HOURS,
+        weekdays: Iterable[int] = WEEKDAYS,
+        mask: Optional[np.ndarray] = None,
+    ) -> List[Tuple[datetime, datetime]]:
+        """Return maximal free (start, end) periods at least min_length long."""
+        starts, lengths = self._runs(
+            self._free(working_hours, weekdays, mask), self._slots_for(min_length)
+        )
+        return [self._period(s, n) for s, n in zip(starts, lengths)]
+
+    def find_slots(
+        self,
+        duration: timedelta,
+        working_hours: Optional[Tuple[time, time]] = DEFAULT_WORKING_HOURS,
+        weekdays: Iterable[int] = WEEKDAYS,
+        mask: Optional[np.ndarray] = None,
+        strategy: str = "first",
+        count: int = 1,
+    ) -> List[Tuple[datetime, datetime]]:
+        """
+        Find free slots of a given duration.
+
+        Args:
+            duration: Length of each slot
+            working_hours: (start, end) times of day slots must fall within,
+                or None for all day
+            weekdays: Days of the week slots may fall on (0 is Monday)
+            mask: Boolean array of allowed slots, shaped like busy or like
+                one day's row; replaces working_hours and weekdays
+            strategy: "first" for the earliest non-overlapping slots, "best"
+                for slots at the start of the smallest free periods that fit,
+                which leaves longer periods whole
+            count: Maximum number of slots to return
+
+        Returns:
+            (start, end) datetimes; earliest first for "first", tightest fit
+            first for "best"
+        """
+        needed = max(1, self._slots_for(duration))
+        free = self._free(working_hours, weekdays, mask)
+        if strategy == "first":
+            # Slot i fits when the `needed` slots from i are all free
+            totals = np.concatenate(([0], np.cumsum(free, dtype=np.int64)))
+            fits = np.flatnonzero(totals[needed:] - totals[:-needed] == needed)
+            starts, position = [], 0
+            while len(starts) < count:
+                i = np.searchsorted(fits, position)
+                if i == len(fits):
+                    break
+                starts.append(int(fits[i]))
+                position = fits[i] + needed
+        elif strategy == "best":
+            run_starts, run_lengths = self._runs(free, needed)
+            order = np.lexsort((run_starts, run_lengths))[:count]
+            starts = [int(s) for s in run_starts[order]]
+        else:
+            raise ValueError(f"Unknown slot strategy: {strategy}")
+        return [self._period(s, needed) for s in starts]
+
+    def _free(self, working_hours, weekdays, mask) -> np.ndarray:
+        """Flattened mask of slots that are free and allowed."""
+        if mask is None:
+            mask = self.working_mask(working_hours, weekdays)
+        return (~self.busy & np.broadcast_to(mask, self.busy.shape)).reshape(-1)
+
+    @staticmethod
+    def _runs(free: np.ndarray, min_slots: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Starts and lengths of runs of free slots at least min_slots long."""
+        edges = np.diff(np.concatenate(([0], free.astype(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1)
+        lengths = np.flatnonzero(edges == -1) - starts
+        keep = lengths >= max(1, min_slots)
+        return starts[keep], lengths[keep]
+
+    def _slots_for(self, length: timedelta) -> int:
+        return math.ceil(length.total_seconds() / 60 / self.resolution)
+
+    def _slot(self, moment: datetime, rounding) -> int:
+        """Index of the slot boundary at moment, clipped to the covered days."""
+        origin = datetime.combine(self.start, time())
+        slot = rounding((moment - origin).total_seconds() / 60 / self.resolution)
+        return min(max(slot, 0), self.busy.size)
+
+    def _period(self, slot: int, length: int) -> Tuple[datetime, datetime]:
+        start = datetime.combine(self.start, time()) + timedelta(
+            minutes=int(slot) * self.resolution
+        )
+        return start, start + timedelta(minutes=int(length) * self.resolution)
+
+    def _check_compatible(self, other: "FreeBusy") -> None:
+        if (self.start, self.days, self.resolution) != (
+            other.start,
+            other.days,
+            other.resolution,
+        ):
+            raise ValueError("FreeBusy calendars cover different slots")
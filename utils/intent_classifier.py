@@ -0,0 +1,506 @@
+"""Small CPU-only intent classifier for routing commands without the LLM.
+
+Commands are turned into hashed word and character n-gram features and
+scored with a multinomial logistic regression trained in NumPy. The model
+is stored as a compressed .npz artifact of a few dozen kilobytes.
+
+Train or retrain it with:
+
+    python -m utils.intent_classifier [--cache core/response_cache.db]
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import re
+import sqlite3
+import zlib
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.response_cache import normalize_input
+
+DEFAULT_MODEL_PATH = "core/intent_model.npz"
+DEFAULT_BUCKETS = 4096
+
+# The calendar actions the classifier chooses between; "clarify" covers
+# requests that are not a single calendar operation.
+INTENT_LABELS = [
+    "list_events_only",
+    "list_reminders_only",
+    "list_all",
+    "list_todays_events",
+    "create_event",
+    "delete_event",
+    "move_event",
+    "add_notification",
+    "find_free_slots",
+    "clarify",
+]
+
+_DIGIT_RE = re.compile(r"\d")
+
+
+def extract_features(text: str) -> List[str]:
+    """
+    Return the n-gram features of a command.
+
+    Digits are collapsed to 0 so dates and times generalize, and each word
+    contributes character trigrams so misspellings still share features.
+
+    Example:
+        >>> extract_features("List tasks")[:3]
+        ['w:list', 'w:tasks', 'b:list tasks']
+    """
+    tokens = _DIGIT_RE.sub("0", normalize_input(text)).split()
+    features = [f"w:{token}" for token in tokens]
+    features.extend(f"b:{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    for token in tokens:
+        padded = f"<{token}>"
+        features.extend(f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2))
+    return features
+
+
+class IntentClassifier:
+    """Hashed n-gram logistic regression over INTENT_LABELS."""
+
+    def __init__(
+        self,
+        labels: Optional[Sequence[str]] = None,
+        n_buckets: int = DEFAULT_BUCKETS,
+        weights: Optional[np.ndarray] = None,
+        bias: Optional[np.ndarray] = None,
+    ):
+        """
+        Initialize the classifier.
+
+        Args:
+            labels: Class labels, defaults to INTENT_LABELS
+            n_buckets: Size of the hashed feature space
+            weights: Trained (n_buckets, n_labels) weights, or None if untrained
+            bias: Trained (n_labels,) bias, or None if untrained
+        """
+        self.labels = list(labels or INTENT_LABELS)
+        self.n_buckets = n_buckets
+        self.weights = (
+            weights
+            if weights is not None
+            else np.zeros((n_buckets, len(self.labels)), dtype=np.float32)
+        )
+        self.bias = (
+            bias if bias is not None else np.zeros(len(self.labels), dtype=np.float32)
+        )
+
+    def _buckets(self, text: str) -> np.ndarray:
+        """Hash the features of a command into unique bucket indices."""
+        # crc32 rather than hash(): string hashing is salted per process
+        return np.unique(
+            [
+                zlib.crc32(feature.encode("utf-8")) % self.n_buckets
+                for feature in extract_features(text)
+            ]
+        ).astype(np.int64)
+
+    def _vectorize(self, texts: Sequence[str]) -> np.ndarray:
+        """Binary, L2-normalized feature matrix for a batch of commands."""
+        matrix = np.zeros((len(texts), self.n_buckets), dtype=np.float32)
+        for row, text in enumerate(texts):
+            buckets = self._buckets(text)
+            if len(buckets):
+                matrix[row, buckets] = 1.0 / np.sqrt(len(buckets))
+        return matrix
+
+    def fit(
+        self,
+        texts: Sequence[str],
+        labels: Sequence[str],
+        epochs: int = 500,
+        learning_rate: float = 8.0,
+        l2: float = 1e-4,
+    ) -> "IntentClassifier":
+        """
+        Train with full-batch gradient descent on the softmax cross-entropy.
+
+        Args:
+            texts: Training commands
+            labels: Action label for each command (must be in self.labels)
+            epochs: Gradient descent iterations
+            learning_rate: Step size
+            l2: L2 regularization strength
+
+        Returns:
+            self
+        """
+        features = self._vectorize(texts)
+        targets = np.zeros((len(texts), len(self.labels)), dtype=np.float32)
+        targets[np.arange(len(texts)), [self.labels.index(l) for l in labels]] = 1.0
+
+        weights = np.zeros((self.n_buckets, len(self.labels)), dtype=np.float32)
+        bias = np.zeros(len(self.labels), dtype=np.float32)
+        for _ in range(epochs):
+            probabilities = _softmax(features @ weights + bias)
+            error = (probabilities - targets) / len(texts)
+            weights -= learning_rate * (features.T @ error + l2 * weights)
+            bias -= learning_rate * error.sum(axis=0)
+        self.weights = weights
+        self.bias = bias
+        return self
+
+    def predict_proba(self, text: str) -> Dict[str, float]:
+        """Return the probability of each label for a command."""
+        buckets = self._buckets(text)
+        scores = self.bias.copy()
+        if len(buckets):
+            scores += self.weights[buckets].sum(axis=0) / np.sqrt(len(buckets))
+        return dict(zip(self.labels, _softmax(scores[np.newaxis, :])[0].tolist()))
+
+    def predict(self, text: str) -> Tuple[str, float]:
+        """
+        Return the most likely label and its probability.
+
+        Example:
+            >>> classifier.predict("what reminders do i have")
+            ('list_reminders_only', 0.97)
+        """
+        probabilities = self.predict_proba(text)
+        label = max(probabilities, key=probabilities.get)
+        return label, probabilities[label]
+
+    def save(self, path: str = DEFAULT_MODEL_PATH) -> None:
+        """Write the model as a compressed .npz artifact."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "wb") as f:
+            np.savez_compressed(
+                f,
+                weights=self.weights.astype(np.float16),
+                bias=self.bias,
+                labels=np.array(self.labels),
+            )
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_MODEL_PATH) -> Optional["IntentClassifier"]:
+        """Load a saved model, or return None if it is missing or unreadable."""
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path) as data:
+                weights = data["weights"].astype(np.float32)
+                return cls(
+                    labels=[str(label) for label in data["labels"]],
+                    n_buckets=weights.shape[0],
+                    weights=weights,
+                    bias=data["bias"].astype(np.float32),
+                )
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Warning: Could not load intent classifier: {e}")
+            return None
+
+
+def _softmax(scores: np.ndarray) -> np.ndarray:
+    shifted = np.exp(scores - scores.max(axis=1, keepdims=True))
+    return shifted / shifted.sum(axis=1, keepdims=True)
+
+
+# Hand-written seed phrasings per action. Slots are filled from _SEED_SLOTS.
+_SEED_TEMPLATES = {
+    "list_events_only": [
+        "list events",
+        "list my events",
+        "show my events",
+        "show me my meetings",
+        "what meetings do I have",
+        "what events do I have",
+        "what's on my calendar",
+        "any meetings coming up",
+        "do I have any meetings",
+        "show my calendar",
+        "what appointments do I have",
+        "events please",
+        "what's in my calendar",
+        "which meetings are scheduled",
+    ],
+    "list_reminders_only": [
+        "list reminders",
+        "list my reminders",
+        "show my reminders",
+        "what reminders do I have",
+        "show my tasks",
+        "list my tasks",
+        "what's on my to-do list",
+        "what do I need to do",
+        "any tasks left",
+        "my todo list",
+        "show reminders",
+        "what tasks are due",
+        "which reminders are open",
+    ],
+    "list_all": [
+        "list all",
+        "list everything",
+        "show everything",
+        "show me everything",
+        "what's going on",
+        "what do I have going on",
+        "give me an overview",
+        "what's on",
+        "show my schedule",
+        "what does my schedule look like",
+        "events and reminders",
+        "show events and reminders",
+        "what's my agenda",
+        "summarize my schedule",
+    ],
+    "list_todays_events": [
+        "what's on today",
+        "what do I have today",
+        "today's schedule",
+        "show today",
+        "what's happening today",
+        "anything today",
+        "what's my day look like",
+        "show me today's events",
+        "what's on for today",
+        "my day",
+    ],
+    "create_event": [
+        "schedule {title} on {date} at {time}",
+        "schedule {title} {date} at {time} for {duration} minutes",
+        "add {title} on {date} at {time}",
+        "create an event called {title} {date}",
+        "book {title} for {date} at {time}",
+        "put {title} in my calendar {date}",
+        "set up {title} {date} at {time}",
+        "new meeting {title} at {time}",
+        "add a meeting with {person} {date}",
+        "schedule a call with {person} at {time}",
+        "I have {title} {date} at {time}",
+        "plan {title} for {date}",
+        "shedule {title} {date}",
+    ],
+    "delete_event": [
+        "delete {title} on {date}",
+        "delete {title}",
+        "cancel {title}",
+        "cancel my {title} {date}",
+        "remove {title} from my calendar",
+        "get rid of {title}",
+        "drop the {title} on {date}",
+        "delete that meeting",
+        "cancel it",
+        "remove the meeting with {person}",
+        "delte {title}",
+    ],
+    "move_event": [
+        "move {title} on {date} to {date} at {time}",
+        "move {title} to {time}",
+        "reschedule {title} to {date}",
+        "push {title} to {date}",
+        "shift {title} to {time}",
+        "change {title} to {date} at {time}",
+        "move it to {time}",
+        "reschedule my meeting with {person}",
+        "can we move {title} later",
+        "postpone {title} until {date}",
+    ],
+    "add_notification": [
+        "add notification to {title} on {date} {duration} minutes before",
+        "remind me {duration} minutes before {title}",
+        "add an alert to {title}",
+        "notify me before {title}",
+        "set an alarm for {title} {duration} minutes before",
+        "alert me {duration} minutes before my {title}",
+        "add a reminder to {title} {date}",
+    ],
+    "find_free_slots": [
+        "find {duration} minutes {date}",
+        "find me {duration} free minutes {date}",
+        "when am I free {date}",
+        "when am I free for {duration} minutes",
+        "find a free slot {date}",
+        "find time for {title} {date}",
+        "do I have a free hour {date}",
+        "when can I fit in {title}",
+        "find a gap of {duration} minutes",
+        "when are {person} and I both free",
+        "find a time to meet {person} {date}",
+        "any free time {date}",
+        "show my free time",
+    ],
+    "clarify": [
+        "hello",
+        "hi there",
+        "thanks",
+        "help",
+        "what can you do",
+        "I'm not sure",
+        "do the thing",
+        "hmm",
+        "tell me a joke",
+        "who are you",
+        "what's the weather",
+        "fix it",
+        "something",
+        "meeting",
+    ],
+}
+
+_SEED_SLOTS = {
+    "title": [
+        "standup",
+        "team meeting",
+        "lunch",
+        "dentist",
+        "1:1",
+        "project review",
+        "gym",
+        "doctor appointment",
+    ],
+    "date": ["tomorrow", "today", "friday", "next monday", "2025-03-01", "12 july"],
+    "time": ["2pm", "10am", "14:30", "9:00", "noon"],
+    "duration": ["15", "30", "60"],
+    "person": ["Sarah", "John", "the team", "my manager"],
+}
+
+# Labels for the llm_testing prompt templates and predefined scenario prompts.
+# Templates whose expected outcome is mixed or an error are left out.
+_LLM_TESTING_TEMPLATE_LABELS = {
+    "basic_scheduling": "create_event",
+    "accessibility_request": "list_all",
+    "ambiguous_scheduling": "clarify",
+    "complex_scheduling": "clarify",
+    "language_learning": "clarify",
+    "optimization_request": "clarify",
+    "timezone_challenge": "clarify",
+    "contradictory_request": "clarify",
+}
+_LLM_TESTING_SCENARIO_LABELS = {"accessible_scheduling": "list_all"}
+
+
+def _fill_slots(template: str, slot_fillers: Dict[str, List[str]], limit: int):
+    """Yield up to limit fillings of a template, enumerating slot combinations."""
+    slots = [slot for slot in slot_fillers if f"{{{slot}}}" in template]
+    combinations = itertools.product(*(slot_fillers[slot] for slot in slots))
+    for values in itertools.islice(combinations, limit):
+        text = template
+        for slot, value in zip(slots, values):
+            text = text.replace(f"{{{slot}}}", value)
+        yield text
+
+
+# Conversational lead-ins, added to the short listing phrasings
+_LEAD_INS = ["can you ", "please ", "hey, ", "quickly "]
+
+
+def _seed_examples() -> List[Tuple[str, str]]:
+    examples = []
+    rng = random.Random(0)
+    for action, templates in _SEED_TEMPLATES.items():
+        for template in templates:
+            if action.startswith("list_"):
+                examples.extend((lead + template, action) for lead in _LEAD_INS)
+            # Shuffle slot values per template so combinations vary
+            slots = {k: rng.sample(v, len(v)) for k, v in _SEED_SLOTS.items()}
+            examples.extend((text, action) for text in _fill_slots(template, slots, 6))
+    return examples
+
+
+def _llm_testing_examples() -> List[Tuple[str, str]]:
+    """Labelled prompts from the llm_testing templates and scenarios."""
+    try:
+        from llm_testing.prompts import PREDEFINED_PROMPTS, SCHEDULING_TEMPLATES
+    except ImportError as e:
+        print(f"Warning: llm_testing prompts not available: {e}")
+        return []
+
+    examples = []
+    for name, action in _LLM_TESTING_TEMPLATE_LABELS.items():
+        template = SCHEDULING_TEMPLATES.get(name)
+        if template:
+            examples.extend(
+                (text, action)
+                for text in _fill_slots(template.template, template.slot_fillers, 30)
+            )
+    for scenario, prompts in PREDEFINED_PROMPTS.items():
+        action = _LLM_TESTING_SCENARIO_LABELS.get(scenario, "clarify")
+        examples.extend((prompt.prompt, action) for prompt in prompts)
+    return examples
+
+
+def _logged_examples(cache_path: str) -> List[Tuple[str, str]]:
+    """LLM interpretations logged in the response cache."""
+    if not os.path.exists(cache_path):
+        return []
+    try:
+        with sqlite3.connect(cache_path) as conn:
+            rows = conn.execute(
+                "SELECT normalized_input, result FROM responses"
+            ).fetchall()
+    except sqlite3.Error as e:
+        print(f"Warning: Could not read logged interpretations: {e}")
+        return []
+    examples = []
+    for text, result in rows:
+        action = json.loads(result).get("action")
+        if action in INTENT_LABELS:
+            examples.append((text, action))
+    return examples
+
+
+def build_training_corpus(
+    cache_path: Optional[str] = "core/response_cache.db",
+) -> List[Tuple[str, str]]:
+    """
+    Collect (command, action) training pairs.
+
+    Combines the seed phrasings, the llm_testing prompt corpus and, when
+    cache_path exists, interpretations the LLM logged to the response cache.
+    Duplicates are removed; the first label seen wins.
+    """
+    examples = _seed_examples() + _llm_testing_examples()
+    if cache_path:
+        examples += _logged_examples(cache_path)
+
+    seen = set()
+    corpus = []
+    for text, action in examples:
+        key = normalize_input(text)
+        if key and key not in seen:
+            seen.add(key)
+            corpus.append((text, action))
+    return corpus
+
+
+def train_intent_classifier(
+    corpus: Optional[List[Tuple[str, str]]] = None,
+    n_buckets: int = DEFAULT_BUCKETS,
+) -> IntentClassifier:
+    """Train a classifier on corpus (default: build_training_corpus())."""
+    if corpus is None:
+        corpus = build_training_corpus()
+    texts = [text for text, _ in corpus]
+    labels = [action for _, action in corpus]
+    return IntentClassifier(n_buckets=n_buckets).fit(texts, labels)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the local intent classifier")
+    parser.add_argument("--cache", default="core/response_cache.db")
+    parser.add_argument("--output", default=DEFAULT_MODEL_PATH)
+    args = parser.parse_args()
+
+    corpus = build_training_corpus(args.cache)
+    classifier = train_intent_classifier(corpus)
+    classifier.save(args.output)
+    print(
+        f"Trained on {len(corpus)} examples; wrote {args.output} "
+        f"({os.path.getsize(args.output) / 1024:.1f} KB)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""In-memory interval index for calendar events.
+
+A treap (randomized balanced binary search tree) ordered by start time, with
+every node augmented by the maximum end time in its subtree. Inserts and
+deletes are O(log n) expected, and overlap or range queries are
+O(log n + k) for k results, because subtrees that end before the query
+window, or start after it, are skipped entirely.
+"""
+
+import random
+from typing import Any, Hashable, Iterator, List, Optional, Tuple
+
+
+class _Node:
+    __slots__ = (
+        "order",
+        "start",
+        "end",
+        "value",
+        "priority",
+        "max_end",
+        "left",
+        "right",
+    )
+
+    def __init__(self, order, start, end, value, priority):
+        self.order = order  # (start, insertion sequence): unique sort key
+        self.start = start
+        self.end = end
+        self.value = value
+        self.priority = priority
+        self.max_end = end
+        self.left = None
+        self.right = None
+
+    def update(self) -> None:
+        """Recompute max_end from this node and its children."""
+        max_end = self.end
+        if self.left is not None and self.left.max_end > max_end:
+            max_end = self.left.max_end
+        if self.right is not None and self.right.max_end > max_end:
+            max_end = self.right.max_end
+        self.max_end = max_end
+
+
+def _split(node: Optional[_Node], order) -> Tuple[Optional[_Node], Optional[_Node]]:
+    """Split into (nodes ordered before order, nodes at or after order)."""
+    if node is None:
+        return None, None
+    if node.order < order:
+        node.right, right = _split(node.right, order)
+        node.update()
+        return node, right
+    left, node.left = _split(node.left, order)
+    node.update()
+    return left, node
+
+
+def _merge(left: Optional[_Node], right: Optional[_Node]) -> Optional[_Node]:
+    """Merge two treaps where every node of left orders before right."""
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        left.update()
+        return left
+    right.left = _merge(left, right.left)
+    right.update()
+    return right
+
+
+class IntervalIndex:
+    """
+    Index of [start, end] intervals keyed by a caller-chosen unique key.
+
+    Start and end may be any mutually comparable values (datetimes in the
+    calendar agent). Adding an existing key replaces its interval.
+
+    Example:
+        >>> index = IntervalIndex()
+        >>> index.add("standup", datetime(2025, 3, 3, 9), datetime(2025, 3, 3, 9, 15))
+        >>> index.overlapping(datetime(2025, 3, 3, 9, 10), datetime(2025, 3, 3, 10))
+        ['standup']
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        """
+        Initialize an empty index.
+
+        Args:
+            seed: Optional seed for node priorities (for reproducible shapes)
+        """
+        self._root: Optional[_Node] = None
+        self._orders = {}  # key -> node order
+        self._sequence = 0
+        self._random = random.Random(seed)
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._orders
+
+    def add(self, key: Hashable, start, end, value: Any = None) -> None:
+        """Insert an interval under key (replacing any existing one)."""
+        if key in self._orders:
+            self.remove(key)
+        if end < start:
+            end = start
+        self._sequence += 1
+        order = (start, self._sequence)
+        node = _Node(
+            order, start, end, key if value is None else value, self._random.random()
+        )
+        left, right = _split(self._root, order)
+        self._root = _merge(_merge(left, node), right)
+        self._orders[key] = order
+
+    def remove(self, key: Hashable) -> bool:
+        """Remove the interval stored under key; return False if it was absent."""
+        order = self._orders.pop(key, None)
+        if order is None:
+            return False
+        left, rest = _split(self._root, order)
+        # rest starts with the node itself, which has the smallest order in it
+        _, right = _split(rest, (order[0], order[1] + 1))
+        self._root = _merge(left, right)
+        return True
+
+    def clear(self) -> None:
+        """Remove all intervals."""
+        self._root = None
+        self._orders.clear()
+
+    def overlapping(self, start, end) -> List[Any]:
+        """
+        Return values of intervals that overlap [start, end), ordered by start.
+
+        An interval overlaps if it starts before end and ends after start;
+        zero-length intervals count when they start inside the window.
+        """
+        return [node.value for node in self._overlapping_nodes(start, end)]
+
+    def starting_in(self, start, end) -> List[Any]:
+        """Return values of intervals starting in [start, end], ordered by start."""
+        result = []
+        stack = []
+        node = self._root
+        while stack or node is not None:
+            if node is not None:
+                if node.start < start:
+                    # Everything on the left starts earlier still
+                    node = node.right
+                    continue
+                stack.append(node)
+                node = node.left
+                continue
+            node = stack.pop()
+            if node.start > end:
+                break
+            result.append(node.value)
+            node = node.right
+        return result
+
+    def gaps(self, start, end, min_length=None) -> List[Tuple[Any, Any]]:
+        """
+        Return the free (gap_start, gap_end) periods within [start, end).
+
+        Args:
+            start: Window start
+            end: Window end
+            min_length: Optional minimum gap length (e.g. a timedelta)
+        """
+        free = []
+        cursor = start
+        for node in self._overlapping_nodes(start, end):
+            if node.start > cursor:
+                free.append((cursor, node.start))
+            if node.end > cursor:
+                cursor = node.end
+        if cursor < end:
+            free.append((cursor, end))
+        if min_length is not None:
+            free = [(a, b) for a, b in free if b - a >= min_length]
+        return free
+
+    def items(self) -> Iterator[Tuple[Any, Any, Any]]:
+        """Iterate (start, end, value) for all intervals in start order."""
+        stack = []
+        node = self._root
+        while stack or node is not None:
+            if node is not None:
+                stack.append(node)
+                node = node.left
+                continue
+            node = stack.pop()
+            yield node.start, node.end, node.value
+            node = node.right
+
+    def _overlapping_nodes(self, start, end) -> List[_Node]:
+        result = []
+        stack = []
+        node = self._root
+        while stack or node is not None:
+            if node is not None:
+                if node.max_end < start:
+                    # Nothing in this subtree reaches the window
+                    node = None
+                    continue
+                stack.append(node)
+                node = node.left
+                continue
+            node = stack.pop()
+            if node.start >= end:
+                # In-order traversal: everything after this starts too late
+                break
+            if node.end > start or node.start >= start:
+                result.append(node)
+            node = node.right
+        return result
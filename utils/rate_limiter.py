@@ -0,0 +1,63 @@
+"""Token-bucket rate limiter for calls to rate-limited APIs."""
+
+import threading
+import time
+from typing import Callable, Optional
+
+
+class RateLimiter:
+    """Thread-safe token bucket allowing `rate` units per `period` seconds."""
+
+    def __init__(
+        self,
+        rate: float,
+        period: float = 60.0,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Initialize a full bucket.
+
+        Args:
+            rate: Units (requests, tokens, ...) allowed per period
+            period: Period length in seconds
+            capacity: Largest burst, defaults to rate
+            clock: Monotonic time source
+            sleep: Function used to wait for the bucket to refill
+        """
+        self.per_second = rate / period
+        self.capacity = capacity if capacity is not None else rate
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+        self.waited = 0.0
+
+    def acquire(self, amount: float = 1.0) -> float:
+        """
+        Take amount units, waiting until the bucket holds them.
+
+        A request larger than the capacity waits for a full bucket.
+
+        Returns:
+            Seconds spent waiting
+        """
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(
+                    self.capacity,
+                    self._tokens + (now - self._updated) * self.per_second,
+                )
+                self._updated = now
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    self.waited += waited
+                    return waited
+                delay = (amount - self._tokens) / self.per_second
+            self._sleep(delay)
+            waited += delay
@@ -0,0 +1,511 @@
+"""RFC 5545 recurrence rules (RRULE) with lazy occurrence expansion.
+
+Supports FREQ=DAILY/WEEKLY/MONTHLY/YEARLY with INTERVAL, COUNT, UNTIL, BYDAY
+(including ordinals such as 2TU or -1FR for monthly and yearly rules),
+BYMONTHDAY, BYMONTH and WKST, plus EXDATE exclusions.
+
+Occurrences are generated one period at a time, where a period is one day,
+week, month or year times INTERVAL. Listing a window starts at the period
+that contains the window start, not at the series start. The cost therefore
+depends on the window size, not on how far into the series the window is.
+"""
+
+import calendar
+import math
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+FREQUENCIES = ("DAILY", "WEEKLY", "MONTHLY", "YEARLY")
+WEEKDAY_CODES = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+
+_BYDAY_PATTERN = re.compile(r"^([+-]?\d{1,2})?(MO|TU|WE|TH|FR|SA|SU)$")
+
+# Periods of each frequency in the 400 years after which the Gregorian
+# calendar repeats
+_CALENDAR_CYCLES = {"DAILY": 146097, "WEEKLY": 20871, "MONTHLY": 4800, "YEARLY": 400}
+
+
+@dataclass(frozen=True)
+class RecurrenceRule:
+    """A parsed RRULE. Weekdays are Python weekday numbers (Monday=0)."""
+
+    freq: str
+    interval: int = 1
+    count: Optional[int] = None
+    until: Optional[datetime] = None
+    byday: Tuple[Tuple[Optional[int], int], ...] = ()  # (ordinal or None, weekday)
+    bymonthday: Tuple[int, ...] = ()
+    bymonth: Tuple[int, ...] = ()
+    wkst: int = 0
+
+    @classmethod
+    def parse(cls, text: str) -> "RecurrenceRule":
+        """
+        Parse an RRULE value such as "FREQ=WEEKLY;BYDAY=MO,WE;COUNT=10".
+
+        Raises:
+            ValueError: If the rule is malformed or uses unsupported parts
+        """
+        text = text.strip()
+        if text.upper().startswith("RRULE:"):
+            text = text[len("RRULE:") :]
+        parts = {}
+        for part in text.split(";"):
+            if not part.strip():
+                continue
+            name, sep, value = part.partition("=")
+            if not sep:
+                raise ValueError(f"Malformed RRULE part: {part!r}")
+            parts[name.strip().upper()] = value.strip().upper()
+
+        freq = parts.pop("FREQ", None)
+        if freq not in FREQUENCIES:
+            raise ValueError(f"Unsupported or missing FREQ: {freq}")
+        interval = _positive_int(parts.pop("INTERVAL", "1"), "INTERVAL")
+        count = parts.pop("COUNT", None)
+        until = parts.pop("UNTIL", None)
+        if count is not None and until is not None:
+            raise ValueError("COUNT and UNTIL cannot both be set")
+
+        byday = tuple(_parse_byday(v) for v in _split(parts.pop("BYDAY", "")))
+        if freq in ("DAILY", "WEEKLY") and any(n is not None for n, _ in byday):
+            raise ValueError(f"BYDAY ordinals are not allowed with FREQ={freq}")
+        bymonthday = tuple(
+            _bounded_int(v, "BYMONTHDAY", 31)
+            for v in _split(parts.pop("BYMONTHDAY", ""))
+        )
+        if freq == "WEEKLY" and bymonthday:
+            raise ValueError("BYMONTHDAY is not allowed with FREQ=WEEKLY")
+        bymonth = tuple(
+            _bounded_int(v, "BYMONTH", 12, signed=False)
+            for v in _split(parts.pop("BYMONTH", ""))
+        )
+        wkst = parts.pop("WKST", "MO")
+        if wkst not in WEEKDAY_CODES:
+            raise ValueError(f"Invalid WKST: {wkst}")
+        if parts:
+            raise ValueError(f"Unsupported RRULE parts: {', '.join(sorted(parts))}")
+
+        return cls(
+            freq=freq,
+            interval=interval,
+            count=_positive_int(count, "COUNT") if count is not None else None,
+            until=parse_ical_datetime(until, end_of_day=True) if until else None,
+            byday=byday,
+            bymonthday=bymonthday,
+            bymonth=bymonth,
+            wkst=WEEKDAY_CODES.index(wkst),
+        )
+
+
+class Recurrence:
+    """
+    A recurring series: a rule anchored at its first start, minus EXDATEs.
+
+    Example:
+        >>> series = Recurrence(datetime(2024, 1, 1, 9), "FREQ=DAILY")
+        >>> list(series.between(datetime(2034, 1, 1), datetime(2034, 1, 2, 23, 59)))
+        [datetime.datetime(2034, 1, 1, 9, 0), datetime.datetime(2034, 1, 2, 9, 0)]
+    """
+
+    def __init__(
+        self,
+        dtstart: datetime,
+        rule: Union[str, RecurrenceRule],
+        exdates: Iterable[Union[str, date, datetime]] = (),
+    ):
+        """
+        Initialize a series.
+
+        Args:
+            dtstart: Start of the first occurrence (its time applies to all)
+            rule: RecurrenceRule, or RRULE text. The text may have extra
+                "EXDATE:" lines, as in an iCalendar event.
+            exdates: Excluded occurrences. Datetimes exclude that exact start;
+                dates exclude any occurrence on that day.
+
+        Raises:
+            ValueError: If the rule or an exception date can't be parsed
+        """
+        self.dtstart = dtstart
+        self.exdates = set()
+        self.exdays = set()
+        if isinstance(rule, str):
+            rule_lines = []
+            for line in rule.splitlines():
+                name, _, value = line.partition(":")
+                if name.strip().upper().startswith("EXDATE") and value:
+                    for item in _split(value):
+                        self.add_exdate(item)
+                elif line.strip():
+                    rule_lines.append(line)
+            rule = RecurrenceRule.parse(";".join(rule_lines))
+        self.rule = rule
+        for exdate in exdates:
+            self.add_exdate(exdate)
+
+        start_day = dtstart.date()
+        self._week0 = start_day - timedelta(days=(start_day.weekday() - rule.wkst) % 7)
+        # Occurrences in periods 1..i, for the i summed so far
+        self._counts_after_first = [0]
+
+    def add_exdate(self, value: Union[str, date, datetime]) -> None:
+        """Exclude an occurrence (datetime) or every occurrence on a day (date)."""
+        if isinstance(value, str):
+            compact = value.strip().upper().replace("-", "").replace(":", "")
+            if "T" in compact:
+                value = parse_ical_datetime(compact)
+            else:
+                value = datetime.strptime(compact, "%Y%m%d").date()
+        if isinstance(value, datetime):
+            self.exdates.add(value)
+        else:
+            self.exdays.add(value)
+
+    def between(self, start: datetime, end: datetime) -> Iterator[datetime]:
+        """Yield occurrences with start <= occurrence <= end, in order."""
+        rule = self.rule
+        if end < start or end < self.dtstart:
+            return
+        if rule.until is not None and start > rule.until:
+            return
+
+        period = self._period_index(max(start, self.dtstart))
+        ordinal = 0
+        if rule.count is not None:
+            ordinal = self._occurrences_before(period)
+            if ordinal >= rule.count:
+                return
+
+        while self._period_first_day(period) <= end.date():
+            for occurrence in self._period_occurrences(period):
+                if rule.until is not None and occurrence > rule.until:
+                    return
+                if rule.count is not None:
+                    if ordinal >= rule.count:
+                        return
+                    ordinal += 1
+                if occurrence > end:
+                    return
+                if occurrence >= start and not self.is_excluded(occurrence):
+                    yield occurrence
+            period += 1
+
+    def is_excluded(self, occurrence: datetime) -> bool:
+        """Return True if occurrence is removed by an EXDATE."""
+        return occurrence in self.exdates or occurrence.date() in self.exdays
+
+    def _period_index(self, moment: datetime) -> int:
+        """Index of the period containing moment (0 is the dtstart period)."""
+        rule = self.rule
+        first = self.dtstart.date()
+        day = moment.date()
+        if rule.freq == "DAILY":
+            steps = (day - first).days
+        elif rule.freq == "WEEKLY":
+            steps = (day - self._week0).days // 7
+        elif rule.freq == "MONTHLY":
+            steps = (day.year - first.year) * 12 + day.month - first.month
+        else:
+            steps = day.year - first.year
+        return steps // rule.interval
+
+    def _period_first_day(self, period: int) -> date:
+        rule = self.rule
+        first = self.dtstart.date()
+        steps = period * rule.interval
+        if rule.freq == "DAILY":
+            return first + timedelta(days=steps)
+        if rule.freq == "WEEKLY":
+            return self._week0 + timedelta(weeks=steps)
+        if rule.freq == "MONTHLY":
+            year, month = divmod(first.month - 1 + steps, 12)
+            return date(first.year + year, month + 1, 1)
+        return date(first.year + steps, 1, 1)
+
+    def _period_occurrences(self, period: int) -> List[datetime]:
+        """Occurrences in one period, in order, excluding any before dtstart."""
+        rule = self.rule
+        first_day = self._period_first_day(period)
+        if rule.freq == "DAILY":
+            days = [first_day] if self._matches_filters(first_day) else []
+        elif rule.freq == "WEEKLY":
+            weekdays = {wd for _, wd in rule.byday} or {self.dtstart.weekday()}
+            days = sorted(
+                first_day + timedelta(days=(wd - rule.wkst) % 7) for wd in weekdays
+            )
+            if rule.bymonth:
+                days = [d for d in days if d.month in rule.bymonth]
+        elif rule.freq == "MONTHLY":
+            if rule.bymonth and first_day.month not in rule.bymonth:
+                days = []
+            else:
+                days = self._month_days(first_day.year, first_day.month)
+        else:
+            days = self._year_days(first_day.year)
+
+        start_time = self.dtstart.time()
+        return [
+            occurrence
+            for occurrence in (datetime.combine(d, start_time) for d in days)
+            if occurrence >= self.dtstart
+        ]
+
+    def _matches_filters(self, day: date) -> bool:
+        """BYxxx parts limit (rather than expand) a DAILY rule."""
+        rule = self.rule
+        if rule.bymonth and day.month not in rule.bymonth:
+            return False
+        if rule.byday and day.weekday() not in {wd for _, wd in rule.byday}:
+            return False
+        if rule.bymonthday:
+            return _on_monthday(day, rule.bymonthday)
+        return True
+
+    def _month_days(self, year: int, month: int) -> List[date]:
+        rule = self.rule
+        length = calendar.monthrange(year, month)[1]
+        if rule.bymonthday or rule.byday:
+            days = set(range(1, length + 1))
+            if rule.bymonthday:
+                days &= _resolve_days(rule.bymonthday, length)
+            if rule.byday:
+                first_weekday = date(year, month, 1).weekday()
+                days &= {
+                    offset + 1
+                    for offset in _weekday_offsets(first_weekday, length, rule.byday)
+                }
+        else:
+            days = {self.dtstart.day} if self.dtstart.day <= length else set()
+        return [date(year, month, d) for d in sorted(days)]
+
+    def _year_days(self, year: int) -> List[date]:
+        rule = self.rule
+        if rule.byday and not rule.bymonth:
+            # Weekdays (and ordinals such as 20MO) counted across the whole
+            # year, then limited by BYMONTHDAY
+            first = date(year, 1, 1)
+            length = (date(year + 1, 1, 1) - first).days
+            offsets = _weekday_offsets(first.weekday(), length, rule.byday)
+            days = [first + timedelta(days=offset) for offset in sorted(offsets)]
+            if rule.bymonthday:
+                days = [d for d in days if _on_monthday(d, rule.bymonthday)]
+            return days
+        if rule.bymonth or rule.bymonthday or rule.byday:
+            months = rule.bymonth or range(1, 13)
+        else:
+            months = (self.dtstart.month,)
+        days = []
+        for month in sorted(months):
+            days.extend(self._month_days(year, month))
+        return days
+
+    def _occurrences_before(self, period: int) -> int:
+        """Count occurrences in periods before period (capped at COUNT)."""
+        if period <= 0:
+            return 0
+        rule = self.rule
+        first_period = len(self._period_occurrences(0))
+        if rule.freq == "DAILY" and not (rule.byday or rule.bymonthday or rule.bymonth):
+            return first_period + (period - 1)
+        if rule.freq == "WEEKLY" and not rule.bymonth:
+            per_week = len({wd for _, wd in rule.byday}) or 1
+            return first_period + (period - 1) * per_week
+        # Irregular periods: counts repeat with the 400-year Gregorian cycle,
+        # so they are summed for at most one cycle and the sums kept
+        prefix = self._counts_after_first
+        cycle = _CALENDAR_CYCLES[rule.freq] // math.gcd(
+            _CALENDAR_CYCLES[rule.freq], rule.interval
+        )
+        needed = min(period - 1, cycle)
+        while len(prefix) <= needed and first_period + prefix[-1] < rule.count:
+            prefix.append(prefix[-1] + len(self._period_occurrences(len(prefix))))
+        if len(prefix) <= needed:
+            return rule.count  # Reached before period
+        cycles, rest = divmod(period - 1, cycle)
+        return first_period + (cycles and cycles * prefix[cycle]) + prefix[rest]
+
+
+class OccurrenceCache:
+    """
+    LRU cache of materialized occurrences per (series, window).
+
+    Entries are dropped precisely: when a series is removed, every window of
+    that series is dropped. When one occurrence is removed, only the windows
+    of that series containing its day are dropped. A new series needs no
+    invalidation, since it has no entries yet.
+    """
+
+    def __init__(self, max_entries: int = 512):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_entries: Maximum number of (series, window) entries kept
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # (series_id, start, end) -> occurrences
+        self._series_keys: Dict[Hashable, set] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(
+        self,
+        series_id: Hashable,
+        start: datetime,
+        end: datetime,
+        compute: Callable[[], Iterable[datetime]],
+    ) -> Tuple[datetime, ...]:
+        """Return occurrences of a series in [start, end], computing on a miss."""
+        key = (series_id, start, end)
+        occurrences = self._entries.get(key)
+        if occurrences is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return occurrences
+
+        self.misses += 1
+        occurrences = tuple(compute())
+        self._entries[key] = occurrences
+        self._series_keys.setdefault(series_id, set()).add(key)
+        if len(self._entries) > self.max_entries:
+            self._discard(next(iter(self._entries)))
+        return occurrences
+
+    def invalidate_series(self, series_id: Hashable) -> None:
+        """Drop every cached window of a series."""
+        for key in list(self._series_keys.get(series_id, ())):
+            self._discard(key)
+            self.invalidations += 1
+
+    def invalidate_day(self, series_id: Hashable, day: date) -> None:
+        """Drop the cached windows of a series that include day."""
+        for key in list(self._series_keys.get(series_id, ())):
+            _, start, end = key
+            if start.date() <= day <= end.date():
+                self._discard(key)
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop all entries (statistics are kept)."""
+        self._entries.clear()
+        self._series_keys.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "invalidations": self.invalidations,
+        }
+
+    def _discard(self, key) -> None:
+        self._entries.pop(key, None)
+        keys = self._series_keys.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._series_keys[key[0]]
+
+
+def parse_ical_datetime(value: str, end_of_day: bool = False) -> datetime:
+    """
+    Parse an iCalendar DATE or DATE-TIME (e.g. 20240105 or 20240105T090000Z).
+
+    UTC values ending in Z are converted to naive local time. A bare date
+    gives midnight, or 23:59:59 with end_of_day (an inclusive UNTIL date).
+    """
+    compact = value.strip().upper().replace("-", "").replace(":", "")
+    is_utc = compact.endswith("Z")
+    compact = compact.rstrip("Z")
+    try:
+        if "T" in compact:
+            fmt = "%Y%m%dT%H%M%S" if len(compact) > 13 else "%Y%m%dT%H%M"
+            parsed = datetime.strptime(compact, fmt)
+        else:
+            parsed = datetime.strptime(compact, "%Y%m%d")
+            if end_of_day:
+                parsed = parsed.replace(hour=23, minute=59, second=59)
+    except ValueError:
+        raise ValueError(f"Invalid iCalendar date: {value!r}") from None
+    if is_utc:
+        parsed = parsed.replace(tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+    return parsed
+
+
+def _split(value: str) -> List[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _positive_int(value: str, name: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        raise ValueError(f"Invalid {name}: {value}") from None
+    if number < 1:
+        raise ValueError(f"{name} must be positive: {value}")
+    return number
+
+
+def _bounded_int(value: str, name: str, limit: int, signed: bool = True) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        raise ValueError(f"Invalid {name}: {value}") from None
+    if not 1 <= abs(number) <= limit or (number < 0 and not signed):
+        raise ValueError(f"{name} out of range: {value}")
+    return number
+
+
+def _parse_byday(value: str) -> Tuple[Optional[int], int]:
+    match = _BYDAY_PATTERN.match(value)
+    if not match or match.group(1) in ("0", "+0", "-0"):
+        raise ValueError(f"Invalid BYDAY: {value}")
+    ordinal = int(match.group(1)) if match.group(1) else None
+    return ordinal, WEEKDAY_CODES.index(match.group(2))
+
+
+def _resolve_days(monthdays: Iterable[int], length: int) -> set:
+    """Map BYMONTHDAY values (negative counts from the end) to valid days."""
+    days = set()
+    for day in monthdays:
+        resolved = day if day > 0 else length + day + 1
+        if 1 <= resolved <= length:
+            days.add(resolved)
+    return days
+
+
+def _on_monthday(day: date, monthdays: Iterable[int]) -> bool:
+    """Whether day is one of the BYMONTHDAY values in its month."""
+    length = calendar.monthrange(day.year, day.month)[1]
+    return day.day in _resolve_days(monthdays, length)
+
+
+def _weekday_offsets(first_weekday: int, length: int, byday) -> set:
+    """Day offsets in a span of length days matching BYDAY entries."""
+    offsets = set()
+    for ordinal, weekday in byday:
+        matches = range((weekday - first_weekday) % 7, length, 7)
+        if ordinal is None:
+            offsets.update(matches)
+        elif -len(matches) <= (ordinal - 1 if ordinal > 0 else ordinal) < len(matches):
+            offsets.add(matches[ordinal - 1 if ordinal > 0 else ordinal])
+    return offsets
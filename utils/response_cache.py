@@ -0,0 +1,219 @@
+"""Persistent response cache for LLM command interpretation."""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+
+def normalize_input(user_input: str) -> str:
+    """
+    Normalize user input so trivially different phrasings share a cache entry.
+
+    Lowercases, drops apostrophes, strips punctuation and collapses whitespace,
+    so "What's on today?" and "whats on  today" map to the same key.
+
+    Example:
+        >>> normalize_input("  What's on TODAY? ")
+        'whats on today'
+    """
+    text = user_input.lower().replace("'", "").replace("\u2019", "")
+    text = re.sub(r"[^\w\s:/-]", " ", text)
+    return " ".join(text.split())
+
+
+def context_fingerprint(conversation_context: str) -> str:
+    """Return a short stable hash of the conversation context ('' if empty)."""
+    if not conversation_context:
+        return ""
+    return hashlib.sha256(conversation_context.encode("utf-8")).hexdigest()[:16]
+
+
+class ResponseCache:
+    """SQLite-backed cache of interpret_command results with TTL and LRU eviction."""
+
+    def __init__(
+        self,
+        db_path: str = "core/response_cache.db",
+        ttl_seconds: int = 24 * 60 * 60,
+        max_entries: int = 1000,
+    ):
+        """
+        Initialize the response cache.
+
+        Args:
+            db_path: Path to the SQLite database file
+            ttl_seconds: How long an entry stays valid after it is written
+            max_entries: Maximum number of entries before least recently used
+                entries are evicted
+        """
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._create_tables()
+
+    def _create_tables(self):
+        """Create the cache table if it doesn't exist."""
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    cache_key TEXT PRIMARY KEY,
+                    normalized_input TEXT NOT NULL,
+                    date_bucket TEXT NOT NULL,
+                    result TEXT NOT NULL,  -- JSON
+                    created_at REAL NOT NULL,
+                    last_accessed REAL NOT NULL
+                )
+            """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_responses_last_accessed "
+                "ON responses(last_accessed)"
+            )
+
+    def make_key(
+        self,
+        user_input: str,
+        conversation_context: str = "",
+        date_bucket: Optional[str] = None,
+    ) -> str:
+        """
+        Build the cache key for an interpretation request.
+
+        The current date is part of the key so relative commands such as
+        "what's on tomorrow" are never answered with yesterday's resolution.
+        """
+        if date_bucket is None:
+            date_bucket = datetime.now().strftime("%Y-%m-%d")
+        raw = "\x1f".join(
+            [
+                normalize_input(user_input),
+                context_fingerprint(conversation_context),
+                date_bucket,
+            ]
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(
+        self,
+        user_input: str,
+        conversation_context: str = "",
+        date_bucket: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached interpretation.
+
+        Returns:
+            The cached result dict, or None on a miss or expired entry
+        """
+        key = self.make_key(user_input, conversation_context, date_bucket)
+        now = time.time()
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                row = conn.execute(
+                    "SELECT result, created_at FROM responses WHERE cache_key = ?",
+                    (key,),
+                ).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                result, created_at = row
+                if now - created_at > self.ttl_seconds:
+                    conn.execute("DELETE FROM responses WHERE cache_key = ?", (key,))
+                    self.misses += 1
+                    return None
+                conn.execute(
+                    "UPDATE responses SET last_accessed = ? WHERE cache_key = ?",
+                    (now, key),
+                )
+        except sqlite3.Error as e:
+            print(f"Warning: Could not read response cache: {e}")
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return json.loads(result)
+
+    def put(
+        self,
+        user_input: str,
+        result: Dict[str, Any],
+        conversation_context: str = "",
+        date_bucket: Optional[str] = None,
+    ) -> None:
+        """Store an interpretation and evict least recently used entries if needed."""
+        if date_bucket is None:
+            date_bucket = datetime.now().strftime("%Y-%m-%d")
+        key = self.make_key(user_input, conversation_context, date_bucket)
+        now = time.time()
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO responses
+                        (cache_key, normalized_input, date_bucket, result, created_at, last_accessed)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                    (
+                        key,
+                        normalize_input(user_input),
+                        date_bucket,
+                        json.dumps(result),
+                        now,
+                        now,
+                    ),
+                )
+                self._evict(conn, now)
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            print(f"Warning: Could not write response cache: {e}")
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        """Drop expired entries, then least recently used ones over max_entries."""
+        conn.execute(
+            "DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,)
+        )
+        (count,) = conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            conn.execute(
+                """
+                DELETE FROM responses WHERE cache_key IN (
+                    SELECT cache_key FROM responses
+                    ORDER BY last_accessed ASC LIMIT ?
+                )
+            """,
+                (overflow,),
+            )
+
+    def clear(self) -> None:
+        """Remove all cached entries and reset counters."""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("DELETE FROM responses")
+        self.hits = 0
+        self.misses = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                (entries,) = conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+        except sqlite3.Error:
+            entries = 0
+        total = self.hits + self.misses
+        return {
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "database_path": self.db_path,
+        }
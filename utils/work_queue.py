@@ -0,0 +1,223 @@
+"""Durable background work queue for side effects that can run after a commit.
+
+Jobs are journaled to SQLite before they are queued and removed from the
+journal once their handler has run, so jobs still pending when the process
+exits are run again on the next start (delivery is at least once). A job whose
+handler fails stays in the journal with its attempt count and is retried on the
+next start; after max_attempts failures it is kept as a dead letter, which is
+not run again. With a single worker, jobs run in the order they were submitted.
+"""
+
+import itertools
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+MAX_ATTEMPTS = 3
+
+
+class DurableWorkQueue:
+    """Worker threads fed from a queue that is backed by an on-disk journal."""
+
+    def __init__(
+        self,
+        handlers: Dict[str, Callable[[Any], None]],
+        journal_path: str = "core/post_commit_journal.db",
+        workers: int = 1,
+        max_attempts: int = MAX_ATTEMPTS,
+    ):
+        """
+        Initialize the queue and replay jobs left in the journal.
+
+        Args:
+            handlers: Job handler for each job kind; payloads are passed as
+                decoded JSON, the same as when a job is replayed
+            journal_path: Path to the SQLite journal (":memory:" to keep
+                jobs only as long as this object)
+            workers: Number of worker threads; 0 runs each job in the
+                submitting thread without journaling it
+            max_attempts: Failed runs after which a job is dead-lettered
+        """
+        self.handlers = handlers
+        self.journal_path = journal_path
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.processed = 0
+        self.failed = 0
+        self.replayed = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self._total_lag = 0.0
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        # Job id -> enqueue time of every job not yet finished; jobs run
+        # inline are not journaled and are numbered here instead
+        self._outstanding: Dict[int, float] = {}
+        self._inline_ids = itertools.count(1)
+        self._conn = None
+        if workers <= 0:
+            return
+
+        directory = os.path.dirname(journal_path)
+        if directory and journal_path != ":memory:":
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(journal_path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    kind TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    enqueued_at REAL NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    error TEXT,  -- from the last failed run
+                    dead INTEGER NOT NULL DEFAULT 0
+                )
+            """
+            )
+            columns = [c[1] for c in self._conn.execute("PRAGMA table_info(jobs)")]
+            for column, definition in (
+                ("attempts", "INTEGER NOT NULL DEFAULT 0"),
+                ("error", "TEXT"),
+                ("dead", "INTEGER NOT NULL DEFAULT 0"),
+            ):
+                if column not in columns:
+                    self._conn.execute(
+                        f"ALTER TABLE jobs ADD COLUMN {column} {definition}"
+                    )
+        self._replay()
+        for number in range(workers):
+            threading.Thread(
+                target=self._work, name=f"post-commit-{number}", daemon=True
+            ).start()
+
+    def submit(self, kind: str, payload: Any) -> None:
+        """
+        Journal a job and queue it for a worker.
+
+        Args:
+            kind: Job kind, one of the handler names
+            payload: JSON-serializable job data
+        """
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        encoded = json.dumps(payload, default=str)
+        enqueued_at = time.time()
+        if self._conn is None:
+            with self._lock:
+                job_id = next(self._inline_ids)
+                self._outstanding[job_id] = enqueued_at
+            self._run(job_id, kind, json.loads(encoded), enqueued_at)
+            return
+        with self._lock:
+            with self._conn:
+                job_id = self._conn.execute(
+                    "INSERT INTO jobs (kind, payload, enqueued_at) VALUES (?, ?, ?)",
+                    (kind, encoded, enqueued_at),
+                ).lastrowid
+            self._outstanding[job_id] = enqueued_at
+        self._queue.put((job_id, kind, json.loads(encoded), enqueued_at))
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every submitted job has run; return False on timeout."""
+        with self._idle:
+            return self._idle.wait_for(lambda: not self._outstanding, timeout)
+
+    def dead_letters(self) -> List[Dict[str, Any]]:
+        """Return the jobs that failed max_attempts times, oldest first."""
+        if self._conn is None:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, kind, payload, attempts, error FROM jobs "
+                "WHERE dead ORDER BY id"
+            ).fetchall()
+        return [
+            {
+                "id": job_id,
+                "kind": kind,
+                "payload": json.loads(payload),
+                "attempts": attempts,
+                "error": error,
+            }
+            for job_id, kind, payload, attempts, error in rows
+        ]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue depth, lag and throughput statistics."""
+        now = time.time()
+        with self._lock:
+            oldest = min(self._outstanding.values(), default=None)
+            finished = self.processed + self.failed
+            retrying = dead = 0
+            if self._conn is not None:
+                retrying, dead = self._conn.execute(
+                    "SELECT COALESCE(SUM(attempts > 0 AND NOT dead), 0), "
+                    "COALESCE(SUM(dead), 0) FROM jobs"
+                ).fetchone()
+            return {
+                "depth": len(self._outstanding),
+                "oldest_pending_seconds": now - oldest if oldest else 0.0,
+                "processed": self.processed,
+                "failed": self.failed,
+                "awaiting_retry": retrying,
+                "dead_letters": dead,
+                "replayed": self.replayed,
+                "last_lag_seconds": self.last_lag,
+                "max_lag_seconds": self.max_lag,
+                "average_lag_seconds": self._total_lag / finished if finished else 0.0,
+                "workers": self.workers,
+                "journal_path": self.journal_path,
+            }
+
+    def _replay(self) -> None:
+        """Queue the jobs a previous process journaled but did not finish."""
+        rows = self._conn.execute(
+            "SELECT id, kind, payload, enqueued_at FROM jobs WHERE NOT dead ORDER BY id"
+        ).fetchall()
+        for job_id, kind, payload, enqueued_at in rows:
+            self._outstanding[job_id] = enqueued_at
+            self._queue.put((job_id, kind, json.loads(payload), enqueued_at))
+        self.replayed = len(rows)
+
+    def _work(self) -> None:
+        while True:
+            self._run(*self._queue.get())
+
+    def _run(self, job_id, kind, payload, enqueued_at) -> None:
+        """Run one job, then settle it in the journal and record its lag."""
+        try:
+            self.handlers[kind](payload)
+            error = None
+        except Exception as e:
+            print(f"Warning: Background job {kind} failed: {e}")
+            error = str(e) or type(e).__name__
+        failed = error is not None
+        lag = time.time() - enqueued_at
+        with self._lock:
+            if self._conn is not None:
+                with self._conn:
+                    if failed:
+                        # Kept for the next start, or for good once dead
+                        self._conn.execute(
+                            "UPDATE jobs SET attempts = attempts + 1, error = ?, "
+                            "dead = attempts + 1 >= ? WHERE id = ?",
+                            (error, self.max_attempts, job_id),
+                        )
+                    else:
+                        self._conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+            self._outstanding.pop(job_id, None)
+            if failed:
+                self.failed += 1
+            else:
+                self.processed += 1
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            self._total_lag += lag
+            self._idle.notify_all()